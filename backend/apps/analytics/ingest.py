@@ -0,0 +1,311 @@
+"""
+Buffered UserActivity ingestion.
+
+Activities are appended to a bounded per-process ring buffer as plain
+tuples (no model instances, no queries on the request path) and written in
+batches by a background flusher thread: ``COPY ... FROM STDIN`` on
+PostgreSQL, ``bulk_create`` elsewhere. Where threads are not available
+(``USER_ACTIVITY_FLUSH_THREAD = False``) the request that finds the buffer
+due flushes it inline, like the view counters in ``apps.core.counters``.
+
+``ActivityMiddleware`` records page views, sampled by
+``USER_ACTIVITY_PAGE_VIEW_SAMPLE_RATE`` (the rate is stored in each row's
+metadata so counts can be scaled back up). Logins, logouts and forum posts
+are recorded from signals; other code calls ``record_activity``.
+
+Backpressure: when the buffer holds ``USER_ACTIVITY_BUFFER_SIZE`` entries
+the flusher is woken and new page views are shed (counted in
+``stats['dropped']``); other activity types are still accepted, and the
+request that overflows the buffer writes it out synchronously instead.
+
+A crash loses at most one flush interval of activity per worker; a clean
+shutdown flushes through ``atexit``. Because the buffer is per process, it
+is drained by its own thread rather than a Celery task or cron job, which
+could not see it.
+"""
+import atexit
+import csv
+import io
+import ipaddress
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connection, connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Column order of a buffered entry and of the COPY statement
+COLUMNS = (
+    'user_id', 'activity_type', 'description', 'page_url', 'session_id',
+    'metadata', 'ip_address', 'user_agent', 'referrer', 'created_at',
+)
+
+URL_MAX_LENGTH = 200
+USER_AGENT_MAX_LENGTH = 512
+
+
+def recording_enabled():
+    return getattr(settings, 'USER_ACTIVITY_ENABLED', True)
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address(value.strip()))
+    except (AttributeError, ValueError):
+        return None
+
+
+def client_ip(request):
+    """
+    Address of the client, or None. With a trusted proxy in front, that is
+    the right-most X-Forwarded-For hop (the one the proxy appended; anything
+    to its left is whatever the client sent). Values that are not IP
+    addresses are ignored, since one would fail the whole batch's insert
+    into the inet column.
+    """
+    if getattr(settings, 'USER_ACTIVITY_TRUST_X_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+        if forwarded:
+            ip = _valid_ip(forwarded.split(',')[-1])
+            if ip is not None:
+                return ip
+    return _valid_ip(request.META.get('REMOTE_ADDR'))
+
+
+def page_url(request):
+    """
+    Absolute URL of request, or None when the host or scheme is unknown (the
+    bare HttpRequest that Client.login() sends with user_logged_in has neither).
+    Read from META rather than get_host(), which raises on such requests.
+    """
+    host = request.META.get('HTTP_HOST') or request.META.get('SERVER_NAME')
+    scheme = getattr(request, 'scheme', None)
+    if not host or not scheme:
+        return None
+    return f'{scheme}://{host}{request.path}'[:URL_MAX_LENGTH]
+
+
+def request_details(request):
+    """(page_url, session_id, ip_address, user_agent, referrer) for a request"""
+    session = getattr(request, 'session', None)
+    referrer = request.META.get('HTTP_REFERER')
+    return (
+        page_url(request),
+        session.session_key if session is not None else None,
+        client_ip(request),
+        request.META.get('HTTP_USER_AGENT', '')[:USER_AGENT_MAX_LENGTH] or None,
+        referrer[:URL_MAX_LENGTH] if referrer else None,
+    )
+
+
+class ActivityBuffer:
+    """Bounded ring buffer of UserActivity rows with batched writes"""
+
+    def __init__(self, capacity=None, batch_size=None, flush_interval=None, use_thread=None):
+        self._capacity = capacity
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._use_thread = use_thread
+        self._entries = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._last_flush = time.monotonic()
+        self.stats = {
+            'recorded': 0, 'sampled_out': 0, 'dropped': 0, 'flushed': 0,
+            'flushes': 0, 'sync_flushes': 0, 'errors': 0,
+        }
+
+    @property
+    def capacity(self):
+        return self._capacity or getattr(settings, 'USER_ACTIVITY_BUFFER_SIZE', 10000)
+
+    @property
+    def batch_size(self):
+        return self._batch_size or getattr(settings, 'USER_ACTIVITY_BATCH_SIZE', 1000)
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'USER_ACTIVITY_FLUSH_INTERVAL', 5)
+
+    @property
+    def use_thread(self):
+        if self._use_thread is not None:
+            return self._use_thread
+        return getattr(settings, 'USER_ACTIVITY_FLUSH_THREAD', True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def record(self, user_id, activity_type, description=None, page_url=None, session_id=None,
+               metadata=None, ip_address=None, user_agent=None, referrer=None, created_at=None):
+        """Queue one activity; returns False if it was shed under backpressure"""
+        entry = (
+            user_id, activity_type, description, page_url, session_id,
+            metadata or {}, ip_address, user_agent, referrer, created_at or timezone.now(),
+        )
+        overflow = False
+        with self._lock:
+            if len(self._entries) >= self.capacity:
+                if activity_type == 'page_view':
+                    self.stats['dropped'] += 1
+                    self._wake.set()
+                    return False
+                overflow = True
+            self._entries.append(entry)
+            self.stats['recorded'] += 1
+
+        if overflow:
+            self.stats['sync_flushes'] += 1
+            self.flush()
+        elif self.use_thread:
+            self._ensure_thread()
+            if len(self._entries) >= self.batch_size:
+                self._wake.set()
+        elif (len(self._entries) >= self.batch_size
+              or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+        return True
+
+    def record_page_view(self, request):
+        """Sample and queue a page view for an authenticated request"""
+        if not recording_enabled():
+            return False
+        rate = getattr(settings, 'USER_ACTIVITY_PAGE_VIEW_SAMPLE_RATE', 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            self.stats['sampled_out'] += 1
+            return False
+        page_url, session_id, ip_address, user_agent, referrer = request_details(request)
+        return self.record(
+            request.user.pk, 'page_view',
+            page_url=page_url,
+            session_id=session_id,
+            metadata={'sample_rate': rate} if rate < 1.0 else None,
+            ip_address=ip_address,
+            user_agent=user_agent,
+            referrer=referrer,
+        )
+
+    def flush(self):
+        """Write everything queued so far; returns the number of rows written"""
+        if not self._flush_lock.acquire(blocking=False):
+            return 0
+        written = 0
+        try:
+            self._last_flush = time.monotonic()
+            while True:
+                with self._lock:
+                    count = min(len(self._entries), self.batch_size)
+                    batch = [self._entries.popleft() for _ in range(count)]
+                if not batch:
+                    break
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logger.error(f"Failed to write {len(batch)} user activities: {e}")
+                    break
+                written += len(batch)
+            self.stats['flushed'] += written
+            self.stats['flushes'] += 1
+            return written
+        finally:
+            self._flush_lock.release()
+
+    def _write(self, batch):
+        if connection.vendor == 'postgresql':
+            self._copy(batch)
+        else:
+            self._bulk_create(batch)
+
+    def _copy(self, batch):
+        from .models import UserActivity
+
+        # QUOTE_NONNUMERIC quotes every string, so '' stays an empty string
+        # and None (written unquoted) is NULL
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NONNUMERIC)
+        for entry in batch:
+            row = list(entry)
+            row[5] = json.dumps(row[5], default=str)
+            row[9] = row[9].isoformat()
+            writer.writerow(row)
+        buffer.seek(0)
+
+        table = connection.ops.quote_name(UserActivity._meta.db_table)
+        columns = ', '.join(connection.ops.quote_name(column) for column in COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.copy_expert(f'COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)', buffer)
+
+    def _bulk_create(self, batch):
+        from .models import UserActivity
+
+        # created_at is auto_now_add, so bulk_create stamps rows with the
+        # flush time (at most one flush interval after the activity)
+        UserActivity.objects.bulk_create(
+            [UserActivity(**dict(zip(COLUMNS, entry))) for entry in batch],
+            batch_size=self.batch_size,
+        )
+
+    def _ensure_thread(self):
+        # Restart after fork: threads do not survive into preforked workers
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='activity-flusher', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"User activity flusher failed: {e}")
+            finally:
+                connections.close_all()
+
+
+activity_buffer = ActivityBuffer()
+
+
+def record_activity(user, activity_type, request=None, description=None, metadata=None):
+    """Queue a UserActivity for user (with request details when given)"""
+    if user is None or not user.is_authenticated or not recording_enabled():
+        return False
+    details = request_details(request) if request is not None else (None,) * 5
+    page_url, session_id, ip_address, user_agent, referrer = details
+    return activity_buffer.record(
+        user.pk, activity_type,
+        description=description,
+        page_url=page_url,
+        session_id=session_id,
+        metadata=metadata,
+        ip_address=ip_address,
+        user_agent=user_agent,
+        referrer=referrer,
+    )
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        activity_buffer.flush()
+    except Exception:
+        # The database may already be gone during interpreter shutdown
+        pass
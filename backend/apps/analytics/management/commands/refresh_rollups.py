@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Refresh the daily analytics rollups (run from cron or celery beat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Rebuild every series from scratch instead of from the last watermark'
+        )
+
+    def handle(self, *args, **options):
+        written = refresh_rollups(full=options['full'])
+        for series, rows in written.items():
+            self.stdout.write(f'{series}: {rows} rollup rows written')
+        self.stdout.write(self.style.SUCCESS('Rollups refreshed'))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.timeseries import rollup_engine
+
+
+class Command(BaseCommand):
+    help = 'Roll up new AnalyticsData points into hourly/daily/monthly aggregates (run from cron or celery beat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Recompute every period still covered by raw data'
+        )
+        parser.add_argument(
+            '--downsample',
+            action='store_true',
+            help='Also delete raw points and hourly rollups past their retention window'
+        )
+        parser.add_argument(
+            '--raw-days',
+            type=int,
+            default=None,
+            help='Override ANALYTICS_RAW_RETENTION_DAYS'
+        )
+        parser.add_argument(
+            '--hourly-days',
+            type=int,
+            default=None,
+            help='Override ANALYTICS_HOURLY_RETENTION_DAYS'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            processed = rollup_engine.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt rollups from {processed} data points'))
+        else:
+            processed = rollup_engine.refresh()
+            self.stdout.write(self.style.SUCCESS(f'Rolled up {processed} new data points'))
+
+        if options['downsample']:
+            deleted = rollup_engine.downsample(options['raw_days'], options['hourly_days'])
+            self.stdout.write(
+                f"Deleted {deleted['raw']} raw data points and {deleted['hour']} hourly rollups past retention"
+            )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.reports import run_due_reports
+
+
+class Command(BaseCommand):
+    help = 'Generate scheduled analytics reports whose next_run has passed (run from cron or celery beat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Generate at most this many reports in this run'
+        )
+
+    def handle(self, *args, **options):
+        results = run_due_reports(limit=options['limit'])
+        if not results:
+            self.stdout.write('No reports due')
+            return
+
+        for report, path in results:
+            if path:
+                self.stdout.write(self.style.SUCCESS(f'{report.name}: {path}'))
+            else:
+                self.stdout.write(self.style.ERROR(f'{report.name}: failed, see the log'))
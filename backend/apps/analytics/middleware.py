@@ -0,0 +1,24 @@
+from django.conf import settings
+
+from .ingest import activity_buffer
+
+DEFAULT_IGNORED_PATHS = ('/static/', '/media/', '/api/', '/admin/jsi18n/', '/__debug__/', '/favicon.ico')
+
+
+class ActivityMiddleware:
+    """Record sampled page views of authenticated users into the activity buffer"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.ignored_paths = tuple(getattr(settings, 'USER_ACTIVITY_IGNORED_PATHS', DEFAULT_IGNORED_PATHS))
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            request.method == 'GET'
+            and 200 <= response.status_code < 300
+            and not request.path.startswith(self.ignored_paths)
+            and request.user.is_authenticated
+        ):
+            activity_buffer.record_page_view(request)
+        return response
@@ -0,0 +1,89 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "resolution",
+                    models.CharField(
+                        choices=[
+                            ("hour", "Hourly"),
+                            ("day", "Daily"),
+                            ("month", "Monthly"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("period_start", models.DateTimeField()),
+                ("dimensions_hash", models.CharField(max_length=40)),
+                ("dimensions", models.JSONField(default=dict)),
+                ("count", models.PositiveIntegerField(default=0)),
+                (
+                    "sum",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=20),
+                ),
+                (
+                    "min",
+                    models.DecimalField(
+                        blank=True, decimal_places=4, max_digits=15, null=True
+                    ),
+                ),
+                (
+                    "max",
+                    models.DecimalField(
+                        blank=True, decimal_places=4, max_digits=15, null=True
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "metric",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="analytics.analyticsmetric",
+                    ),
+                ),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="analytics.analyticssource",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Metric Rollup",
+                "verbose_name_plural": "Metric Rollups",
+                "db_table": "analytics_metric_rollups",
+                "ordering": ["resolution", "-period_start"],
+                "indexes": [
+                    models.Index(
+                        fields=["metric", "resolution", "period_start"],
+                        name="analytics_m_metric__2ca3b5_idx",
+                    )
+                ],
+                "unique_together": {
+                    ("source", "metric", "resolution", "period_start", "dimensions_hash")
+                },
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:00
+
+from datetime import timedelta
+
+from django.db import migrations
+from django.utils import timezone
+
+# PostgreSQL only: rebuild analytics_data and user_activities as tables
+# partitioned by month on their timestamp column, so date-filtered queries
+# are partition-pruned and retention is a DETACH/DROP instead of a DELETE.
+# Columns, index names and foreign keys stay the same, so the ORM models do
+# not change. The primary key becomes (id, <timestamp>) because Postgres
+# requires the partition key in it; ids still come from a sequence.
+# Ongoing maintenance is `manage.py manage_partitions` (apps.core.partitions).
+PARTITIONED_TABLES = {
+    "analytics_data": "date",
+    "user_activities": "created_at",
+}
+
+
+def _month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _next_month(value):
+    return _month_start(_month_start(value) + timedelta(days=32))
+
+
+def _partition_sql(table, start):
+    end = _next_month(start)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table}_p{start:%Y%m} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{end:%Y-%m-%d}')"
+    )
+
+
+def partition_table(cursor, table, column):
+    cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [table])
+    row = cursor.fetchone()
+    if row is None or row[0] == "p":
+        return
+
+    # Remember secondary indexes and foreign keys so they can be recreated
+    # under their original names once the old table is gone
+    cursor.execute(
+        "SELECT indexdef FROM pg_indexes WHERE tablename = %s AND indexname <> %s",
+        [table, f"{table}_pkey"],
+    )
+    index_defs = [indexdef for (indexdef,) in cursor.fetchall()]
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f'",
+        [table],
+    )
+    foreign_keys = cursor.fetchall()
+    cursor.execute(f"SELECT min({column}), max({column}), coalesce(max(id), 0) FROM {table}")
+    first, last, max_id = cursor.fetchone()
+
+    old = f"{table}_unpartitioned"
+    cursor.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    cursor.execute(
+        f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+        f"PARTITION BY RANGE ({column})"
+    )
+    cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, {column})")
+    # The old identity sequence goes away with the old table, so ids move to
+    # a new sequence that continues where it left off
+    sequence = f"{table}_pk_seq"
+    cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {table}.id")
+    cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+    cursor.execute(f"SELECT setval('{sequence}', %s, %s)", [max(max_id, 1), max_id > 0])
+
+    # One partition per month of existing data plus three months ahead; the
+    # default partition catches anything outside (e.g. far-future dates)
+    now = timezone.now()
+    month = _month_start(first or now)
+    horizon = _next_month(_next_month(_next_month(_month_start(max(last or now, now)))))
+    while month < horizon:
+        cursor.execute(_partition_sql(table, month))
+        month = _next_month(month)
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT")
+
+    cursor.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    cursor.execute(f"DROP TABLE {old}")
+
+    for indexdef in index_defs:
+        cursor.execute(indexdef)
+    for name, definition in foreign_keys:
+        cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+
+
+def partition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table, column in PARTITIONED_TABLES.items():
+            partition_table(cursor, table, column)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("analytics", "0003_metricrollup"),
+    ]
+
+    operations = [
+        # Not reversible in place; the partitioned tables work with the same
+        # models, so rolling back past this migration leaves them as they are
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
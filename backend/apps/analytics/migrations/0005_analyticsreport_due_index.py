@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0004_partition_tables"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="analyticsreport",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("is_scheduled", True)),
+                fields=["next_run"],
+                name="analytics_report_due_idx",
+            ),
+        ),
+    ]
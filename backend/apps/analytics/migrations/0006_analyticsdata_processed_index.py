@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+# RollupEngine.refresh reads points by processed_at. On PostgreSQL an index
+# on the partitioned analytics_data is created on every partition, and on
+# partitions created later, so the watermark query no longer scans the table.
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0005_analyticsreport_due_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="analyticsdata",
+            index=models.Index(fields=["processed_at"], name="analytics_data_processed_idx"),
+        ),
+    ]
@@ -130,6 +130,8 @@ class AnalyticsData(models.Model):
         indexes = [
             models.Index(fields=['source', 'metric', 'date']),
             models.Index(fields=['date']),
+            # Incremental rollups read points by processed_at watermark
+            models.Index(fields=['processed_at'], name='analytics_data_processed_idx'),
         ]
     
     def __str__(self):
@@ -273,6 +275,14 @@ class AnalyticsReport(models.Model):
         verbose_name = 'Analytics Report'
         verbose_name_plural = 'Analytics Reports'
         ordering = ['-created_at']
+        indexes = [
+            # Scheduler scan: active scheduled reports by next_run
+            models.Index(
+                fields=['next_run'],
+                name='analytics_report_due_idx',
+                condition=models.Q(is_active=True, is_scheduled=True),
+            ),
+        ]
     
     def __str__(self):
         return self.name
@@ -325,3 +335,94 @@ class UserActivity(models.Model):
     
     def __str__(self):
         return f"{self.user.username}: {self.get_activity_type_display()} ({self.created_at})"
+
+
+class RollupWatermark(models.Model):
+    """
+    How far a rollup has been refreshed; rows changed after the watermark
+    are picked up by the next incremental refresh
+    """
+    name = models.CharField(max_length=100, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_rollup_watermarks'
+        verbose_name = 'Rollup Watermark'
+        verbose_name_plural = 'Rollup Watermarks'
+        ordering = ['name']
+    
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
+
+
+class DailyRollup(models.Model):
+    """
+    Pre-aggregated daily counts for the admin analytics pages
+    """
+    SERIES_CHOICES = [
+        ('signups', 'User Signups'),
+        ('events', 'Events'),
+        ('projects_by_status', 'Projects by Status'),
+    ]
+    
+    series = models.CharField(max_length=30, choices=SERIES_CHOICES)
+    day = models.DateField()
+    key = models.CharField(max_length=50, blank=True, default='')  # e.g. project status
+    count = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_daily_rollups'
+        verbose_name = 'Daily Rollup'
+        verbose_name_plural = 'Daily Rollups'
+        unique_together = ['series', 'day', 'key']
+        ordering = ['series', 'day', 'key']
+    
+    def __str__(self):
+        key = f" [{self.key}]" if self.key else ''
+        return f"{self.get_series_display()}{key} {self.day}: {self.count}"
+
+
+class MetricRollup(models.Model):
+    """
+    Pre-aggregated AnalyticsData per (source, metric, dimensions) and period.
+    Count, sum, min and max are all kept so any aggregation type can be
+    answered, and coarser periods can be derived, without the raw points.
+    """
+    RESOLUTION_CHOICES = [
+        ('hour', 'Hourly'),
+        ('day', 'Daily'),
+        ('month', 'Monthly'),
+    ]
+    
+    source = models.ForeignKey(AnalyticsSource, on_delete=models.CASCADE, related_name='rollups')
+    metric = models.ForeignKey(AnalyticsMetric, on_delete=models.CASCADE, related_name='rollups')
+    resolution = models.CharField(max_length=10, choices=RESOLUTION_CHOICES)
+    period_start = models.DateTimeField()
+    
+    # Dimensions of the raw points, and a stable hash of them for grouping
+    dimensions_hash = models.CharField(max_length=40)
+    dimensions = models.JSONField(default=dict)
+    
+    # Aggregates
+    count = models.PositiveIntegerField(default=0)
+    sum = models.DecimalField(max_digits=20, decimal_places=4, default=0)
+    min = models.DecimalField(max_digits=15, decimal_places=4, null=True, blank=True)
+    max = models.DecimalField(max_digits=15, decimal_places=4, null=True, blank=True)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_metric_rollups'
+        verbose_name = 'Metric Rollup'
+        verbose_name_plural = 'Metric Rollups'
+        unique_together = ['source', 'metric', 'resolution', 'period_start', 'dimensions_hash']
+        ordering = ['resolution', '-period_start']
+        indexes = [
+            models.Index(fields=['metric', 'resolution', 'period_start']),
+        ]
+    
+    def __str__(self):
+        return f"{self.metric_id}@{self.source_id} {self.resolution} {self.period_start}: {self.count} points"
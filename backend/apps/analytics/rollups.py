@@ -0,0 +1,166 @@
+"""
+Daily rollups behind the admin analytics page.
+
+Grouping the whole users/events/projects tables on every page view does not
+scale, so ``refresh_rollups`` writes per-day counts into ``DailyRollup`` and
+the page only sums those. Buckets use ``TruncDay``/``TruncMonth`` in the
+project time zone, so they work on any database and keep years apart.
+
+Each series remembers a watermark. An incremental refresh looks only at rows
+changed since then, works out which days they fall on, and recomputes that
+span of days with one grouped query. Deleted rows, and rows moved away from a
+day, are not seen by the incremental pass; ``full=True`` (``manage.py
+refresh_rollups --full``, e.g. nightly) rebuilds a series from scratch.
+
+``projects_by_status`` is a snapshot rather than a time series: each refresh
+that sees project changes stores today's count per status.
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDay, TruncMonth
+from django.utils import timezone
+
+from .models import DailyRollup, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+# series -> (model label, bucketed datetime field, field that moves on change)
+DAILY_SERIES = {
+    'signups': ('users.User', 'date_joined', 'date_joined'),
+    'events': ('events.Event', 'start_date', 'updated_at'),
+}
+
+STATUS_SNAPSHOT_SERIES = 'projects_by_status'
+
+
+def _local_day(value):
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _lock_watermark(name):
+    watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=name)
+    return watermark
+
+
+def refresh_daily_series(series, full=False):
+    """Bring one DAILY_SERIES up to date; returns the number of rollup rows written"""
+    label, bucket_field, changed_field = DAILY_SERIES[series]
+    model = apps.get_model(label)
+
+    with transaction.atomic():
+        watermark = _lock_watermark(f'daily:{series}')
+        now = timezone.now()
+        queryset = model.objects.all()
+        existing = DailyRollup.objects.filter(series=series)
+
+        if not full and watermark.watermark is not None:
+            changed = model.objects.filter(**{
+                f'{changed_field}__gt': watermark.watermark,
+                f'{changed_field}__lte': now,
+            }).aggregate(
+                first=Min(bucket_field),
+                last=Max(bucket_field),
+            )
+            if changed['first'] is None:
+                watermark.watermark = now
+                watermark.save(update_fields=['watermark', 'updated_at'])
+                return 0
+            start = _day_start(_local_day(changed['first']))
+            end = _day_start(_local_day(changed['last']) + timedelta(days=1))
+            queryset = queryset.filter(**{f'{bucket_field}__gte': start, f'{bucket_field}__lt': end})
+            existing = existing.filter(day__gte=start.date(), day__lt=end.date())
+
+        rows = (
+            queryset.order_by()
+            .annotate(bucket=TruncDay(bucket_field))
+            .values('bucket')
+            .annotate(total=Count('pk'))
+        )
+        rollups = [
+            DailyRollup(series=series, day=_local_day(row['bucket']), count=row['total'])
+            for row in rows
+        ]
+        existing.delete()
+        DailyRollup.objects.bulk_create(rollups)
+
+        watermark.watermark = now
+        watermark.save(update_fields=['watermark', 'updated_at'])
+
+    logger.info(f"Refreshed {series} rollup: {len(rollups)} day(s)")
+    return len(rollups)
+
+
+def refresh_status_snapshot(full=False):
+    """Store today's project count per status if any project changed since the last run"""
+    Project = apps.get_model('projects', 'Project')
+
+    with transaction.atomic():
+        watermark = _lock_watermark(f'snapshot:{STATUS_SNAPSHOT_SERIES}')
+        now = timezone.now()
+        today = timezone.localdate(now)
+        has_snapshot = DailyRollup.objects.filter(series=STATUS_SNAPSHOT_SERIES, day=today).exists()
+        if (
+            not full
+            and has_snapshot
+            and watermark.watermark is not None
+            and not Project.objects.filter(updated_at__gt=watermark.watermark).exists()
+        ):
+            watermark.watermark = now
+            watermark.save(update_fields=['watermark', 'updated_at'])
+            return 0
+
+        counts = Project.objects.order_by().values('status').annotate(total=Count('pk'))
+        rollups = [
+            DailyRollup(series=STATUS_SNAPSHOT_SERIES, day=today, key=row['status'], count=row['total'])
+            for row in counts
+        ]
+        DailyRollup.objects.filter(series=STATUS_SNAPSHOT_SERIES, day=today).delete()
+        DailyRollup.objects.bulk_create(rollups)
+
+        watermark.watermark = now
+        watermark.save(update_fields=['watermark', 'updated_at'])
+    return len(rollups)
+
+
+def refresh_rollups(full=False):
+    """Refresh every admin rollup; returns {series: rows written}"""
+    written = {series: refresh_daily_series(series, full=full) for series in DAILY_SERIES}
+    written[STATUS_SNAPSHOT_SERIES] = refresh_status_snapshot(full=full)
+    return written
+
+
+def monthly_counts(series):
+    """[{'month': date, 'count': int}, ...] oldest first, summed from the daily rollup"""
+    return list(
+        DailyRollup.objects.filter(series=series)
+        .annotate(month=TruncMonth('day'))
+        .values('month')
+        .annotate(count=Sum('count'))
+        .order_by('month')
+    )
+
+
+def latest_status_counts():
+    """Most recent projects-by-status snapshot as [{'status', 'count'}, ...]"""
+    snapshots = DailyRollup.objects.filter(series=STATUS_SNAPSHOT_SERIES)
+    latest = snapshots.aggregate(day=Max('day'))['day']
+    if latest is None:
+        return []
+    return [
+        {'status': key, 'count': count}
+        for key, count in snapshots.filter(day=latest).order_by('key').values_list('key', 'count')
+    ]
+
+
+def last_refreshed():
+    return RollupWatermark.objects.filter(
+        name__in=[f'daily:{series}' for series in DAILY_SERIES]
+    ).aggregate(at=Max('watermark'))['at']
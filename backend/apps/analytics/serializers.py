@@ -3,6 +3,7 @@ from .models import (
     AnalyticsSource, AnalyticsMetric, AnalyticsData, Dashboard,
     DashboardWidget, AnalyticsReport, UserActivity
 )
+from .reports import WRITERS
 
 
 class AnalyticsSourceSerializer(serializers.ModelSerializer):
@@ -39,6 +40,26 @@ class AnalyticsReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = AnalyticsReport
         fields = '__all__'
+        # Set by the view and by run_due_reports
+        read_only_fields = ['created_by', 'last_run', 'next_run']
+        # The model's 'pdf' default can't be generated
+        extra_kwargs = {'format': {'default': 'csv'}}
+
+    def validate_recipients(self, recipients):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and not user.is_staff and any(recipient.pk != user.pk for recipient in recipients):
+            raise serializers.ValidationError('Only staff can send reports to other users.')
+        return recipients
+
+    def validate(self, attrs):
+        file_format = attrs.get('format', getattr(self.instance, 'format', None))
+        is_scheduled = attrs.get('is_scheduled', getattr(self.instance, 'is_scheduled', True))
+        if is_scheduled and file_format not in WRITERS:
+            raise serializers.ValidationError(
+                {'format': f"Scheduled reports can't be generated as {file_format}; use csv, excel or json."}
+            )
+        return attrs
 
 
 class UserActivitySerializer(serializers.ModelSerializer):
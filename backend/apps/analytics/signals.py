@@ -0,0 +1,27 @@
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.forum.models import ForumPost
+
+from .ingest import record_activity
+
+
+@receiver(user_logged_in)
+def record_login(sender, request, user, **kwargs):
+    record_activity(user, 'login', request=request)
+
+
+@receiver(user_logged_out)
+def record_logout(sender, request, user, **kwargs):
+    record_activity(user, 'logout', request=request)
+
+
+@receiver(post_save, sender=ForumPost)
+def record_forum_post(sender, instance, created, **kwargs):
+    if created:
+        record_activity(
+            instance.author,
+            'forum_post',
+            metadata={'topic_id': instance.topic_id, 'post_id': instance.pk},
+        )
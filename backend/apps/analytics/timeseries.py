@@ -0,0 +1,296 @@
+"""
+Time-series rollups for AnalyticsData.
+
+Raw points are append-only, so ``RollupEngine.refresh`` reads only points
+processed since its watermark, folds each one into its hourly, daily and
+monthly bucket per (source, metric, dimensions) in memory, and merges those
+partial aggregates into ``MetricRollup`` rows. Every rollup keeps count,
+sum, min and max, so each metric's ``aggregation_type`` (including average)
+can be answered at query time and merging stays exact.
+
+``downsample`` enforces retention: raw points older than
+``ANALYTICS_RAW_RETENTION_DAYS`` are deleted once rolled up, and hourly
+rollups older than ``ANALYTICS_HOURLY_RETENTION_DAYS`` are dropped in favour
+of the daily and monthly ones. On PostgreSQL ``analytics_data`` is
+partitioned by month and ``manage_partitions`` retires whole months, so the
+DELETE here only trims what is left of the oldest one. ``rebuild``
+recomputes only the periods the remaining raw data fully covers, so it never
+loses downsampled history.
+
+Dashboards read through ``series``, which picks the finest resolution that
+suits the requested range and is still retained.
+"""
+import hashlib
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DecimalField, ExpressionWrapper, Max, Min, Sum
+from django.db.models.functions import NullIf
+from django.utils import timezone
+
+from .models import AnalyticsData, MetricRollup, RollupWatermark
+
+logger = logging.getLogger(__name__)
+
+RESOLUTIONS = ('hour', 'day', 'month')
+WATERMARK_NAME = 'metrics:rollups'
+
+
+def raw_retention_days():
+    return getattr(settings, 'ANALYTICS_RAW_RETENTION_DAYS', 90)
+
+
+def hourly_retention_days():
+    return getattr(settings, 'ANALYTICS_HOURLY_RETENTION_DAYS', 400)
+
+
+def dimensions_hash(dimensions):
+    encoded = json.dumps(dimensions or {}, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha1(encoded.encode()).hexdigest()
+
+
+def period_start(value, resolution):
+    """Start of the hour/day/month containing value, in the current time zone"""
+    local = timezone.localtime(value) if timezone.is_aware(value) else value
+    local = local.replace(minute=0, second=0, microsecond=0)
+    if resolution in ('day', 'month'):
+        local = local.replace(hour=0)
+    if resolution == 'month':
+        local = local.replace(day=1)
+    return local
+
+
+def next_period_start(value, resolution):
+    start = period_start(value, resolution)
+    if start == value:
+        return start
+    if resolution == 'hour':
+        return start + timedelta(hours=1)
+    if resolution == 'day':
+        return period_start(start + timedelta(days=1, hours=12), 'day')
+    return period_start(start + timedelta(days=32), 'month')
+
+
+class _Partial:
+    """count/sum/min/max of one bucket, mergeable into a MetricRollup"""
+
+    __slots__ = ('dimensions', 'count', 'sum', 'min', 'max')
+
+    def __init__(self, dimensions):
+        self.dimensions = dimensions
+        self.count = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge_into(self, rollup):
+        rollup.count += self.count
+        rollup.sum += self.sum
+        rollup.min = self.min if rollup.min is None else min(rollup.min, self.min)
+        rollup.max = self.max if rollup.max is None else max(rollup.max, self.max)
+
+
+class RollupEngine:
+    """Maintains MetricRollup from AnalyticsData"""
+
+    def __init__(self, chunk_size=5000, settle_seconds=60):
+        self.chunk_size = chunk_size
+        # Points committed slightly out of processed_at order are still seen
+        self.settle_seconds = settle_seconds
+
+    def refresh(self):
+        """Roll up points processed since the watermark; returns how many"""
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+            upto = timezone.now() - timedelta(seconds=self.settle_seconds)
+            if watermark.watermark is not None and watermark.watermark >= upto:
+                return 0
+
+            points = AnalyticsData.objects.filter(processed_at__lte=upto)
+            if watermark.watermark is not None:
+                points = points.filter(processed_at__gt=watermark.watermark)
+            processed = self._accumulate(points)
+
+            watermark.watermark = upto
+            watermark.save(update_fields=['watermark', 'updated_at'])
+
+        if processed:
+            logger.info(f"Rolled up {processed} analytics data points")
+        return processed
+
+    def rebuild(self):
+        """
+        Recompute rollups from the raw points still on disk.
+
+        Only periods that start at or after the oldest raw point are rebuilt;
+        older ones were downsampled and are left untouched.
+        """
+        with transaction.atomic():
+            watermark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK_NAME)
+            upto = timezone.now() - timedelta(seconds=self.settle_seconds)
+            oldest = AnalyticsData.objects.aggregate(oldest=Min('date'))['oldest']
+            if oldest is None:
+                return 0
+
+            since = {resolution: next_period_start(oldest, resolution) for resolution in RESOLUTIONS}
+            for resolution, start in since.items():
+                MetricRollup.objects.filter(resolution=resolution, period_start__gte=start).delete()
+
+            processed = self._accumulate(AnalyticsData.objects.filter(processed_at__lte=upto), since=since)
+            watermark.watermark = upto
+            watermark.save(update_fields=['watermark', 'updated_at'])
+        return processed
+
+    def downsample(self, raw_days=None, hourly_days=None):
+        """Apply retention; returns {'raw': deleted points, 'hour': deleted rollups}"""
+        raw_days = raw_retention_days() if raw_days is None else raw_days
+        hourly_days = hourly_retention_days() if hourly_days is None else hourly_days
+        self.refresh()
+
+        now = timezone.now()
+        rolled_up_to = RollupWatermark.objects.get(name=WATERMARK_NAME).watermark
+        raw_deleted, _ = AnalyticsData.objects.filter(
+            date__lt=now - timedelta(days=raw_days),
+            processed_at__lte=rolled_up_to,
+        ).delete()
+        hourly_deleted, _ = MetricRollup.objects.filter(
+            resolution='hour',
+            period_start__lt=now - timedelta(days=hourly_days),
+        ).delete()
+        return {'raw': raw_deleted, 'hour': hourly_deleted}
+
+    def _accumulate(self, points, since=None):
+        partials = {}
+        processed = 0
+        rows = points.order_by().values_list('source_id', 'metric_id', 'date', 'value', 'dimensions')
+        for source_id, metric_id, date, value, dimensions in rows.iterator(chunk_size=self.chunk_size):
+            dims_hash = dimensions_hash(dimensions)
+            for resolution in RESOLUTIONS:
+                start = period_start(date, resolution)
+                if since is not None and start < since[resolution]:
+                    continue
+                key = (resolution, source_id, metric_id, start, dims_hash)
+                partial = partials.get(key)
+                if partial is None:
+                    partial = partials[key] = _Partial(dimensions or {})
+                partial.add(value)
+            processed += 1
+            if len(partials) >= self.chunk_size:
+                self._merge(partials)
+                partials = {}
+        if partials:
+            self._merge(partials)
+        return processed
+
+    def _merge(self, partials):
+        """Fold partial aggregates into MetricRollup with one read and two bulk writes per resolution"""
+        now = timezone.now()
+        for resolution in RESOLUTIONS:
+            keys = [key for key in partials if key[0] == resolution]
+            if not keys:
+                continue
+            existing = {
+                (resolution, rollup.source_id, rollup.metric_id, rollup.period_start, rollup.dimensions_hash): rollup
+                for rollup in MetricRollup.objects.filter(
+                    resolution=resolution,
+                    source_id__in={key[1] for key in keys},
+                    metric_id__in={key[2] for key in keys},
+                    period_start__in={key[3] for key in keys},
+                    dimensions_hash__in={key[4] for key in keys},
+                )
+            }
+
+            to_update, to_create = [], []
+            for key in keys:
+                partial = partials[key]
+                rollup = existing.get(key)
+                if rollup is None:
+                    _, source_id, metric_id, start, dims_hash = key
+                    rollup = MetricRollup(
+                        source_id=source_id,
+                        metric_id=metric_id,
+                        resolution=resolution,
+                        period_start=start,
+                        dimensions_hash=dims_hash,
+                        dimensions=partial.dimensions,
+                    )
+                    to_create.append(rollup)
+                else:
+                    rollup.updated_at = now
+                    to_update.append(rollup)
+                partial.merge_into(rollup)
+
+            if to_update:
+                MetricRollup.objects.bulk_update(
+                    to_update, ['count', 'sum', 'min', 'max', 'updated_at'], batch_size=1000
+                )
+            if to_create:
+                MetricRollup.objects.bulk_create(to_create, batch_size=1000)
+
+
+def resolution_for(start, end):
+    """Finest resolution that keeps the number of points reasonable and is still retained"""
+    span = end - start
+    if span <= timedelta(days=2):
+        resolution = 'hour'
+    elif span <= timedelta(days=120):
+        resolution = 'day'
+    else:
+        resolution = 'month'
+    if resolution == 'hour' and start < timezone.now() - timedelta(days=hourly_retention_days()):
+        resolution = 'day'
+    return resolution
+
+
+def aggregate_expression(aggregation_type):
+    """Combine rollup rows the way the metric's aggregation_type asks"""
+    if aggregation_type == 'count':
+        return Sum('count')
+    if aggregation_type == 'average':
+        return ExpressionWrapper(
+            Sum('sum') / NullIf(Sum('count'), 0),
+            output_field=DecimalField(max_digits=20, decimal_places=4),
+        )
+    if aggregation_type == 'min':
+        return Min('min')
+    if aggregation_type == 'max':
+        return Max('max')
+    return Sum('sum')
+
+
+def rollup_queryset(metrics, start, end, resolution=None, sources=None, dimensions=None):
+    """MetricRollup rows for the metrics over [start, end) at a suitable resolution"""
+    resolution = resolution or resolution_for(start, end)
+    queryset = MetricRollup.objects.filter(
+        metric__in=metrics,
+        resolution=resolution,
+        period_start__gte=period_start(start, resolution),
+        period_start__lt=end,
+    )
+    if sources:
+        queryset = queryset.filter(source__in=sources)
+    for name, value in (dimensions or {}).items():
+        queryset = queryset.filter(**{f'dimensions__{name}': value})
+    return queryset.order_by()
+
+
+def series(metric, start, end, resolution=None, sources=None, dimensions=None):
+    """[{'period_start', 'value'}, ...] for one metric, aggregated per its aggregation_type"""
+    return list(
+        rollup_queryset([metric], start, end, resolution, sources, dimensions)
+        .values('period_start')
+        .annotate(value=aggregate_expression(metric.aggregation_type))
+        .order_by('period_start')
+    )
+
+
+rollup_engine = RollupEngine()
@@ -1,8 +1,16 @@
-from rest_framework import viewsets, permissions
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
 from .models import (
     AnalyticsSource, AnalyticsMetric, AnalyticsData, Dashboard,
     DashboardWidget, AnalyticsReport, UserActivity
 )
+from .reports import next_run_after, stream_response
+from .serializers import AnalyticsReportSerializer, DashboardSerializer, DashboardWidgetSerializer
+from .widgets import WidgetQuery, dashboard_data, resolve_date_range
 
 
 class AnalyticsSourceViewSet(viewsets.ModelViewSet):
@@ -15,19 +23,115 @@ class AnalyticsMetricViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 
+def _visible_dashboards(user):
+    if user.is_staff:
+        return Dashboard.objects.all()
+    return Dashboard.objects.filter(
+        Q(is_public=True) | Q(created_by=user) | Q(pk__in=Dashboard.shared_with.through.objects.filter(
+            user=user
+        ).values('dashboard_id'))
+    )
+
+
 class DashboardViewSet(viewsets.ModelViewSet):
     queryset = Dashboard.objects.all()
+    serializer_class = DashboardSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return _visible_dashboards(self.request.user)
+    
+    @action(detail=True, methods=['get'])
+    def data(self, request, pk=None):
+        """Chart data for every visible widget in one call (?refresh=1 bypasses the cache)"""
+        dashboard = self.get_object()
+        widgets = list(dashboard.widgets.filter(is_visible=True).prefetch_related('metrics', 'sources'))
+        results = dashboard_data(dashboard, widgets, use_cache=not request.query_params.get('refresh'))
+        return Response({
+            'dashboard': dashboard.pk,
+            'widgets': [results[widget.pk] for widget in widgets],
+        })
 
 
 class DashboardWidgetViewSet(viewsets.ModelViewSet):
     queryset = DashboardWidget.objects.all()
+    serializer_class = DashboardWidgetSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        return DashboardWidget.objects.filter(
+            dashboard__in=_visible_dashboards(self.request.user)
+        ).prefetch_related('metrics', 'sources')
+    
+    @action(detail=True, methods=['get'])
+    def data(self, request, pk=None):
+        """Chart data for one widget (?refresh=1 bypasses the cache)"""
+        widget = self.get_object()
+        try:
+            data = WidgetQuery(widget).data(use_cache=not request.query_params.get('refresh'))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
 
 class AnalyticsReportViewSet(viewsets.ModelViewSet):
     queryset = AnalyticsReport.objects.all()
+    serializer_class = AnalyticsReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    
+    def get_queryset(self):
+        user = self.request.user
+        if user.is_staff:
+            return AnalyticsReport.objects.all()
+        return AnalyticsReport.objects.filter(
+            Q(created_by=user) | Q(pk__in=AnalyticsReport.recipients.through.objects.filter(
+                user=user
+            ).values('analyticsreport_id'))
+        )
+    
+    def _schedule(self, report):
+        if report.is_scheduled and report.next_run is None:
+            report.next_run = next_run_after(report.report_type, timezone.now())
+            report.save(update_fields=['next_run'])
+    
+    def _check_owner(self, report):
+        # Recipients can read and export a report, not change it
+        if report.created_by_id != self.request.user.pk and not self.request.user.is_staff:
+            raise PermissionDenied('Only the creator can change this report.')
+    
+    def perform_create(self, serializer):
+        self._schedule(serializer.save(created_by=self.request.user))
+    
+    def perform_update(self, serializer):
+        self._check_owner(serializer.instance)
+        self._schedule(serializer.save())
+    
+    def perform_destroy(self, instance):
+        self._check_owner(instance)
+        instance.delete()
+    
+    @action(detail=True, methods=['get'])
+    def export(self, request, pk=None):
+        """
+        Stream the report as a download.
+        
+        ?file_format=csv|excel|json overrides the report's format; ?start= and
+        ?end= override its last complete period; ?raw=1 exports raw data points.
+        """
+        report = self.get_object()
+        start = end = None
+        raw = None
+        try:
+            if request.query_params.get('start'):
+                start, end = resolve_date_range({
+                    'start': request.query_params['start'],
+                    'end': request.query_params.get('end'),
+                })
+            if 'raw' in request.query_params:
+                raw = request.query_params['raw'] in ('1', 'true')
+            return stream_response(report, request.query_params.get('file_format'), start, end, raw)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
 
 class UserActivityViewSet(viewsets.ReadOnlyModelViewSet):
@@ -0,0 +1,296 @@
+"""
+Chart data for dashboard widgets.
+
+``WidgetQuery`` turns a ``DashboardWidget``'s metrics, sources, date_range
+and filters into one grouped query over ``MetricRollup`` (see
+``apps.analytics.timeseries``) and shapes the rows with pandas into what
+the widget type draws:
+
+- ``line_chart``: one series per metric over a continuous time axis
+- ``bar_chart``: one series per metric, by period or by the dimension in
+  ``chart_config['group_by']``
+- ``heatmap``: weekday x hour (or weekday x week for coarse ranges) for the
+  widget's first metric
+- anything else: a single total per metric
+
+``date_range`` accepts ``{'start': iso, 'end': iso}`` or ``{'days': n}``
+(default 30 days). ``filters`` maps dimension names to a value or a list of
+values; ``filters['resolution']`` forces hour/day/month.
+
+Results are cached per widget for its ``refresh_interval``. The cache key
+includes the widget's ``updated_at`` and metric/source ids, so editing a
+widget shows fresh data straight away.
+"""
+import math
+from datetime import datetime, time, timedelta
+
+import numpy as np
+import pandas as pd
+from django.core.cache import cache
+from django.db.models import Max, Min, Sum
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .timeseries import period_start, resolution_for, rollup_queryset
+
+DEFAULT_RANGE_DAYS = 30
+PANDAS_FREQ = {'hour': 'H', 'day': 'D', 'month': 'MS'}
+WEEKDAYS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+
+def _parse_moment(value, end=False):
+    if not value:
+        return None
+    moment = parse_datetime(str(value))
+    if moment is None:
+        day = parse_date(str(value))
+        if day is None:
+            raise ValueError(f"Invalid date in date_range: {value!r}")
+        moment = datetime.combine(day, time.min)
+        if end:
+            moment += timedelta(days=1)
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def resolve_date_range(date_range, now=None):
+    """(start, end) for a widget's date_range JSON"""
+    now = now or timezone.now()
+    date_range = date_range or {}
+    end = _parse_moment(date_range.get('end'), end=True) or now
+    start = _parse_moment(date_range.get('start'))
+    if start is None:
+        days = int(date_range.get('days') or date_range.get('last_days') or DEFAULT_RANGE_DAYS)
+        start = end - timedelta(days=days)
+    if start >= end:
+        raise ValueError("date_range start must be before end")
+    return start, end
+
+
+def widget_cache_key(widget):
+    metric_ids = ','.join(str(pk) for pk in sorted(metric.pk for metric in widget.metrics.all()))
+    source_ids = ','.join(str(pk) for pk in sorted(source.pk for source in widget.sources.all()))
+    stamp = int(widget.updated_at.timestamp()) if widget.updated_at else 0
+    return f'analytics:widget:{widget.pk}:{stamp}:{metric_ids}:{source_ids}'
+
+
+def _json_values(array):
+    """numpy array -> list of floats with NaN as None"""
+    return [None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+            for value in np.asarray(array, dtype=float).tolist()]
+
+
+def _combine(frame, aggregation_type):
+    """Reduce count/sum/min/max columns the way aggregation_type asks"""
+    if frame.empty:
+        return np.nan
+    if aggregation_type == 'count':
+        return float(frame['count'].sum())
+    if aggregation_type == 'average':
+        count = frame['count'].sum()
+        return float(frame['sum'].sum() / count) if count else np.nan
+    if aggregation_type == 'min':
+        return float(frame['min'].min())
+    if aggregation_type == 'max':
+        return float(frame['max'].max())
+    return float(frame['sum'].sum())
+
+
+def _value_column(frame, aggregation_type):
+    """Per-row value column for already-grouped rows"""
+    if aggregation_type == 'count':
+        return frame['count'].astype(float)
+    if aggregation_type == 'average':
+        return frame['sum'] / frame['count'].replace(0, np.nan)
+    if aggregation_type in ('min', 'max'):
+        return frame[aggregation_type]
+    return frame['sum']
+
+
+class WidgetQuery:
+    """Computes chart data for one DashboardWidget (metrics/sources prefetched)"""
+
+    def __init__(self, widget):
+        self.widget = widget
+        self.metrics = list(widget.metrics.all())
+        self.sources = list(widget.sources.all())
+        self.filters = dict(widget.filters or {})
+        self.config = widget.chart_config or {}
+
+    def data(self, use_cache=True):
+        if not use_cache or not self.widget.refresh_interval:
+            return self.compute()
+        key = widget_cache_key(self.widget)
+        data = cache.get(key)
+        if data is None:
+            data = self.compute()
+            cache.set(key, data, self.widget.refresh_interval)
+        return data
+
+    def compute(self):
+        start, end = resolve_date_range(self.widget.date_range)
+        widget_type = self.widget.widget_type
+        resolution = self.filters.pop('resolution', None)
+        if widget_type == 'heatmap' and resolution is None:
+            resolution = 'hour' if resolution_for(end - timedelta(days=2), end) == 'hour' else 'day'
+        resolution = resolution or resolution_for(start, end)
+
+        payload = {
+            'widget': self.widget.pk,
+            'type': widget_type,
+            'title': self.widget.title,
+            'resolution': resolution,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'generated_at': timezone.now().isoformat(),
+        }
+        if not self.metrics:
+            payload.update({'labels': [], 'series': []})
+            return payload
+
+        group_by = self.config.get('group_by') if widget_type == 'bar_chart' else None
+        frame = self._load(start, end, resolution, group_by)
+
+        if widget_type == 'line_chart':
+            payload.update(self._time_series(frame, start, end, resolution))
+        elif widget_type == 'bar_chart':
+            if group_by:
+                payload.update(self._categories(frame, 'group'))
+            else:
+                payload.update(self._time_series(frame, start, end, resolution))
+        elif widget_type == 'heatmap':
+            payload.update(self._heatmap(frame, resolution))
+        else:
+            payload.update(self._totals(frame))
+        return payload
+
+    def _load(self, start, end, resolution, group_by=None):
+        """The one grouped query: count/sum/min/max per metric and period (or dimension)"""
+        queryset = rollup_queryset(self.metrics, start, end, resolution, self.sources or None)
+        for name, value in self.filters.items():
+            if isinstance(value, (list, tuple)):
+                queryset = queryset.filter(**{f'dimensions__{name}__in': list(value)})
+            else:
+                queryset = queryset.filter(**{f'dimensions__{name}': value})
+
+        group_field = f'dimensions__{group_by}' if group_by else 'period_start'
+        rows = (
+            queryset.values('metric_id', group_field)
+            .annotate(total_count=Sum('count'), total_sum=Sum('sum'), low=Min('min'), high=Max('max'))
+        )
+        frame = pd.DataFrame.from_records(
+            list(rows), columns=['metric_id', group_field, 'total_count', 'total_sum', 'low', 'high']
+        ).rename(columns={
+            group_field: 'group' if group_by else group_field,
+            'total_count': 'count', 'total_sum': 'sum', 'low': 'min', 'high': 'max',
+        })
+        for column in ('sum', 'min', 'max'):
+            frame[column] = pd.to_numeric(frame[column], errors='coerce').astype(float)
+        frame['count'] = pd.to_numeric(frame['count'], errors='coerce').fillna(0)
+        return frame
+
+    def _series_meta(self, metric):
+        return {
+            'metric': metric.pk,
+            'name': metric.display_name,
+            'color': metric.color,
+            'unit': metric.unit,
+            'aggregation': metric.aggregation_type,
+        }
+
+    def _time_series(self, frame, start, end, resolution):
+        tz = timezone.get_current_timezone()
+        index = pd.date_range(
+            start=pd.Timestamp(period_start(start, resolution)),
+            end=pd.Timestamp(end),
+            freq=PANDAS_FREQ[resolution],
+            inclusive='left',
+        )
+        if not frame.empty:
+            frame = frame.assign(period_start=pd.to_datetime(frame['period_start'], utc=True).dt.tz_convert(tz))
+
+        series = []
+        for metric in self.metrics:
+            rows = frame[frame['metric_id'] == metric.pk]
+            values = pd.Series(_value_column(rows, metric.aggregation_type).values, index=rows['period_start'])
+            values = values.reindex(index)
+            if metric.aggregation_type in ('sum', 'count'):
+                values = values.fillna(0.0)
+            series.append({**self._series_meta(metric), 'data': _json_values(values.to_numpy())})
+
+        return {'labels': [moment.isoformat() for moment in index.to_pydatetime()], 'series': series}
+
+    def _categories(self, frame, column):
+        categories = sorted(frame[column].dropna().astype(str).unique().tolist()) if not frame.empty else []
+        series = []
+        for metric in self.metrics:
+            rows = frame[frame['metric_id'] == metric.pk]
+            values = pd.Series(
+                _value_column(rows, metric.aggregation_type).values,
+                index=rows[column].astype(str),
+            ).reindex(categories)
+            series.append({**self._series_meta(metric), 'data': _json_values(values.to_numpy())})
+        return {'labels': categories, 'series': series}
+
+    def _heatmap(self, frame, resolution):
+        metric = self.metrics[0]
+        tz = timezone.get_current_timezone()
+        rows = frame[frame['metric_id'] == metric.pk]
+        if resolution == 'hour':
+            columns = [f'{hour:02d}:00' for hour in range(24)]
+        else:
+            columns = []
+
+        if rows.empty:
+            return {
+                **self._series_meta(metric),
+                'x': columns, 'y': WEEKDAYS,
+                'values': [[None] * len(columns) for _ in WEEKDAYS],
+            }
+
+        moments = pd.to_datetime(rows['period_start'], utc=True).dt.tz_convert(tz)
+        cells = rows.assign(weekday=moments.dt.weekday.values)
+        if resolution == 'hour':
+            cells = cells.assign(column=moments.dt.hour.values)
+            column_keys = list(range(24))
+        else:
+            week_start = (moments - pd.to_timedelta(moments.dt.weekday, unit='D')).dt.normalize()
+            cells = cells.assign(column=week_start.dt.date.astype(str).values)
+            column_keys = sorted(cells['column'].unique().tolist())
+            columns = column_keys
+
+        grouped = cells.groupby(['weekday', 'column'])
+        matrix = np.full((7, len(column_keys)), np.nan)
+        position = {key: i for i, key in enumerate(column_keys)}
+        for (weekday, column), group in grouped:
+            matrix[int(weekday), position[column]] = _combine(group, metric.aggregation_type)
+        if metric.aggregation_type in ('sum', 'count'):
+            matrix = np.nan_to_num(matrix, nan=0.0)
+
+        return {
+            **self._series_meta(metric),
+            'x': columns,
+            'y': WEEKDAYS,
+            'values': [_json_values(row) for row in matrix],
+        }
+
+    def _totals(self, frame):
+        series = []
+        for metric in self.metrics:
+            value = _combine(frame[frame['metric_id'] == metric.pk], metric.aggregation_type)
+            series.append({**self._series_meta(metric), 'value': _json_values([value])[0]})
+        return {'series': series}
+
+
+def dashboard_data(dashboard, widgets=None, use_cache=True):
+    """Chart data for every visible widget of a dashboard, keyed by widget id"""
+    if widgets is None:
+        widgets = dashboard.widgets.filter(is_visible=True).prefetch_related('metrics', 'sources')
+    results = {}
+    for widget in widgets:
+        try:
+            results[widget.pk] = WidgetQuery(widget).data(use_cache=use_cache)
+        except ValueError as e:
+            results[widget.pk] = {'widget': widget.pk, 'type': widget.widget_type, 'error': str(e)}
+    return results
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .api_views import ImportJobCreateView, ImportJobView
+
+urlpatterns = [
+    path('', ImportJobCreateView.as_view(), name='import_job_create'),
+    path('<str:job_id>/', ImportJobView.as_view(), name='import_job'),
+]
@@ -0,0 +1,51 @@
+import os
+
+from rest_framework import permissions, status
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .imports import DEFAULT_CHUNK_SIZE, ImportJob, start_import_job
+from .resources import RESOURCES
+
+
+class ImportJobCreateView(APIView):
+    """
+    Start a background import: multipart ``file`` plus ``resource`` (one of
+    ``apps.core.resources.RESOURCES``), optional ``format``, ``chunk_size``
+    and ``dry_run``. Returns the job, whose progress is at ``<id>/``.
+    """
+    permission_classes = [permissions.IsAdminUser]
+    parser_classes = [MultiPartParser, FormParser]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        resource = request.data.get('resource')
+        if upload is None or resource not in RESOURCES:
+            return Response(
+                {'detail': f"Send a file and a resource ({', '.join(sorted(RESOURCES))})"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        file_format = request.data.get('format') or os.path.splitext(upload.name)[1].lstrip('.').lower() or 'csv'
+        try:
+            chunk_size = max(int(request.data.get('chunk_size') or DEFAULT_CHUNK_SIZE), 1)
+        except ValueError:
+            return Response({'detail': 'chunk_size must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+        job = start_import_job(
+            resource, upload, file_format, request.user,
+            chunk_size=chunk_size,
+            dry_run=request.data.get('dry_run') in ('1', 'true', True),
+        )
+        return Response(job.state, status=status.HTTP_202_ACCEPTED)
+
+
+class ImportJobView(APIView):
+    """Progress of a background import"""
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, job_id):
+        state = ImportJob.get(job_id)
+        if state is None:
+            return Response({'detail': 'Not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(state)
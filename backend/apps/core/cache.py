@@ -0,0 +1,132 @@
+"""
+Two-level cache for hot public pages.
+
+Level one is a tiny in-process dict with a very short TTL, so a busy worker
+answers repeated hits from memory. Level two is the shared Django cache
+(Redis in production). Entries in level two carry a soft expiry ahead of the
+hard TTL: the first caller past it refreshes the value while everyone else
+keeps serving the stale copy, and a per-key lock (thread-level and, through
+``cache.add``, process-level) makes sure only one caller rebuilds at a time.
+"""
+import logging
+import random
+import threading
+import time
+import uuid
+
+from django.core.cache import cache as shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Keys for the cached public pages, shared with the invalidation signals
+HOME_CONTEXT_KEY = 'pages:home:context'
+PROJECT_FILTERS_KEY = 'pages:projects:filters'
+UPCOMING_EVENTS_KEY = 'pages:events:upcoming'
+RECOMMENDABLE_PROJECTS_KEY = 'pages:projects:recommendable'
+
+
+class TwoLevelCache:
+    """In-process cache in front of the shared cache with stampede protection"""
+
+    def __init__(self, local_ttl=5, lock_timeout=10, early_refresh=0.2):
+        self.local_ttl = local_ttl
+        self.lock_timeout = lock_timeout
+        self.early_refresh = early_refresh
+        self._local = {}
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def get_or_set(self, key, builder, timeout=300, local_ttl=None):
+        """Return the cached value for key, calling builder() on a miss"""
+        value = self._get_local(key)
+        if value is not None:
+            return value
+
+        envelope = shared_cache.get(key)
+        if envelope is not None and not self._is_soft_expired(envelope):
+            self._set_local(key, envelope['value'], local_ttl)
+            return envelope['value']
+
+        with self._key_lock(key):
+            # Another thread may have refreshed while we waited for the lock
+            value = self._get_local(key)
+            if value is not None:
+                return value
+
+            lock_key = f'{key}:lock'
+            token = uuid.uuid4().hex
+            if not shared_cache.add(lock_key, token, self.lock_timeout):
+                # Another process is rebuilding; serve stale if we have it
+                if envelope is not None:
+                    self._set_local(key, envelope['value'], local_ttl)
+                    return envelope['value']
+                envelope = self._wait_for_other_process(key)
+                if envelope is not None:
+                    self._set_local(key, envelope['value'], local_ttl)
+                    return envelope['value']
+
+            try:
+                value = builder()
+                self._set_shared(key, value, timeout)
+                self._set_local(key, value, local_ttl)
+                return value
+            finally:
+                self._release(lock_key, token)
+
+    def invalidate(self, *keys):
+        """Drop keys from both levels (other workers' local copies expire on their own)"""
+        for key in keys:
+            self._local.pop(key, None)
+        shared_cache.delete_many(keys)
+
+    def clear_local(self):
+        self._local.clear()
+
+    def _get_local(self, key):
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._local.pop(key, None)
+            return None
+        return value
+
+    def _set_local(self, key, value, local_ttl=None):
+        ttl = self.local_ttl if local_ttl is None else local_ttl
+        if ttl > 0:
+            self._local[key] = (time.monotonic() + ttl, value)
+
+    def _set_shared(self, key, value, timeout):
+        # Jitter the soft expiry so workers don't all refresh in the same second
+        early = timeout * self.early_refresh * random.uniform(0.5, 1.0)
+        envelope = {'value': value, 'soft_expires': time.time() + timeout - early}
+        shared_cache.set(key, envelope, timeout)
+
+    def _is_soft_expired(self, envelope):
+        return envelope.get('soft_expires', 0) <= time.time()
+
+    def _wait_for_other_process(self, key, attempts=20, delay=0.05):
+        for _ in range(attempts):
+            time.sleep(delay)
+            envelope = shared_cache.get(key)
+            if envelope is not None:
+                return envelope
+        logger.warning(f"Timed out waiting for cache rebuild of {key}, building locally")
+        return None
+
+    def _release(self, lock_key, token):
+        # Only the caller whose token is stored owns the lock; one that gave up
+        # waiting, or whose lock expired mid-build, must not drop another's
+        if shared_cache.get(lock_key) == token:
+            shared_cache.delete(lock_key)
+
+    def _key_lock(self, key):
+        with self._locks_guard:
+            lock = self._locks.get(key)
+            if lock is None:
+                lock = self._locks[key] = threading.Lock()
+            return lock
+
+
+page_cache = TwoLevelCache()
@@ -0,0 +1,111 @@
+"""
+Per-user dashboard data.
+
+The dashboard shows a member's recent projects and event registrations with
+their totals, plus a few project recommendations. Each model is read once:
+projects as a single id/title list (which also gives the total and the set
+of projects to leave out of recommendations), registrations with the total
+attached to every row by a window count. The result is cached per user and
+evicted by ``apps.core.signals`` when the user's memberships, projects or
+registrations change.
+
+Recommendations come from a shared pool of recent active public projects
+(with their required skill ids) cached for everyone, so a page view never
+runs an anti-join against the membership table. The pool is filtered in
+Python against the user's own projects and ordered by skill overlap.
+"""
+from django.core.cache import cache
+from django.db.models import Count, Q, Window
+
+from apps.events.models import EventRegistration
+from apps.projects.models import Project, ProjectMember
+from apps.users.models import UserSkill
+
+from .cache import RECOMMENDABLE_PROJECTS_KEY, page_cache
+
+RECENT_LIMIT = 5
+RECOMMENDATION_LIMIT = 3
+RECOMMENDATION_POOL_SIZE = 100
+
+
+def dashboard_cache_key(user_id):
+    return f'dashboard:user:{user_id}'
+
+
+def invalidate_dashboard(*user_ids):
+    cache.delete_many([dashboard_cache_key(user_id) for user_id in user_ids if user_id])
+
+
+def _build_recommendation_pool():
+    projects = list(
+        Project.objects.filter(status='active', visibility='public')
+        .order_by('-created_at')
+        .only('id', 'title', 'short_description', 'created_at')
+        .prefetch_related('required_skills')[:RECOMMENDATION_POOL_SIZE]
+    )
+    return [
+        {
+            'id': project.id,
+            'title': project.title,
+            'short_description': project.short_description,
+            'created_at': project.created_at,
+            'skill_ids': frozenset(skill.id for skill in project.required_skills.all()),
+        }
+        for project in projects
+    ]
+
+
+class UserDashboard:
+    """Builds and caches the dashboard context for one user"""
+
+    timeout = 300
+
+    def __init__(self, user):
+        self.user = user
+
+    def get(self):
+        key = dashboard_cache_key(self.user.pk)
+        data = cache.get(key)
+        if data is None:
+            data = self.build()
+            cache.set(key, data, self.timeout)
+        return data
+
+    def build(self):
+        projects = self._projects()
+        registrations = self._registrations()
+        return {
+            'user_projects': projects[:RECENT_LIMIT],
+            'total_projects': len(projects),
+            'user_events': registrations,
+            'total_events': registrations[0].total if registrations else 0,
+            'recommended_projects': self._recommendations({project['id'] for project in projects}),
+        }
+
+    def _projects(self):
+        # Memberships go through a subquery so no join/distinct is needed
+        member_project_ids = ProjectMember.objects.filter(user=self.user).values('project_id')
+        return list(
+            Project.objects.filter(Q(created_by=self.user) | Q(pk__in=member_project_ids))
+            .order_by('-created_at')
+            .values('id', 'title', 'created_at')
+        )
+
+    def _registrations(self):
+        return list(
+            EventRegistration.objects.filter(user=self.user)
+            .select_related('event')
+            .annotate(total=Window(expression=Count('pk')))
+            .order_by('-registered_at')[:RECENT_LIMIT]
+        )
+
+    def _recommendations(self, exclude_ids):
+        pool = page_cache.get_or_set(RECOMMENDABLE_PROJECTS_KEY, _build_recommendation_pool, timeout=600)
+        candidates = [project for project in pool if project['id'] not in exclude_ids]
+        if not candidates:
+            return []
+
+        user_skill_ids = set(UserSkill.objects.filter(user=self.user).values_list('skill_id', flat=True))
+        # Stable sort keeps newest-first among projects with the same overlap
+        candidates.sort(key=lambda project: len(project['skill_ids'] & user_skill_ids), reverse=True)
+        return candidates[:RECOMMENDATION_LIMIT]
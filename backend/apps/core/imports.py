@@ -0,0 +1,194 @@
+"""
+Chunked imports for the resources in ``apps.core.resources``.
+
+``run_import`` reads a CSV file ``chunk_size`` rows at a time (other tablib
+formats are loaded once and sliced) and imports each chunk in its own
+transaction, so a bad chunk is rolled back on its own and the rest of the
+file still goes in. Progress and the first ``MAX_REPORTED_ERRORS`` errors
+are kept on an ``ImportJob``, which is stored in the cache so any process
+can read it.
+
+``start_import_job`` runs an import on a background thread for uploads
+through the API; ``manage.py import_data`` runs one in the foreground for
+files on disk.
+"""
+import csv
+import io
+import logging
+import tempfile
+import threading
+import uuid
+from collections import defaultdict
+
+import tablib
+from django.core.cache import cache
+from django.db import connections
+from django.utils import timezone
+
+from .resources import get_resource_class
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 50
+JOB_KEY = 'imports:job:{}'
+JOB_TIMEOUT = 60 * 60 * 24 * 7
+
+
+class ImportJob:
+    """Progress of one import, persisted in the cache"""
+
+    def __init__(self, resource, filename, user_id=None, job_id=None):
+        self.state = {
+            'id': job_id or uuid.uuid4().hex,
+            'resource': resource,
+            'file': filename,
+            'user_id': user_id,
+            'status': 'queued',
+            'total': None,
+            'processed': 0,
+            'new': 0,
+            'update': 0,
+            'skip': 0,
+            'error': 0,
+            'invalid': 0,
+            'errors': [],
+            'started_at': None,
+            'finished_at': None,
+        }
+
+    @property
+    def id(self):
+        return self.state['id']
+
+    @classmethod
+    def get(cls, job_id):
+        return cache.get(JOB_KEY.format(job_id))
+
+    def update(self, **values):
+        self.state.update(values)
+        self.save()
+
+    def save(self):
+        cache.set(JOB_KEY.format(self.id), self.state, JOB_TIMEOUT)
+
+    def add_error(self, row, message):
+        if len(self.state['errors']) < MAX_REPORTED_ERRORS:
+            self.state['errors'].append({'row': row, 'error': message})
+
+
+def count_csv_rows(file):
+    """Data rows in a seekable binary CSV file (the header is not counted)"""
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        return max(sum(1 for _ in csv.reader(text)) - 1, 0)
+    finally:
+        text.detach()
+        file.seek(0)
+
+
+def read_chunks(file, file_format='csv', chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield tablib Datasets of at most chunk_size rows from a binary file"""
+    if file_format == 'csv':
+        text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        reader = csv.reader(text)
+        headers = next(reader, None)
+        if headers is None:
+            return
+        rows = []
+        for row in reader:
+            if not any(row):
+                continue
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                yield tablib.Dataset(*rows, headers=headers)
+                rows = []
+        if rows:
+            yield tablib.Dataset(*rows, headers=headers)
+        return
+
+    dataset = tablib.Dataset().load(file.read(), format=file_format)
+    for start in range(0, len(dataset), chunk_size):
+        yield tablib.Dataset(*dataset[start:start + chunk_size], headers=dataset.headers)
+
+
+def run_import(resource_name, file, file_format='csv', chunk_size=DEFAULT_CHUNK_SIZE,
+               dry_run=False, job=None, progress=None):
+    """
+    Import a binary file chunk by chunk; returns the job state.
+
+    progress, if given, is called with the job state after every chunk.
+    """
+    resource = get_resource_class(resource_name)()
+    job = job or ImportJob(resource_name, getattr(file, 'name', None))
+    total = count_csv_rows(file) if file_format == 'csv' and file.seekable() else None
+    job.update(status='running', total=total, started_at=timezone.now().isoformat())
+
+    try:
+        offset = 0
+        for chunk in read_chunks(file, file_format, chunk_size):
+            result = resource.import_data(chunk, dry_run=dry_run, use_transactions=True, raise_errors=False)
+            totals = defaultdict(int, result.totals)
+            if result.has_errors():
+                # The whole chunk was rolled back
+                job.state['error'] += len(chunk)
+                for error in result.base_errors:
+                    job.add_error(None, f'Rows {offset + 1}-{offset + len(chunk)}: {error.error}')
+                for number, errors in result.row_errors():
+                    for error in errors:
+                        job.add_error(offset + number, str(error.error))
+            else:
+                for kind in ('new', 'update', 'skip'):
+                    job.state[kind] += totals[kind]
+            job.state['invalid'] += totals['invalid']
+            for row in result.invalid_rows:
+                job.add_error(offset + row.number, '; '.join(
+                    f'{field}: {", ".join(messages)}' for field, messages in row.error_dict.items()
+                ))
+            offset += len(chunk)
+            job.update(processed=offset)
+            if progress:
+                progress(job.state)
+    except Exception as e:
+        logger.exception(f"Import of {resource_name} failed")
+        job.add_error(None, str(e))
+        job.update(status='failed', finished_at=timezone.now().isoformat())
+        return job.state
+
+    job.update(status='finished', finished_at=timezone.now().isoformat())
+    return job.state
+
+
+def start_import_job(resource_name, uploaded_file, file_format='csv', user=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """Copy an upload to a temporary file and import it on a background thread"""
+    get_resource_class(resource_name)
+    job = ImportJob(resource_name, getattr(uploaded_file, 'name', None), getattr(user, 'pk', None))
+    job.save()
+
+    spool = tempfile.TemporaryFile()
+    for chunk in uploaded_file.chunks():
+        spool.write(chunk)
+    spool.seek(0)
+
+    def work():
+        try:
+            run_import(resource_name, spool, file_format, chunk_size, dry_run, job)
+        finally:
+            spool.close()
+            connections.close_all()
+
+    threading.Thread(target=work, name=f'import-{job.id}', daemon=True).start()
+    return job
+
+
+def export_csv(resource_name, output, queryset=None):
+    """Write a resource's rows to a text file as CSV without building a Dataset; returns the row count"""
+    resource = get_resource_class(resource_name)()
+    writer = csv.writer(output)
+    writer.writerow(resource.get_export_headers())
+    rows = 0
+    for obj in resource.iter_queryset(queryset if queryset is not None else resource.get_queryset()):
+        writer.writerow(resource.export_resource(obj))
+        rows += 1
+    return rows
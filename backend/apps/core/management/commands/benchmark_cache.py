@@ -0,0 +1,149 @@
+import statistics
+import tempfile
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare cache and session backend latency (raw cache ops and full requests)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=500,
+            help='Number of operations per backend'
+        )
+        parser.add_argument(
+            '--url',
+            type=str,
+            default='/dashboard/',
+            help='Session-authenticated URL to time for each backend'
+        )
+        parser.add_argument(
+            '--username',
+            type=str,
+            default='admin',
+            help='User to log in as for request timings'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=50,
+            help='Number of requests per backend'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        backends = self._candidate_backends()
+
+        self.stdout.write(self.style.SUCCESS('Raw cache operations (get+set)'))
+        for name, config in backends:
+            try:
+                timings = self._time_cache(config, iterations)
+            except Exception as e:
+                self.stdout.write(self.style.WARNING(f'  {name}: skipped ({e})'))
+                continue
+            self._report(name, timings)
+
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            self.stdout.write(
+                self.style.WARNING(f"User '{options['username']}' not found, skipping request timings")
+            )
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Requests to {options['url']}"))
+        for name, config in backends:
+            for engine in self._session_engines(config):
+                label = f'{name} + {engine.rsplit(".", 1)[-1]} sessions'
+                try:
+                    timings = self._time_requests(
+                        config, engine, user, options['url'], options['requests']
+                    )
+                except Exception as e:
+                    self.stdout.write(self.style.WARNING(f'  {label}: skipped ({e})'))
+                    continue
+                self._report(label, timings)
+
+    def _candidate_backends(self):
+        backends = [
+            ('locmem', {
+                'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+                'LOCATION': 'benchmark',
+            }),
+            ('file', {
+                'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                'LOCATION': tempfile.mkdtemp(prefix='dnc-cache-bench-'),
+            }),
+        ]
+        if 'cache_table' in connection.introspection.table_names():
+            backends.append(('database', {
+                'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                'LOCATION': 'cache_table',
+            }))
+        redis_url = getattr(settings, 'REDIS_URL', '')
+        if redis_url:
+            backends.append(('redis', {
+                'BACKEND': 'django_redis.cache.RedisCache',
+                'LOCATION': redis_url,
+                'OPTIONS': {'CLIENT_CLASS': 'django_redis.client.DefaultClient'},
+            }))
+        return backends
+
+    def _session_engines(self, config):
+        engines = ['django.contrib.sessions.backends.db']
+        # cached_db on top of the database cache would just be two db reads
+        if 'DatabaseCache' not in config['BACKEND']:
+            engines.append('django.contrib.sessions.backends.cached_db')
+        return engines
+
+    def _time_cache(self, config, iterations):
+        with override_settings(CACHES={'default': config}):
+            cache = caches.create_connection('default')
+            payload = {'id': 1, 'title': 'x' * 512, 'tags': list(range(20))}
+            cache.set('bench:warmup', payload)
+            cache.get('bench:warmup')
+
+            timings = []
+            for i in range(iterations):
+                key = f'bench:{i % 50}'
+                start = time.perf_counter()
+                cache.set(key, payload, 60)
+                cache.get(key)
+                timings.append(time.perf_counter() - start)
+            cache.clear()
+            return timings
+
+    def _time_requests(self, config, engine, user, url, count):
+        with override_settings(CACHES={'default': config}, SESSION_ENGINE=engine):
+            caches['default'].clear()
+            client = Client()
+            client.force_login(user)
+            client.get(url)
+
+            timings = []
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.get(url)
+                timings.append(time.perf_counter() - start)
+                if response.status_code >= 500:
+                    raise RuntimeError(f'HTTP {response.status_code}')
+            return timings
+
+    def _report(self, name, timings):
+        timings_ms = sorted(t * 1000 for t in timings)
+        p95 = timings_ms[int(len(timings_ms) * 0.95) - 1]
+        self.stdout.write(
+            f'  {name:<40} mean {statistics.mean(timings_ms):7.3f}ms  '
+            f'p50 {statistics.median(timings_ms):7.3f}ms  p95 {p95:7.3f}ms'
+        )
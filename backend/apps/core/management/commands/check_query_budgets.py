@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.query_budget import SEED_ROWS, check_query_budgets
+
+
+class Command(BaseCommand):
+    help = 'Render every page in dnc/urls.py against seeded data and check per-page query budgets'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=SEED_ROWS,
+            help='Rows to seed per list (rolled back afterwards)'
+        )
+        parser.add_argument(
+            '--verbose-roles',
+            action='store_true',
+            help='Show the status code and query count for every role'
+        )
+
+    def handle(self, *args, **options):
+        report = check_query_budgets(rows=options['rows'])
+
+        failures = []
+        for name, path, worst, budget, counts in report:
+            if budget is None:
+                status = self.style.WARNING('NO BUDGET')
+                failures.append(name)
+            elif worst > budget:
+                status = self.style.ERROR('OVER')
+                failures.append(name)
+            else:
+                status = self.style.SUCCESS('ok')
+            budget_label = '-' if budget is None else budget
+            self.stdout.write(f'  {name:<22} {path:<34} {worst:>3} / {budget_label:<3} {status}')
+
+            unexpected = [
+                f'{role} (HTTP {code}, expected {expected})'
+                for role, (code, _, expected) in counts.items() if code != expected
+            ]
+            if unexpected:
+                self.stdout.write(self.style.ERROR(f"    unexpected status for: {', '.join(unexpected)}"))
+                failures.append(name)
+            if options['verbose_roles']:
+                for role, (code, count, _) in counts.items():
+                    self.stdout.write(f'    {role:<10} HTTP {code}  {count} queries')
+
+        if failures:
+            raise CommandError(f"Query budget check failed for: {', '.join(sorted(set(failures)))}")
+        self.stdout.write(self.style.SUCCESS(f'All {len(report)} pages within their query budgets'))
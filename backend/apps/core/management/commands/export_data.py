@@ -0,0 +1,26 @@
+import sys
+
+from django.core.management.base import BaseCommand
+
+from apps.core.imports import export_csv
+from apps.core.resources import RESOURCES
+
+
+class Command(BaseCommand):
+    help = 'Export an import-export resource as CSV, streaming rows instead of building the file in memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(RESOURCES))
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='File to write (default: stdout)'
+        )
+
+    def handle(self, *args, **options):
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                rows = export_csv(options['resource'], output)
+            self.stderr.write(self.style.SUCCESS(f"Exported {rows} rows to {options['output']}"))
+        else:
+            export_csv(options['resource'], sys.stdout)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.counters import view_counter
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered view counts to the database (run from cron or celery beat)'
+
+    def handle(self, *args, **options):
+        written = view_counter.flush()
+        if not written:
+            self.stdout.write('No pending view counts')
+            return
+
+        for label, rows in written.items():
+            self.stdout.write(f'{label}: {rows} rows updated')
+
+        stats = view_counter.stats
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Flushed {stats['flushed_views']} views in {stats['statements']} statements "
+                f"({stats['rows']} row updates instead of {stats['flushed_views']})"
+            )
+        )
@@ -0,0 +1,58 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.imports import DEFAULT_CHUNK_SIZE, run_import
+from apps.core.resources import RESOURCES
+
+
+class Command(BaseCommand):
+    help = 'Import a CSV/XLSX/JSON file through an import-export resource, in chunked transactions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('resource', choices=sorted(RESOURCES))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--format',
+            default=None,
+            help='tablib format (csv, xlsx, json, ...); defaults to the file extension'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Rows per transaction'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate and roll back every chunk'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f'No such file: {path}')
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+
+        def progress(state):
+            total = f"/{state['total']}" if state['total'] is not None else ''
+            self.stdout.write(
+                f"{state['processed']}{total} rows: {state['new']} new, {state['update']} updated, "
+                f"{state['error']} failed, {state['invalid']} invalid"
+            )
+
+        with open(path, 'rb') as file:
+            state = run_import(
+                options['resource'], file, file_format, options['chunk_size'], options['dry_run'],
+                progress=progress,
+            )
+
+        for error in state['errors']:
+            row = f"row {error['row']}: " if error['row'] else ''
+            self.stderr.write(f"{row}{error['error']}")
+        if state['status'] != 'finished':
+            raise CommandError('Import failed')
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {state['new']} new and {state['update']} updated {options['resource']}"
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.partitions import (
+    PARTITIONED_TABLES, ensure_future_partitions, expire_partitions, is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly partitions and retire expired ones (PostgreSQL; run daily from cron or celery beat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--table',
+            choices=sorted(PARTITIONED_TABLES),
+            action='append',
+            help='Only manage this table (repeatable; default all)'
+        )
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Number of future months to keep partitions for'
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Drop expired partitions instead of detaching them'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would change without changing anything'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        for table in options['table'] or sorted(PARTITIONED_TABLES):
+            if not is_partitioned(table):
+                self.stdout.write(self.style.WARNING(f'{table}: not partitioned, skipping'))
+                continue
+
+            created = ensure_future_partitions(table, options['months_ahead'], dry_run=dry_run)
+            not_after = self._rolled_up_to() if table == 'analytics_data' else None
+            retired = expire_partitions(table, drop=options['drop'], not_after=not_after, dry_run=dry_run)
+
+            verb = 'drop' if options['drop'] else 'detach'
+            prefix = 'would ' if dry_run else ''
+            self.stdout.write(f"{table}: {prefix}create {', '.join(created) or 'nothing'}")
+            self.stdout.write(f"{table}: {prefix}{verb} {', '.join(retired) or 'nothing'}")
+
+        self.stdout.write(self.style.SUCCESS('Partitions up to date'))
+
+    def _rolled_up_to(self):
+        # Raw analytics points may only go once the rollups have absorbed them
+        from apps.analytics.models import RollupWatermark
+        from apps.analytics.timeseries import WATERMARK_NAME, rollup_engine
+
+        rollup_engine.refresh()
+        watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).first()
+        return watermark.watermark if watermark else None
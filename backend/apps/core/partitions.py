@@ -0,0 +1,156 @@
+"""
+Monthly range partitions for the append-only analytics tables (PostgreSQL).
+
+``analytics_data`` and ``user_activities`` are partitioned by month on their
+timestamp column (see ``analytics/migrations/0004_partition_tables.py``);
+partitions are named ``<table>_pYYYYMM`` and a ``<table>_default``
+partition catches anything without one. The ORM models are unchanged, and
+queries that filter on the timestamp only touch the matching partitions.
+
+``manage.py manage_partitions`` keeps a few months of empty partitions ahead
+of time and retires the ones past their retention window by detaching them
+(kept as plain tables for archiving) or dropping them, which is a catalog
+change rather than a DELETE of millions of rows. On other databases every
+function here is a no-op.
+"""
+import logging
+import re
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# table -> (partition column, retention setting, default retention in days)
+PARTITIONED_TABLES = {
+    'analytics_data': ('date', 'ANALYTICS_RAW_RETENTION_DAYS', 90),
+    'user_activities': ('created_at', 'USER_ACTIVITY_RETENTION_DAYS', 365),
+}
+
+
+def month_start(value):
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(value):
+    return month_start(month_start(value) + timedelta(days=32))
+
+
+def retention_days(table):
+    _, setting, default = PARTITIONED_TABLES[table]
+    return getattr(settings, setting, default)
+
+
+def is_partitioned(table):
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT relkind FROM pg_class WHERE relname = %s", [table])
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def list_partitions(table):
+    """[(partition name, month start as aware datetime)] for attached monthly partitions"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = %s
+            """,
+            [table],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+
+    pattern = re.compile(rf'^{re.escape(table)}_p(\d{{4}})(\d{{2}})$')
+    partitions = []
+    for name in names:
+        match = pattern.match(name)
+        if match:
+            start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=timezone.utc)
+            partitions.append((name, start))
+    return sorted(partitions, key=lambda partition: partition[1])
+
+
+def create_partition(table, start, dry_run=False):
+    """
+    Create the partition for the month starting at start.
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition, since Postgres refuses to create a
+    partition that would overlap them.
+    """
+    column = PARTITIONED_TABLES[table][0]
+    end = next_month(start)
+    name = f'{table}_p{start:%Y%m}'
+    if dry_run:
+        return name
+
+    bounds = [start, end]
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE partition_move ON COMMIT DROP AS "
+            f"SELECT * FROM {table}_default WHERE {column} >= %s AND {column} < %s",
+            bounds,
+        )
+        cursor.execute(f"DELETE FROM {table}_default WHERE {column} >= %s AND {column} < %s", bounds)
+        cursor.execute(
+            f"CREATE TABLE {name} PARTITION OF {table} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM partition_move")
+    logger.info(f"Created partition {name}")
+    return name
+
+
+def ensure_future_partitions(table, months_ahead=3, now=None, dry_run=False):
+    """Make sure partitions exist from the current month through months_ahead; returns created names"""
+    if not is_partitioned(table):
+        return []
+    now = now or timezone.now()
+    existing = {start for _, start in list_partitions(table)}
+
+    created = []
+    month = month_start(now.astimezone(timezone.utc))
+    for _ in range(months_ahead + 1):
+        if month not in existing:
+            created.append(create_partition(table, month, dry_run=dry_run))
+        month = next_month(month)
+    return created
+
+
+def expire_partitions(table, days=None, drop=False, not_after=None, now=None, dry_run=False):
+    """
+    Detach (or drop) partitions whose whole month is older than the retention window.
+
+    not_after, if given, also caps which partitions may go: only months that
+    end at or before it are retired (e.g. the analytics rollup watermark, so
+    raw data is never removed before it has been rolled up).
+    """
+    if not is_partitioned(table):
+        return []
+    now = now or timezone.now()
+    days = retention_days(table) if days is None else days
+    cutoff = now - timedelta(days=days)
+    if not_after is not None:
+        cutoff = min(cutoff, not_after)
+
+    retired = []
+    for name, start in list_partitions(table):
+        if next_month(start) > cutoff:
+            continue
+        retired.append(name)
+        if dry_run:
+            continue
+        with connection.cursor() as cursor:
+            cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+            if drop:
+                cursor.execute(f"DROP TABLE {name}")
+        logger.info(f"{'Dropped' if drop else 'Detached'} partition {name}")
+    return retired
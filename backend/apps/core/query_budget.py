@@ -0,0 +1,288 @@
+"""
+Query budgets for the server-rendered pages in ``dnc/urls.py``.
+
+``QUERY_BUDGETS`` caps the number of SQL queries each named page may issue.
+Budgets are per page, not per row: ``check_query_budgets`` seeds a dataset
+with ``SEED_ROWS`` rows per list (more than any page shows), so a page that
+loads related objects one row at a time blows well past its budget.
+
+Everything runs inside a transaction that is rolled back, against a private
+in-memory cache (so cached pages are measured on a cold cache) and with the
+buffered view counter and activity recording switched off. Each page is
+rendered as an anonymous visitor, a regular member and a staff user, each
+with a fresh session (``logout`` goes last); the highest count is checked,
+and a page that answers with anything but the status expected for the role
+(a redirect to the login page where it should render, a server error) fails.
+
+Use ``manage.py check_query_budgets`` locally or in CI; it exits non-zero
+when a page is over budget or a named page has no budget yet.
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from apps.core.cache import page_cache
+from apps.core.counters import view_counter
+
+User = get_user_model()
+
+SEED_ROWS = 15
+
+# Maximum queries per page, worst case over the three roles. Auth/session
+# lookups for logged-in roles are included.
+QUERY_BUDGETS = {
+    'login': 2,
+    'register': 2,
+    'password_reset': 2,
+    'logout': 4,
+    'dashboard': 8,
+    'user_profile': 2,
+    'admin_dashboard': 10,
+    'admin_users': 4,
+    'admin_analytics': 7,
+    'community_directory': 5,
+    'member_profile': 6,
+    'connect_request': 3,
+    'projects_listing': 4,
+    'project_create': 4,
+    'project_detail': 6,
+    'project_apply': 3,
+    'events_listing': 5,
+    'event_detail': 5,
+    'event_register': 3,
+    'forum_categories': 3,
+    'forum_topics': 5,
+    'topic_detail': 5,
+    'topic_create': 3,
+    'post_create': 3,
+    'api_docs': 2,
+    'home': 8,
+    'analytics_dashboard': 8,
+}
+
+ROLES = ('anonymous', 'member', 'staff')
+
+# Pages behind @login_required redirect anonymous visitors, and the admin
+# pages also redirect members; every other role/page pair must render (200)
+LOGIN_REQUIRED = {
+    'logout', 'dashboard', 'project_create', 'project_apply', 'event_register',
+    'topic_create', 'post_create', 'connect_request', 'analytics_dashboard',
+    'admin_dashboard', 'admin_users', 'admin_analytics',
+}
+STAFF_ONLY = {'admin_dashboard', 'admin_users', 'admin_analytics'}
+# Measured last: it ends the session it runs in
+LOGOUT = 'logout'
+
+
+def expected_status(name, role):
+    if name == LOGOUT:
+        return 302
+    if role == 'anonymous' and name in LOGIN_REQUIRED:
+        return 302
+    if role == 'member' and name in STAFF_ONLY:
+        return 302
+    return 200
+
+
+class SeededData:
+    """Objects created by seed(), used to fill in URL arguments"""
+
+    def __init__(self, member, staff, project, event, category, topic):
+        self.member = member
+        self.staff = staff
+        self.project = project
+        self.event = event
+        self.category = category
+        self.topic = topic
+
+    def url_kwargs(self, pattern):
+        values = {
+            'pk': {
+                'project_detail': self.project.pk,
+                'event_detail': self.event.pk,
+                'topic_detail': self.topic.pk,
+            },
+            'user_id': self.member.pk,
+            'project_id': self.project.pk,
+            'event_id': self.event.pk,
+            'category_id': self.category.pk,
+            'topic_id': self.topic.pk,
+        }
+        kwargs = {}
+        for name in pattern.pattern.converters:
+            value = values.get(name)
+            if isinstance(value, dict):
+                value = value.get(pattern.name)
+            if value is None:
+                raise KeyError(f"No seeded value for <{name}> in '{pattern.name}'")
+            kwargs[name] = value
+        return kwargs
+
+
+def seed(rows=SEED_ROWS):
+    """Create a dataset large enough that per-row queries stand out"""
+    from apps.analytics.models import UserActivity
+    from apps.events.models import Event, EventRegistration
+    from apps.forum.models import ForumCategory, ForumPost, ForumTopic
+    from apps.projects.models import Project, ProjectApplication, ProjectCategory, ProjectMember
+    from apps.users.models import Skill, UserSkill
+
+    now = timezone.now()
+    member = User.objects.create_user(
+        username='budget-member', email='budget-member@example.com', password='budget'
+    )
+    staff = User.objects.create_user(
+        username='budget-staff', email='budget-staff@example.com', password='budget', is_staff=True
+    )
+    others = User.objects.bulk_create([
+        User(username=f'budget-user-{i}', email=f'budget-user-{i}@example.com', password='!')
+        for i in range(rows)
+    ])
+
+    skills = Skill.objects.bulk_create([
+        Skill(name=f'Budget Skill {i}', category='General') for i in range(rows)
+    ])
+    UserSkill.objects.bulk_create([UserSkill(user=member, skill=skill) for skill in skills])
+
+    project_categories = ProjectCategory.objects.bulk_create([
+        ProjectCategory(name=f'Budget Category {i}') for i in range(3)
+    ])
+    projects = Project.objects.bulk_create([
+        Project(
+            title=f'Budget Project {i}',
+            slug=f'budget-project-{i}',
+            description='Seeded for query budgets',
+            short_description='Seeded for query budgets',
+            category=project_categories[i % 3],
+            status='active',
+            created_by=others[i],
+        )
+        for i in range(rows)
+    ])
+    ProjectMember.objects.bulk_create([
+        ProjectMember(project=project, user=member, status='active') for project in projects
+    ])
+    for project in projects:
+        project.required_skills.add(*skills[:3])
+    ProjectApplication.objects.bulk_create([
+        ProjectApplication(
+            project=projects[0],
+            applicant=user,
+            message='Seeded',
+            relevant_experience='Seeded',
+            time_commitment='volunteer',
+            weekly_hours=5,
+        )
+        for user in others
+    ])
+
+    events = Event.objects.bulk_create([
+        Event(
+            title=f'Budget Event {i}',
+            slug=f'budget-event-{i}',
+            description='Seeded for query budgets',
+            short_description='Seeded for query budgets',
+            event_type='meetup',
+            status='published',
+            created_by=others[i],
+            start_date=now + timedelta(days=i + 1),
+            end_date=now + timedelta(days=i + 1, hours=2),
+        )
+        for i in range(rows)
+    ])
+    EventRegistration.objects.bulk_create(
+        [EventRegistration(event=events[0], user=user) for user in others]
+        + [EventRegistration(event=event, user=member) for event in events]
+    )
+
+    category = ForumCategory.objects.create(name='Budget Forum', slug='budget-forum')
+    topics = ForumTopic.objects.bulk_create([
+        ForumTopic(
+            category=category,
+            author=others[i],
+            title=f'Budget Topic {i}',
+            slug=f'budget-topic-{i}',
+            content='Seeded for query budgets',
+        )
+        for i in range(rows)
+    ])
+    ForumPost.objects.bulk_create([
+        ForumPost(topic=topics[0], author=user, content='Seeded reply') for user in others
+    ])
+
+    UserActivity.objects.bulk_create([
+        UserActivity(user=member, activity_type='page_view', page_url='https://example.com/')
+        for _ in range(rows)
+    ])
+
+    return SeededData(member, staff, projects[0], events[0], category, topics[0])
+
+
+def named_patterns(urlconf=None):
+    """Named page URLs defined directly in the project urlconf (not API includes)"""
+    if urlconf is None:
+        from dnc import urls as urlconf
+    return [
+        pattern for pattern in urlconf.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name
+    ]
+
+
+def measure(data, patterns=None):
+    """Return {url name: (path, {role: (status, query count, expected status)})}"""
+    users = {'anonymous': None, 'member': data.member, 'staff': data.staff}
+    patterns = sorted(patterns or named_patterns(), key=lambda pattern: pattern.name == LOGOUT)
+
+    results = {}
+    for pattern in patterns:
+        path = reverse(pattern.name, kwargs=data.url_kwargs(pattern))
+        counts = {}
+        for role in ROLES:
+            # A fresh session per page, so no page (logout above all) affects the next
+            client = Client(raise_request_exception=False)
+            if users[role] is not None:
+                client.force_login(users[role])
+            # Measure a cold page: nothing left over from the previous render
+            page_cache.clear_local()
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(path)
+            counts[role] = (response.status_code, len(queries), expected_status(pattern.name, role))
+        results[pattern.name] = (path, counts)
+    return results
+
+
+def check_query_budgets(budgets=None, rows=SEED_ROWS):
+    """
+    Seed, render every named page and compare against the budgets.
+
+    Returns a list of (url name, path, worst count, budget, counts) rows;
+    budget is None for pages that have none.
+    """
+    budgets = QUERY_BUDGETS if budgets is None else budgets
+    report = []
+    cache_settings = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'query-budgets',
+        }
+    }
+    with override_settings(
+        CACHES=cache_settings,
+        SESSION_ENGINE='django.contrib.sessions.backends.db',
+        DEBUG_TOOLBAR_CONFIG={'SHOW_TOOLBAR_CALLBACK': lambda request: False},
+        USER_ACTIVITY_ENABLED=False,
+    ), mock.patch.object(view_counter, 'increment'):
+        with transaction.atomic():
+            data = seed(rows)
+            for name, (path, counts) in measure(data).items():
+                worst = max(count for _, count, _ in counts.values())
+                report.append((name, path, worst, budgets.get(name), counts))
+            transaction.set_rollback(True)
+    page_cache.clear_local()
+    return report
@@ -0,0 +1,155 @@
+"""
+Bulk import/export resources (django-import-export).
+
+``BulkModelResource`` turns django-import-export's per-row import into a
+per-chunk one:
+
+- rows are saved with ``bulk_create``/``bulk_update`` (``use_bulk``) and no
+  diff is computed (``skip_diff``)
+- ``before_import`` loads the existing instances for the whole dataset by
+  their ``import_id_fields`` in a few ``__in`` queries, so ``get_instance``
+  is a dict lookup instead of a query per row
+- ``CachedForeignKeyWidget`` resolves a foreign-key column (e.g. users by
+  username) once per distinct value, primed in bulk from the same hook
+
+Many-to-many fields are not supported by bulk saves, so resources export
+them read-only. Bulk saves also skip ``save()`` and model signals: run
+``manage.py search_index`` after importing searchable models. Large files
+are imported in chunks (one transaction each) by ``apps.core.imports``.
+
+``RESOURCES`` names every resource for the ``import_data``/``export_data``
+commands and the imports API.
+"""
+from django.db import models
+from django.db.models import Q
+from django.utils.module_loading import import_string
+from import_export import resources
+from import_export.widgets import ForeignKeyWidget
+
+LOOKUP_BATCH_SIZE = 1000
+
+RESOURCES = {
+    'users': 'apps.users.resources.UserResource',
+    'skills': 'apps.users.resources.SkillResource',
+    'user_skills': 'apps.users.resources.UserSkillResource',
+    'projects': 'apps.projects.resources.ProjectResource',
+    'events': 'apps.events.resources.EventResource',
+    'event_registrations': 'apps.events.resources.EventRegistrationResource',
+    'goals': 'apps.outvier.resources.GoalResource',
+    'growth_pathways': 'apps.outvier.resources.GrowthPathwayResource',
+}
+
+
+def get_resource_class(name):
+    try:
+        return import_string(RESOURCES[name])
+    except KeyError:
+        raise ValueError(f"Unknown resource '{name}'; choose from {', '.join(sorted(RESOURCES))}")
+
+
+def _batches(values, size=LOOKUP_BATCH_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _key_part(value):
+    return value.pk if isinstance(value, models.Model) else value
+
+
+class CachedForeignKeyWidget(ForeignKeyWidget):
+    """ForeignKeyWidget that looks each distinct value up once"""
+
+    def __init__(self, model, field='pk', **kwargs):
+        super().__init__(model, field, **kwargs)
+        self._cache = {}
+
+    def prime(self, values):
+        """Resolve a whole column with one query per LOOKUP_BATCH_SIZE values"""
+        missing = {str(value) for value in values if value not in (None, '')} - set(self._cache)
+        for batch in _batches(missing):
+            for obj in self.model.objects.filter(**{f'{self.field}__in': batch}):
+                self._cache[str(getattr(obj, self.field))] = obj
+
+    def clean(self, value, row=None, **kwargs):
+        if value in (None, ''):
+            return None
+        key = str(value)
+        if key not in self._cache:
+            self._cache[key] = super().clean(value, row, **kwargs)
+        return self._cache[key]
+
+
+class BulkModelResource(resources.ModelResource):
+    """ModelResource tuned for large imports (see the module docstring)"""
+
+    class Meta:
+        use_bulk = True
+        batch_size = 1000
+        chunk_size = 2000
+        skip_diff = True
+        skip_unchanged = False
+        report_skipped = False
+        clean_model_instances = False
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._existing = {}
+
+    def before_import(self, dataset, using_transactions, dry_run, **kwargs):
+        self._prime_foreign_keys(dataset)
+        self._load_existing(dataset)
+
+    def _prime_foreign_keys(self, dataset):
+        for field in self.get_import_fields():
+            if isinstance(field.widget, CachedForeignKeyWidget) and field.column_name in dataset.headers:
+                field.widget.prime(dataset[field.column_name])
+
+    def _id_fields(self):
+        return [self.fields[name] for name in self.get_import_id_fields()]
+
+    def _row_key(self, row):
+        try:
+            return tuple(_key_part(field.clean(row)) for field in self._id_fields())
+        except Exception:
+            # Invalid ids are reported by import_row for the row itself
+            return None
+
+    def _load_existing(self, dataset):
+        id_fields = self._id_fields()
+        if any(field.column_name not in dataset.headers for field in id_fields):
+            self._existing = {}
+            return
+
+        keys = set()
+        for values in dataset:
+            key = self._row_key(dict(zip(dataset.headers, values)))
+            if key is not None and None not in key:
+                keys.add(key)
+
+        model_fields = [self._meta.model._meta.get_field(field.attribute) for field in id_fields]
+        existing = {}
+        for batch in _batches(keys):
+            if len(model_fields) == 1:
+                condition = Q(**{f'{model_fields[0].attname}__in': [key[0] for key in batch]})
+            else:
+                condition = Q()
+                for key in batch:
+                    condition |= Q(**{field.attname: part for field, part in zip(model_fields, key)})
+            for obj in self.get_queryset().filter(condition):
+                existing[tuple(getattr(obj, field.attname) for field in model_fields)] = obj
+        self._existing = existing
+
+    def get_instance(self, instance_loader, row):
+        key = self._row_key(row)
+        if key is None:
+            return None
+        return self._existing.get(key)
+
+    def get_bulk_update_fields(self):
+        concrete = {field.name for field in self._meta.model._meta.concrete_fields}
+        id_fields = set(self.get_import_id_fields())
+        return [
+            field.attribute for name, field in self.fields.items()
+            if name not in id_fields and not field.readonly and field.attribute in concrete
+        ]
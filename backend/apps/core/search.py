@@ -0,0 +1,112 @@
+"""
+Full-text and typeahead search helpers.
+
+On PostgreSQL, searchable models carry a ``search_vector`` tsvector column
+that a BEFORE INSERT/UPDATE trigger keeps current (see each app's
+``*_search_vector`` migration), backed by a GIN index. Full searches use a
+ranked ``websearch`` query against it; typeahead uses ILIKE on a few short
+columns that have pg_trgm GIN indexes, ordered by trigram similarity.
+
+On other databases (SQLite in tests and on small deployments) both helpers
+fall back to the old ``icontains`` filters so behaviour stays the same.
+"""
+from functools import reduce
+from operator import or_
+
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+
+# Text search configuration per model; must match the one used by the trigger
+SEARCH_CONFIGS = {
+    'projects.Project': 'english',
+    'events.Event': 'english',
+    'forum.ForumTopic': 'english',
+    'users.User': 'simple',
+}
+
+# Columns searched by the fallback path, mirroring what the triggers index
+FULL_TEXT_FIELDS = {
+    'projects.Project': ('title', 'short_description', 'description'),
+    'events.Event': ('title', 'short_description', 'description'),
+    'forum.ForumTopic': ('title', 'content'),
+    'users.User': ('username', 'first_name', 'last_name', 'email'),
+}
+
+# Short columns with trigram indexes, used for typeahead
+TYPEAHEAD_FIELDS = {
+    'projects.Project': ('title',),
+    'events.Event': ('title',),
+    'forum.ForumTopic': ('title',),
+    'users.User': ('username', 'first_name', 'last_name'),
+}
+
+# Identifier columns matched by prefix on top of full-text search, so that a
+# fragment like "john" still finds "johnsmith" (tsvector lexemes only match
+# whole words). Each has an index serving UPPER(column) LIKE 'fragment%'.
+PREFIX_FIELDS = {
+    'users.User': ('email',),
+}
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def _icontains_q(fields, query):
+    return reduce(or_, (Q(**{f'{field}__icontains': query}) for field in fields))
+
+
+def _identifier_q(label, query):
+    condition = _icontains_q(TYPEAHEAD_FIELDS[label], query)
+    for field in PREFIX_FIELDS.get(label, ()):
+        condition |= Q(**{f'{field}__istartswith': query})
+    return condition
+
+
+def full_text_search(queryset, query, extra_q=None, rank=True, partial=False):
+    """
+    Filter queryset to rows matching query, best matches first.
+
+    extra_q is OR-ed into the match condition on every backend, for criteria
+    outside the search vector (e.g. skills through a subquery). partial also
+    ORs in the typeahead match (trigram-indexed ILIKE, plus prefix matches on
+    PREFIX_FIELDS) for searches by identifier such as usernames and emails;
+    those rows rank after full-text hits.
+    """
+    label = queryset.model._meta.label
+    if not uses_postgres_search():
+        condition = _icontains_q(FULL_TEXT_FIELDS[label], query)
+        if extra_q is not None:
+            condition |= extra_q
+        return queryset.filter(condition)
+
+    from django.contrib.postgres.search import SearchQuery, SearchRank
+
+    search_query = SearchQuery(query, search_type='websearch', config=SEARCH_CONFIGS[label])
+    condition = Q(search_vector=search_query)
+    if partial:
+        condition |= _identifier_q(label, query)
+    if extra_q is not None:
+        condition |= extra_q
+    queryset = queryset.filter(condition)
+    if rank:
+        queryset = queryset.annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-search_rank')
+    return queryset
+
+
+def typeahead_search(queryset, query, limit=10):
+    """Fast prefix/substring match on short columns for AJAX autocomplete"""
+    label = queryset.model._meta.label
+    fields = TYPEAHEAD_FIELDS[label]
+    queryset = queryset.filter(_icontains_q(fields, query))
+    if not uses_postgres_search():
+        return queryset[:limit]
+
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    similarities = [TrigramSimilarity(field, query) for field in fields]
+    similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+    return queryset.annotate(similarity=similarity).order_by('-similarity')[:limit]
@@ -0,0 +1,28 @@
+from rest_framework.utils import model_meta
+
+
+class EditedFieldsUpdateMixin:
+    """
+    ModelSerializer.update that saves only the edited columns (plus auto_now
+    timestamps), so counters kept with F() updates elsewhere are never
+    written back from the copy loaded before the edit.
+    """
+
+    def update(self, instance, validated_data):
+        info = model_meta.get_field_info(instance)
+        many_to_many = {}
+        update_fields = []
+        for attr, value in validated_data.items():
+            if attr in info.relations and info.relations[attr].to_many:
+                many_to_many[attr] = value
+            else:
+                setattr(instance, attr, value)
+                update_fields.append(attr)
+        update_fields += [
+            field.name for field in instance._meta.concrete_fields if getattr(field, 'auto_now', False)
+        ]
+        if update_fields:
+            instance.save(update_fields=update_fields)
+        for attr, value in many_to_many.items():
+            getattr(instance, attr).set(value)
+        return instance
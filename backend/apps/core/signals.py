@@ -0,0 +1,69 @@
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.events.models import Event, EventRegistration
+from apps.forum.models import ForumTopic
+from apps.projects.models import Project, ProjectCategory, ProjectMember
+
+from .cache import (
+    HOME_CONTEXT_KEY, PROJECT_FILTERS_KEY, RECOMMENDABLE_PROJECTS_KEY, UPCOMING_EVENTS_KEY, page_cache,
+)
+from .dashboard import invalidate_dashboard
+
+User = get_user_model()
+
+
+def _invalidate_pages(*keys):
+    # After commit: a rebuild that ran between the delete and the commit would
+    # read the old rows and cache them for the full timeout
+    transaction.on_commit(partial(page_cache.invalidate, *keys))
+
+
+def _invalidate_dashboards(*user_ids):
+    transaction.on_commit(partial(invalidate_dashboard, *user_ids))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_pages(sender, created=True, **kwargs):
+    # Only the total user count is cached, so ordinary profile saves
+    # (e.g. last_login on every login) don't need to evict anything
+    if created:
+        _invalidate_pages(HOME_CONTEXT_KEY)
+
+
+@receiver(post_save, sender=ForumTopic)
+@receiver(post_delete, sender=ForumTopic)
+def invalidate_home_page(sender, **kwargs):
+    _invalidate_pages(HOME_CONTEXT_KEY)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_pages(sender, **kwargs):
+    _invalidate_pages(HOME_CONTEXT_KEY, UPCOMING_EVENTS_KEY)
+
+
+@receiver(post_save, sender=ProjectCategory)
+@receiver(post_delete, sender=ProjectCategory)
+def invalidate_project_filters(sender, **kwargs):
+    _invalidate_pages(PROJECT_FILTERS_KEY)
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def invalidate_project_pages(sender, instance, **kwargs):
+    _invalidate_pages(HOME_CONTEXT_KEY, RECOMMENDABLE_PROJECTS_KEY)
+    _invalidate_dashboards(instance.created_by_id)
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+@receiver(post_save, sender=EventRegistration)
+@receiver(post_delete, sender=EventRegistration)
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    _invalidate_dashboards(instance.user_id)
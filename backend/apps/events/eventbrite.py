@@ -0,0 +1,195 @@
+"""
+Reconcile EventBrite events and attendees with ``Event``/``EventRegistration``.
+
+Called by ``apps.integrations.connectors.eventbrite`` once per batch, inside
+the batch's transaction:
+
+- ``import_events`` looks the batch up with one ``eventbrite_id IN (...)``
+  query, then ``bulk_create``s new events and ``bulk_update``s the ones
+  whose synced fields changed. New events are owned by ``owner`` and
+  typed ``event_type``; everything else local (organizers, media, featured
+  flags, counters) is left alone.
+- ``import_attendees`` matches attendees to events by ``eventbrite_id`` and
+  to users by email (one query each), and creates or updates their
+  registrations the same way. Several tickets for one person collapse into
+  one registration. Attendees without a local account are skipped; rerun
+  the sync with ``--full`` to pick them up after they sign up.
+- the affected events' ``registration_count``/``attendance_count`` are then
+  recomputed from their registrations in a single UPDATE.
+
+Bulk writes skip model signals, so the cached pages and dashboards those
+signals would have invalidated are invalidated here once per batch.
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from apps.core.cache import HOME_CONTEXT_KEY, UPCOMING_EVENTS_KEY, page_cache
+from apps.core.dashboard import invalidate_dashboard
+
+from .models import Event, EventRegistration
+from .services import refresh_counts
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+EVENT_STATUSES = {
+    'draft': 'draft',
+    'live': 'published',
+    'started': 'published',
+    'ended': 'completed',
+    'completed': 'completed',
+    'canceled': 'cancelled',
+}
+
+EVENT_FIELDS = [
+    'title', 'description', 'short_description', 'status', 'start_date', 'end_date',
+    'timezone', 'is_virtual', 'max_attendees', 'eventbrite_url',
+]
+
+# Higher wins when several tickets map to one registration
+REGISTRATION_RANK = {'cancelled': 0, 'registered': 1, 'attended': 2}
+
+
+def _text(value):
+    if isinstance(value, dict):
+        return value.get('text') or ''
+    return value or ''
+
+
+def event_fields(record):
+    """Event field values for an EventBrite event"""
+    start = record.get('start') or {}
+    end = record.get('end') or {}
+    summary = record.get('summary') or ''
+    return {
+        'title': (_text(record.get('name')) or 'Untitled event')[:200],
+        'description': _text(record.get('description')) or summary,
+        'short_description': summary[:500],
+        'status': EVENT_STATUSES.get(record.get('status'), 'draft'),
+        'start_date': parse_datetime(start['utc']),
+        'end_date': parse_datetime(end.get('utc') or start['utc']),
+        'timezone': (start.get('timezone') or 'UTC')[:50],
+        'is_virtual': bool(record.get('online_event')),
+        'max_attendees': record.get('capacity') or None,
+        'eventbrite_url': record.get('url'),
+    }
+
+
+def event_slug(title, eventbrite_id):
+    suffix = f'-{eventbrite_id}'
+    max_length = Event._meta.get_field('slug').max_length
+    return f'{slugify(title)[:max_length - len(suffix)]}{suffix}'.lstrip('-')
+
+
+def import_events(records, owner, event_type='meetup'):
+    """Create or update Events for a batch of EventBrite events; returns (created, updated)"""
+    by_id = {str(record['id']): record for record in records}
+    existing = {
+        event.eventbrite_id: event
+        for event in Event.objects.filter(eventbrite_id__in=list(by_id)).only('eventbrite_id', *EVENT_FIELDS)
+    }
+
+    to_create, to_update = [], []
+    now = timezone.now()
+    for eventbrite_id, record in by_id.items():
+        fields = event_fields(record)
+        event = existing.get(eventbrite_id)
+        if event is None:
+            to_create.append(Event(
+                eventbrite_id=eventbrite_id,
+                slug=event_slug(fields['title'], eventbrite_id),
+                event_type=event_type,
+                created_by=owner,
+                **fields,
+            ))
+        elif any(getattr(event, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(event, name, value)
+            event.updated_at = now
+            to_update.append(event)
+
+    Event.objects.bulk_create(to_create, batch_size=500)
+    Event.objects.bulk_update(to_update, EVENT_FIELDS + ['updated_at'], batch_size=500)
+    if to_create or to_update:
+        page_cache.invalidate(HOME_CONTEXT_KEY, UPCOMING_EVENTS_KEY)
+    return len(to_create), len(to_update)
+
+
+def registration_status(record):
+    if record.get('cancelled') or record.get('refunded'):
+        return 'cancelled'
+    if record.get('checked_in'):
+        return 'attended'
+    return 'registered'
+
+
+def import_attendees(records):
+    """Create or update EventRegistrations for a batch of EventBrite attendees; returns (created, updated)"""
+    events = dict(
+        Event.objects.filter(eventbrite_id__in={str(record.get('event_id')) for record in records})
+        .values_list('eventbrite_id', 'pk')
+    )
+    emails = {((record.get('profile') or {}).get('email') or '').lower() for record in records} - {''}
+    users = {
+        email: pk
+        for pk, email in User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails).values_list('pk', 'email_lower')
+    }
+
+    wanted = {}
+    skipped = 0
+    for record in records:
+        event_id = events.get(str(record.get('event_id')))
+        user_id = users.get(((record.get('profile') or {}).get('email') or '').lower())
+        if event_id is None or user_id is None:
+            skipped += 1
+            continue
+        status = registration_status(record)
+        checked_in_at = parse_datetime(record['changed']) if status == 'attended' and record.get('changed') else None
+        current = wanted.get((event_id, user_id))
+        if current is None or REGISTRATION_RANK[status] > REGISTRATION_RANK[current[0]]:
+            wanted[(event_id, user_id)] = (status, checked_in_at)
+    if skipped:
+        logger.info(f"Skipped {skipped} EventBrite attendees without a matching event or user")
+    if not wanted:
+        return 0, 0
+
+    event_ids = {event_id for event_id, _ in wanted}
+    existing = {
+        (registration.event_id, registration.user_id): registration
+        for registration in EventRegistration.objects.filter(
+            event_id__in=event_ids, user_id__in={user_id for _, user_id in wanted}
+        ).only('event_id', 'user_id', 'status', 'checked_in_at')
+    }
+
+    to_create, to_update = [], []
+    now = timezone.now()
+    for (event_id, user_id), (status, checked_in_at) in wanted.items():
+        registration = existing.get((event_id, user_id))
+        if registration is None:
+            to_create.append(EventRegistration(
+                event_id=event_id, user_id=user_id, status=status, checked_in_at=checked_in_at,
+            ))
+            continue
+        # A local check-in is not undone by an attendee list that lags behind
+        if registration.status == 'attended' and status == 'registered':
+            continue
+        if registration.status != status or (checked_in_at and not registration.checked_in_at):
+            registration.status = status
+            registration.checked_in_at = registration.checked_in_at or checked_in_at
+            registration.updated_at = now
+            to_update.append(registration)
+
+    # ignore_conflicts: someone may register through the site mid-sync
+    EventRegistration.objects.bulk_create(to_create, batch_size=1000, ignore_conflicts=True)
+    EventRegistration.objects.bulk_update(to_update, ['status', 'checked_in_at', 'updated_at'], batch_size=1000)
+    if to_create or to_update:
+        refresh_counts(event_ids)
+        invalidate_dashboard(*{registration.user_id for registration in to_create + to_update})
+    return len(to_create), len(to_update)
@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_event_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("eventbrite_id__isnull", False)),
+                fields=["eventbrite_id"],
+                name="events_eventbrite_id_idx",
+            ),
+        ),
+    ]
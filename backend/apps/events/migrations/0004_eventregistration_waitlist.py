@@ -0,0 +1,34 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_eventbrite_id_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="eventregistration",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("registered", "Registered"),
+                    ("waitlisted", "Waitlisted"),
+                    ("attended", "Attended"),
+                    ("no_show", "No Show"),
+                    ("cancelled", "Cancelled"),
+                ],
+                default="registered",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventregistration",
+            index=models.Index(
+                condition=models.Q(("status", "waitlisted")),
+                fields=["event", "registered_at"],
+                name="event_reg_waitlist_idx",
+            ),
+        ),
+    ]
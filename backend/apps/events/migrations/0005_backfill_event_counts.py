@@ -0,0 +1,35 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# registration_count and attendance_count were never maintained before
+# apps.events.services, and claim_seat enforces max_attendees against
+# registration_count; compute both once from the registrations (one UPDATE)
+
+SEAT_STATUSES = ("registered", "attended", "no_show")
+
+
+def count(rows):
+    return Coalesce(Subquery(rows.annotate(n=Count("pk")).values("n")), 0)
+
+
+def backfill_counts(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventRegistration = apps.get_model("events", "EventRegistration")
+
+    registrations = EventRegistration.objects.filter(event=OuterRef("pk")).order_by().values("event")
+    Event.objects.update(
+        registration_count=count(registrations.filter(status__in=SEAT_STATUSES)),
+        attendance_count=count(registrations.filter(status="attended")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0004_eventregistration_waitlist"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -77,11 +78,22 @@ class Event(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Full-text search (maintained by a database trigger on PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'events'
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['-start_date']
+        indexes = [
+            # EventBrite imports reconcile a page of events with eventbrite_id IN (...)
+            models.Index(
+                fields=['eventbrite_id'],
+                condition=models.Q(eventbrite_id__isnull=False),
+                name='events_eventbrite_id_idx',
+            ),
+        ]
     
     def __str__(self):
         return self.title
@@ -93,6 +105,7 @@ class EventRegistration(models.Model):
     """
     STATUS_CHOICES = [
         ('registered', 'Registered'),
+        ('waitlisted', 'Waitlisted'),
         ('attended', 'Attended'),
         ('no_show', 'No Show'),
         ('cancelled', 'Cancelled'),
@@ -125,6 +138,14 @@ class EventRegistration(models.Model):
         verbose_name = 'Event Registration'
         verbose_name_plural = 'Event Registrations'
         ordering = ['-registered_at']
+        indexes = [
+            # Waitlist queue, first come first served (apps.events.services)
+            models.Index(
+                fields=['event', 'registered_at'],
+                condition=models.Q(status='waitlisted'),
+                name='event_reg_waitlist_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.user.username} registered for {self.event.title}"
@@ -0,0 +1,48 @@
+from import_export import fields
+
+from apps.core.resources import BulkModelResource, CachedForeignKeyWidget
+from apps.users.models import User
+
+from .models import Event, EventRegistration
+
+
+class EventResource(BulkModelResource):
+    """Events by slug; registration/attendance counts are exported but kept by the app on import"""
+
+    created_by = fields.Field(
+        attribute='created_by', column_name='created_by', widget=CachedForeignKeyWidget(User, 'username')
+    )
+    registration_count = fields.Field(attribute='registration_count', column_name='registration_count', readonly=True)
+    attendance_count = fields.Field(attribute='attendance_count', column_name='attendance_count', readonly=True)
+
+    class Meta(BulkModelResource.Meta):
+        model = Event
+        import_id_fields = ('slug',)
+        fields = (
+            'slug', 'title', 'short_description', 'description', 'event_type', 'status', 'created_by',
+            'start_date', 'end_date', 'timezone', 'is_virtual', 'location', 'virtual_meeting_url',
+            'requires_registration', 'max_attendees', 'registration_deadline',
+            'eventbrite_id', 'eventbrite_url', 'is_featured', 'is_public', 'allow_comments',
+            'registration_count', 'attendance_count',
+        )
+        export_order = fields
+
+    def get_queryset(self):
+        return Event.objects.select_related('created_by')
+
+
+class EventRegistrationResource(BulkModelResource):
+    event = fields.Field(attribute='event', column_name='event', widget=CachedForeignKeyWidget(Event, 'slug'))
+    user = fields.Field(attribute='user', column_name='user', widget=CachedForeignKeyWidget(User, 'username'))
+
+    class Meta(BulkModelResource.Meta):
+        model = EventRegistration
+        import_id_fields = ('event', 'user')
+        fields = (
+            'event', 'user', 'status', 'registration_message', 'dietary_requirements',
+            'accessibility_needs', 'checked_in_at', 'checked_out_at', 'feedback_rating', 'feedback_comments',
+        )
+        export_order = fields
+
+    def get_queryset(self):
+        return EventRegistration.objects.select_related('event', 'user')
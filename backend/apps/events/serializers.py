@@ -1,14 +1,64 @@
 from rest_framework import serializers
+from apps.core.serializers import EditedFieldsUpdateMixin
+from .checkin import MAX_BATCH_SIZE, checkin_token
 from .models import Event, EventRegistration
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(EditedFieldsUpdateMixin, serializers.ModelSerializer):
     class Meta:
         model = Event
-        fields = '__all__'
+        exclude = ['search_vector']
+        # Maintained by apps.events.services and the view counter
+        read_only_fields = ['view_count', 'registration_count', 'attendance_count']
 
 
 class EventRegistrationSerializer(serializers.ModelSerializer):
+    # QR code payload for the door; only shown to the registrant and staff
+    checkin_token = serializers.SerializerMethodField()
+
     class Meta:
         model = EventRegistration
         fields = '__all__'
+        # status moves only through apps.events.services and check-in
+        read_only_fields = ['user', 'status', 'checked_in_at', 'checked_out_at']
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if isinstance(self.instance, EventRegistration):
+            # A registration can't move to another event
+            fields['event'].read_only = True
+        return fields
+
+    def get_checkin_token(self, obj):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and (user.pk == obj.user_id or user.is_staff):
+            return checkin_token(obj)
+        return None
+
+
+class CheckInScanSerializer(serializers.Serializer):
+    registration = serializers.IntegerField(required=False)
+    token = serializers.CharField(required=False)
+    scanned_at = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        if 'registration' not in attrs and 'token' not in attrs:
+            raise serializers.ValidationError('Give a registration id or a token.')
+        return attrs
+
+
+class CheckInSerializer(serializers.Serializer):
+    scans = CheckInScanSerializer(many=True, allow_empty=False)
+    replay = serializers.BooleanField(default=False)
+    batch_id = serializers.CharField(required=False, max_length=100)
+
+    def validate_scans(self, scans):
+        if len(scans) > MAX_BATCH_SIZE:
+            raise serializers.ValidationError(f'At most {MAX_BATCH_SIZE} scans per batch.')
+        return scans
+
+    def validate(self, attrs):
+        if attrs['replay'] and any('scanned_at' not in scan for scan in attrs['scans']):
+            raise serializers.ValidationError('Replayed scans need scanned_at.')
+        return attrs
@@ -0,0 +1,162 @@
+"""
+Event bookkeeping shared by the API, imports and integrations.
+
+Registration keeps ``Event.registration_count`` equal to the number of
+registrations holding a seat (registered, attended or no-show) without
+locking or counting on the request path:
+
+- ``register`` inserts the registration first and lets the
+  ``(event, user)`` unique constraint reject duplicates, then claims a seat
+  with one conditional ``UPDATE events SET registration_count =
+  registration_count + 1 WHERE registration_count < max_attendees``. Both
+  happen in one transaction, and the UPDATE is its last statement, so the
+  event row is locked only from the claim to the commit. Under a rush of
+  signups each request costs two short statements; once the event is full
+  the claim matches no row and the registration is waitlisted (or the
+  transaction rolled back when ``waitlist=False``).
+- ``cancel_registration`` releases the seat and ``promote_waitlist`` hands
+  free seats to waitlisted registrations, oldest first. Waitlisted rows
+  are claimed with ``SKIP LOCKED`` so concurrent cancellations promote
+  different people.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Event, EventRegistration
+
+SEAT_STATUSES = ('registered', 'attended', 'no_show')
+
+
+class RegistrationError(Exception):
+    pass
+
+
+class RegistrationClosed(RegistrationError):
+    pass
+
+
+class AlreadyRegistered(RegistrationError):
+    pass
+
+
+class EventFull(RegistrationError):
+    pass
+
+
+def _count(registrations):
+    return Coalesce(Subquery(registrations.annotate(n=Count('pk')).values('n')), 0)
+
+
+def refresh_counts(event_ids):
+    """Recompute registration_count and attendance_count from registrations in one UPDATE"""
+    registrations = EventRegistration.objects.filter(event=OuterRef('pk')).order_by().values('event')
+    return Event.objects.filter(pk__in=list(event_ids)).update(
+        registration_count=_count(registrations.filter(status__in=SEAT_STATUSES)),
+        attendance_count=_count(registrations.filter(status='attended')),
+    )
+
+
+def claim_seat(event_id):
+    """Take one seat if the event has room; True if it did"""
+    return Event.objects.filter(
+        Q(max_attendees__isnull=True) | Q(registration_count__lt=F('max_attendees')),
+        pk=event_id,
+    ).update(registration_count=F('registration_count') + 1) == 1
+
+
+def release_seat(event_id):
+    Event.objects.filter(pk=event_id, registration_count__gt=0).update(
+        registration_count=F('registration_count') - 1
+    )
+
+
+def check_open(event, now=None):
+    now = now or timezone.now()
+    if event.status in ('cancelled', 'completed') or event.end_date <= now:
+        raise RegistrationClosed("This event is no longer taking registrations.")
+    if event.registration_deadline and event.registration_deadline < now:
+        raise RegistrationClosed("The registration deadline for this event has passed.")
+
+
+def _is_full(event):
+    return event.max_attendees is not None and event.registration_count >= event.max_attendees
+
+
+def register(event, user, waitlist=True, **details):
+    """
+    Register user for event; returns the registration, which is 'registered'
+    or, when the event is full, 'waitlisted'. details are extra registration
+    fields (registration_message, dietary_requirements, ...).
+
+    Raises RegistrationClosed, AlreadyRegistered, or EventFull when the
+    event is full and waitlist is False.
+    """
+    check_open(event)
+    if not waitlist and _is_full(event):
+        # Cheap early exit with the row already in hand; the claim below decides
+        raise EventFull("This event is full.")
+
+    try:
+        with transaction.atomic():
+            registration = EventRegistration.objects.create(event=event, user=user, **details)
+            if not claim_seat(event.pk):
+                if not waitlist:
+                    raise EventFull("This event is full.")
+                registration.status = 'waitlisted'
+                registration.save(update_fields=['status', 'updated_at'])
+        return registration
+    except IntegrityError:
+        pass
+
+    # The unique constraint fired: come back from a cancellation, or report the duplicate
+    with transaction.atomic():
+        registration = EventRegistration.objects.select_for_update().get(event=event, user=user)
+        if registration.status != 'cancelled':
+            raise AlreadyRegistered("You are already registered for this event.")
+        if claim_seat(event.pk):
+            registration.status = 'registered'
+        elif waitlist:
+            registration.status = 'waitlisted'
+        else:
+            raise EventFull("This event is full.")
+        for name, value in details.items():
+            setattr(registration, name, value)
+        registration.registered_at = timezone.now()
+        registration.save()
+    return registration
+
+
+def cancel_registration(registration):
+    """Cancel a registration; a freed seat goes to the waitlist. Returns the promoted registrations."""
+    with transaction.atomic():
+        registration = EventRegistration.objects.select_for_update().get(pk=registration.pk)
+        held_seat = registration.status in SEAT_STATUSES
+        if registration.status == 'cancelled':
+            return []
+        registration.status = 'cancelled'
+        registration.save(update_fields=['status', 'updated_at'])
+        if not held_seat:
+            return []
+        release_seat(registration.event_id)
+        return promote_waitlist(registration.event_id)
+
+
+def promote_waitlist(event_id):
+    """Give free seats to waitlisted registrations, oldest first; returns the promoted registrations"""
+    promoted = []
+    with transaction.atomic():
+        while True:
+            candidate = (
+                EventRegistration.objects.select_for_update(skip_locked=True)
+                .filter(event_id=event_id, status='waitlisted')
+                .order_by('registered_at', 'pk')
+                .first()
+            )
+            if candidate is None or not claim_seat(event_id):
+                break
+            candidate.status = 'registered'
+            candidate.save(update_fields=['status', 'updated_at'])
+            promoted.append(candidate)
+    return promoted
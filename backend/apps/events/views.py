@@ -1,14 +1,111 @@
-from rest_framework import viewsets, permissions
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 from apps.users.permissions import IsAuthenticatedOrReadOnly, IsMentorOrAdmin, IsMemberOrAbove
 from .models import Event, EventRegistration
+from . import checkin
+from .serializers import CheckInSerializer, EventSerializer, EventRegistrationSerializer
+from .services import (
+    AlreadyRegistered, EventFull, RegistrationError, cancel_registration, promote_waitlist, register,
+)
+
+DETAIL_FIELDS = ('registration_message', 'dietary_requirements', 'accessibility_needs')
 
 
 class EventViewSet(viewsets.ModelViewSet):
     queryset = Event.objects.all()
+    serializer_class = EventSerializer
     # Only mentors/moderators/admin can create/update; everyone can read
     permission_classes = [IsMentorOrAdmin]
 
+    def perform_update(self, serializer):
+        previous = serializer.instance.max_attendees
+        event = serializer.save()
+        # More seats (or no limit any more): move people up from the waitlist
+        if event.max_attendees is None or (previous is not None and event.max_attendees > previous):
+            promote_waitlist(event.pk)
+
+    @action(detail=True, methods=['post'], permission_classes=[IsMemberOrAbove])
+    def register(self, request, pk=None):
+        """Register the current user; 201 when registered or waitlisted (see status)"""
+        event = self.get_object()
+        details = {field: request.data[field] for field in DETAIL_FIELDS if field in request.data}
+        waitlist = str(request.data.get('waitlist', 'true')).lower() not in ('false', '0')
+        try:
+            registration = register(event, request.user, waitlist=waitlist, **details)
+        except (AlreadyRegistered, EventFull) as e:
+            return Response({'detail': str(e)}, status=status.HTTP_409_CONFLICT)
+        except RegistrationError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(EventRegistrationSerializer(registration, context={'request': request}).data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['post'], permission_classes=[IsMemberOrAbove])
+    def unregister(self, request, pk=None):
+        """Cancel the current user's registration; a freed seat goes to the waitlist"""
+        event = self.get_object()
+        registration = get_object_or_404(EventRegistration, event=event, user=request.user)
+        cancel_registration(registration)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=['post'], url_path='check-in', permission_classes=[IsMemberOrAbove])
+    def check_in(self, request, pk=None):
+        """
+        Check in a batch of registrations by id or QR token:
+        {"scans": [{"registration": 1}, {"token": "..."}], "replay": false, "batch_id": "..."}.
+        Replayed offline scans carry "scanned_at". For the event's creator,
+        organizers and staff.
+        """
+        event = self.get_object()
+        user = request.user
+        if not (user.is_staff or event.created_by_id == user.pk or event.organizers.filter(pk=user.pk).exists()):
+            return Response({'detail': 'Only organizers can check people in.'}, status=status.HTTP_403_FORBIDDEN)
+
+        serializer = CheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            result = checkin.check_in(event, **serializer.validated_data)
+        except checkin.CheckInError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
+
 
 class EventRegistrationViewSet(viewsets.ModelViewSet):
     queryset = EventRegistration.objects.all()
+    serializer_class = EventRegistrationSerializer
     permission_classes = [IsMemberOrAbove]
+
+    def get_queryset(self):
+        # Registrations carry dietary and accessibility details: users see
+        # their own, organizers their events', staff everything
+        user = self.request.user
+        if not user.is_authenticated:
+            return EventRegistration.objects.none()
+        if user.is_staff:
+            return EventRegistration.objects.all()
+        return EventRegistration.objects.filter(
+            Q(user=user) | Q(event__created_by=user) | Q(event__organizers=user)
+        ).distinct()
+
+    def perform_create(self, serializer):
+        # Registrations go through the capacity-checked service, for the current user
+        data = serializer.validated_data
+        try:
+            serializer.instance = register(
+                data['event'], self.request.user, **{field: data[field] for field in DETAIL_FIELDS if field in data}
+            )
+        except RegistrationError as e:
+            raise ValidationError({'detail': str(e)})
+
+    def perform_update(self, serializer):
+        if serializer.instance.user_id != self.request.user.pk and not self.request.user.is_staff:
+            raise PermissionDenied('Only the registrant can edit a registration.')
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        # Cancelling keeps registration_count right and hands the seat to the waitlist
+        if instance.user_id != self.request.user.pk and not self.request.user.is_staff:
+            raise PermissionDenied('Only the registrant can cancel a registration.')
+        cancel_registration(instance)
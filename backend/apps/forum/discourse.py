@@ -0,0 +1,324 @@
+"""
+Two-way sync between the forum and Discourse.
+
+Pull (``import_topics``/``import_posts``, called by the Discourse connector
+once per batch inside the batch's transaction): topics from
+``/latest.json`` and posts from ``/posts.json`` are matched to
+``ForumTopic``/``ForumPost`` by ``discourse_id`` with one ``IN`` query per
+batch, authors by username and categories by ``ForumCategory.discourse_id``
+(falling back to the connector's default user and category), then written
+with ``bulk_create``/``bulk_update``. A topic's first post is its content;
+later posts become ``ForumPost`` rows. ``reply_count``/``last_activity`` and
+the category counters of every touched row are recomputed in the same
+transaction (``apps.forum.services``). Rows with local changes still in the
+outbox are not overwritten.
+
+Push: local saves and deletes are queued as ``OutboxEntry`` rows (see
+``apps.integrations.signals``). ``pending_changes`` coalesces a batch of
+entries into one change per object with the requests that bring Discourse
+up to date; ``record_pushed`` stores the Discourse ids of created topics and
+posts and deletes the entries that went through. Pulled rows are written
+with bulk operations, which send no signals, so they are never echoed back.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+from apps.core.cache import HOME_CONTEXT_KEY, page_cache
+from apps.integrations.models import OutboxEntry
+
+from .models import ForumCategory, ForumPost, ForumTopic
+from .services import refresh_category_counts, refresh_topic_counts
+
+User = get_user_model()
+
+BATCH_SIZE = 500
+ERROR_MAX_LENGTH = 1000
+
+TOPIC_FIELDS = ['title', 'status', 'is_pinned', 'is_locked', 'like_count', 'category_id']
+POST_FIELDS = ['content', 'is_edited', 'like_count']
+
+
+def _pending(object_type, object_ids):
+    """Local ids of the given objects that still have changes to push"""
+    # Dead-lettered entries are never retried, so they must not block pulls forever
+    return set(
+        OutboxEntry.objects.filter(
+            integration_type='discourse', object_type=object_type, object_id__in=list(object_ids),
+            attempts__lt=OutboxEntry.MAX_ATTEMPTS,
+        ).values_list('object_id', flat=True)
+    )
+
+
+def _users(usernames):
+    return dict(User.objects.filter(username__in=set(usernames) - {None}).values_list('username', 'pk'))
+
+
+def _bulk_create(model, objects, stamps):
+    """bulk_create, then restore upstream timestamps that auto_now_add overwrote"""
+    model.objects.bulk_create(objects, batch_size=BATCH_SIZE)
+    restored = []
+    for obj, values in zip(objects, stamps):
+        values = {name: value for name, value in values.items() if value is not None}
+        if obj.pk is not None and values:
+            for name, value in values.items():
+                setattr(obj, name, value)
+            restored.append(obj)
+    fields = sorted({name for values in stamps for name, value in values.items() if value is not None})
+    if restored:
+        model.objects.bulk_update(restored, fields, batch_size=BATCH_SIZE)
+
+
+def _likes(record):
+    # Discourse post action type 2 is a like
+    for action in record.get('actions_summary') or []:
+        if action.get('id') == 2:
+            return action.get('count') or 0
+    return record.get('like_count') or 0
+
+
+def topic_fields(record, category_id):
+    status = 'archived' if record.get('archived') else 'closed' if record.get('closed') else 'open'
+    return {
+        'title': (record.get('title') or record.get('fancy_title') or '')[:200],
+        'status': status,
+        'is_pinned': bool(record.get('pinned')),
+        'is_locked': status != 'open',
+        'like_count': record.get('like_count') or 0,
+        'category_id': category_id,
+    }
+
+
+def topic_slug(record):
+    suffix = f"-d{record['id']}"
+    max_length = ForumTopic._meta.get_field('slug').max_length
+    return f"{slugify(record.get('slug') or record.get('title') or '')[:max_length - len(suffix)]}{suffix}".lstrip('-')
+
+
+def import_topics(records, default_author, default_category):
+    """Create or update ForumTopics for a batch of Discourse topics; returns (created, updated)"""
+    by_id = {record['id']: record for record in records}
+    existing = {
+        topic.discourse_id: topic
+        for topic in ForumTopic.objects.filter(discourse_id__in=list(by_id))
+        .only('discourse_id', 'last_activity', *TOPIC_FIELDS)
+    }
+    pending = _pending('topic', [topic.pk for topic in existing.values()])
+    categories = dict(
+        ForumCategory.objects.filter(discourse_id__in={record.get('category_id') for record in records} - {None})
+        .values_list('discourse_id', 'pk')
+    )
+    authors = _users(record.get('author_username') for record in records)
+
+    to_create, stamps, to_update = [], [], []
+    touched_categories = set()
+    now = timezone.now()
+    for discourse_id, record in by_id.items():
+        fields = topic_fields(record, categories.get(record.get('category_id'), default_category.pk))
+        bumped_at = parse_datetime(record.get('bumped_at') or record.get('last_posted_at') or '')
+        topic = existing.get(discourse_id)
+        if topic is None:
+            to_create.append(ForumTopic(
+                discourse_id=discourse_id,
+                slug=topic_slug(record),
+                content=record.get('excerpt') or '',
+                author_id=authors.get(record.get('author_username'), default_author.pk),
+                **fields,
+            ))
+            stamps.append({'created_at': parse_datetime(record.get('created_at') or ''), 'last_activity': bumped_at})
+            touched_categories.add(fields['category_id'])
+            continue
+        if topic.pk in pending:
+            continue
+        newer = bumped_at is not None and bumped_at > topic.last_activity
+        if newer or any(getattr(topic, name) != value for name, value in fields.items()):
+            touched_categories.update({topic.category_id, fields['category_id']})
+            for name, value in fields.items():
+                setattr(topic, name, value)
+            if newer:
+                topic.last_activity = bumped_at
+            topic.updated_at = now
+            to_update.append(topic)
+
+    _bulk_create(ForumTopic, to_create, stamps)
+    ForumTopic.objects.bulk_update(to_update, TOPIC_FIELDS + ['last_activity', 'updated_at'], batch_size=BATCH_SIZE)
+    if to_create or to_update:
+        refresh_category_counts(touched_categories)
+        page_cache.invalidate(HOME_CONTEXT_KEY)
+    return len(to_create), len(to_update)
+
+
+def import_posts(records, default_author):
+    """Create or update ForumPosts (and topic content) for a batch of Discourse posts; returns (created, updated)"""
+    topics = {
+        topic.discourse_id: topic
+        for topic in ForumTopic.objects.filter(discourse_id__in={record['topic_id'] for record in records})
+        .only('discourse_id', 'discourse_post_id', 'content', 'category_id')
+    }
+    pending_topics = _pending('topic', [topic.pk for topic in topics.values()])
+    replies = [record for record in records if record.get('post_number') != 1 and record['topic_id'] in topics]
+    existing = {
+        post.discourse_id: post
+        for post in ForumPost.objects.filter(discourse_id__in=[record['id'] for record in replies])
+        .only('discourse_id', 'topic_id', *POST_FIELDS)
+    }
+    pending_posts = _pending('post', [post.pk for post in existing.values()])
+    authors = _users(record.get('username') for record in replies)
+
+    now = timezone.now()
+    topics_updated = []
+    for record in records:
+        topic = topics.get(record['topic_id'])
+        if record.get('post_number') != 1 or topic is None or topic.pk in pending_topics:
+            continue
+        content = record.get('raw') or record.get('cooked') or ''
+        if topic.content != content or topic.discourse_post_id != record['id']:
+            topic.content = content
+            topic.discourse_post_id = record['id']
+            topic.updated_at = now
+            topics_updated.append(topic)
+    ForumTopic.objects.bulk_update(topics_updated, ['content', 'discourse_post_id', 'updated_at'], batch_size=BATCH_SIZE)
+
+    to_create, stamps, to_update = [], [], []
+    for record in replies:
+        fields = {
+            'content': record.get('raw') or record.get('cooked') or '',
+            'is_edited': (record.get('version') or 1) > 1,
+            'like_count': _likes(record),
+        }
+        post = existing.get(record['id'])
+        if post is None:
+            to_create.append(ForumPost(
+                discourse_id=record['id'],
+                topic_id=topics[record['topic_id']].pk,
+                author_id=authors.get(record.get('username'), default_author.pk),
+                **fields,
+            ))
+            stamps.append({'created_at': parse_datetime(record.get('created_at') or '')})
+        elif post.pk not in pending_posts and any(getattr(post, name) != value for name, value in fields.items()):
+            for name, value in fields.items():
+                setattr(post, name, value)
+            post.updated_at = now
+            to_update.append(post)
+
+    _bulk_create(ForumPost, to_create, stamps)
+    ForumPost.objects.bulk_update(to_update, POST_FIELDS + ['updated_at'], batch_size=BATCH_SIZE)
+    if to_create:
+        touched = {topics[record['topic_id']] for record in replies if record['id'] not in existing}
+        refresh_topic_counts(topic.pk for topic in touched)
+        refresh_category_counts({topic.category_id for topic in touched})
+    if to_create or topics_updated:
+        page_cache.invalidate(HOME_CONTEXT_KEY)
+    return len(to_create), len(to_update) + len(topics_updated)
+
+
+class Change:
+    """The outbox entries of one local object, coalesced into the requests to send"""
+
+    def __init__(self, object_type, object_id):
+        self.object_type = object_type
+        self.object_id = object_id
+        self.entry_ids = []
+        self.deleted_id = None
+        self.obj = None
+        self.requests = []
+
+    def build_requests(self):
+        """(method, url, json) tuples, or None while a new post waits for its topic"""
+        obj = self.obj
+        if obj is None:
+            if self.deleted_id is None:
+                # Created and deleted before it was ever pushed
+                return []
+            if self.object_type == 'topic':
+                return [('DELETE', f'/t/{self.deleted_id}.json', None)]
+            return [('DELETE', f'/posts/{self.deleted_id}.json', None)]
+
+        if self.object_type == 'topic':
+            category_id = obj.category.discourse_id
+            if obj.discourse_id is None:
+                body = {'title': obj.title, 'raw': obj.content}
+                if category_id:
+                    body['category'] = category_id
+                return [('POST', '/posts.json', body)]
+            body = {'title': obj.title}
+            if category_id:
+                body['category_id'] = category_id
+            requests = [('PUT', f'/t/-/{obj.discourse_id}.json', body)]
+            if obj.discourse_post_id:
+                requests.append(('PUT', f'/posts/{obj.discourse_post_id}.json', {'post': {'raw': obj.content}}))
+            return requests
+
+        if obj.discourse_id is None:
+            if obj.topic.discourse_id is None:
+                return None
+            return [('POST', '/posts.json', {'topic_id': obj.topic.discourse_id, 'raw': obj.content})]
+        return [('PUT', f'/posts/{obj.discourse_id}.json', {'post': {'raw': obj.content}})]
+
+
+def pending_changes(object_type, after_id=0, limit=100):
+    """Coalesced changes for the next limit outbox entries; returns (changes, last entry id)"""
+    entries = list(
+        OutboxEntry.objects.filter(
+            integration_type='discourse',
+            object_type=object_type,
+            id__gt=after_id,
+            attempts__lt=OutboxEntry.MAX_ATTEMPTS,
+        ).order_by('id')[:limit]
+    )
+    if not entries:
+        return [], None
+
+    changes = {}
+    for entry in entries:
+        change = changes.setdefault(entry.object_id, Change(object_type, entry.object_id))
+        change.entry_ids.append(entry.pk)
+        if entry.action == 'delete':
+            change.deleted_id = entry.payload.get('discourse_id')
+
+    if object_type == 'topic':
+        objects = ForumTopic.objects.select_related('category')
+    else:
+        objects = ForumPost.objects.select_related('topic')
+    for obj in objects.filter(pk__in=list(changes)):
+        changes[obj.pk].obj = obj
+    for change in changes.values():
+        change.requests = change.build_requests()
+    return list(changes.values()), entries[-1].pk
+
+
+def record_pushed(changes, results):
+    """
+    Store the outcome of pushing changes (results are the response bodies of
+    creates, or exceptions); returns (pushed, failed)
+    """
+    done, created, pushed, failed = [], [], 0, 0
+    for change, result in zip(changes, results):
+        if change.requests is None:
+            continue
+        if isinstance(result, Exception):
+            failed += 1
+            OutboxEntry.objects.filter(pk__in=change.entry_ids).update(
+                attempts=F('attempts') + 1, last_error=str(result)[:ERROR_MAX_LENGTH]
+            )
+            continue
+        pushed += 1
+        done.extend(change.entry_ids)
+        if result and change.obj is not None:
+            if change.object_type == 'topic':
+                change.obj.discourse_id = result.get('topic_id')
+                change.obj.discourse_post_id = result.get('id')
+            else:
+                change.obj.discourse_id = result.get('id')
+            created.append(change.obj)
+
+    with transaction.atomic():
+        if created:
+            model = type(created[0])
+            fields = ['discourse_id', 'discourse_post_id'] if model is ForumTopic else ['discourse_id']
+            model.objects.bulk_update(created, fields, batch_size=BATCH_SIZE)
+        OutboxEntry.objects.filter(pk__in=done).delete()
+    return pushed, failed
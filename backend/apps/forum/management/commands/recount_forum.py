@@ -0,0 +1,66 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.forum.models import ForumCategory, ForumTopic
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized forum counters (topic_count, post_count, reply_count)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drift without writing anything'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Rows per bulk_update statement'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        batch_size = options['batch_size']
+
+        # One grouped query yields every topic's post count along with its
+        # category, which is enough to derive all three counters
+        rows = ForumTopic.objects.order_by().values(
+            'id', 'category_id', 'reply_count'
+        ).annotate(actual_posts=Count('posts'))
+
+        topic_totals = defaultdict(int)
+        post_totals = defaultdict(int)
+        stale_topics = []
+        for row in rows.iterator(chunk_size=batch_size):
+            topic_totals[row['category_id']] += 1
+            post_totals[row['category_id']] += row['actual_posts']
+            if row['reply_count'] != row['actual_posts']:
+                stale_topics.append(ForumTopic(id=row['id'], reply_count=row['actual_posts']))
+
+        stale_categories = []
+        for category in ForumCategory.objects.only('id', 'topic_count', 'post_count'):
+            topic_count = topic_totals.get(category.id, 0)
+            post_count = post_totals.get(category.id, 0)
+            if category.topic_count != topic_count or category.post_count != post_count:
+                category.topic_count = topic_count
+                category.post_count = post_count
+                stale_categories.append(category)
+
+        self.stdout.write(
+            f'{len(stale_topics)} topics and {len(stale_categories)} categories need repair'
+        )
+        if dry_run:
+            return
+
+        with transaction.atomic():
+            ForumTopic.objects.bulk_update(stale_topics, ['reply_count'], batch_size=batch_size)
+            ForumCategory.objects.bulk_update(
+                stale_categories, ['topic_count', 'post_count'], batch_size=batch_size
+            )
+
+        self.stdout.write(self.style.SUCCESS('Forum counters repaired'))
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# PostgreSQL only: a trigger keeps search_vector current (it fires only when
+# the indexed columns are written, so counter updates don't rebuild it), a GIN
+# index serves full-text queries and pg_trgm indexes serve ILIKE typeahead
+# lookups. Other databases keep the unused column and fall back to icontains.
+FORWARD_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION forum_topics_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.content, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS forum_topics_search_vector_trigger ON forum_topics;
+CREATE TRIGGER forum_topics_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON forum_topics
+    FOR EACH ROW EXECUTE FUNCTION forum_topics_search_vector_update();
+
+-- Backfill existing rows through the trigger
+UPDATE forum_topics SET title = title;
+
+CREATE INDEX IF NOT EXISTS forum_topics_search_vector_gin ON forum_topics USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS forum_topics_title_trgm ON forum_topics USING gin (title gin_trgm_ops);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS forum_topics_search_vector_gin;
+DROP INDEX IF EXISTS forum_topics_title_trgm;
+DROP TRIGGER IF EXISTS forum_topics_search_vector_trigger ON forum_topics;
+DROP FUNCTION IF EXISTS forum_topics_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FORWARD_SQL)
+
+
+def remove_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forum", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="forumtopic",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, remove_search),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forum", "0002_forumtopic_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="forumcategory",
+            name="discourse_id",
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="forumtopic",
+            name="discourse_id",
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name="forumtopic",
+            name="discourse_post_id",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="forumpost",
+            name="discourse_id",
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
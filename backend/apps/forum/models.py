@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -26,6 +27,9 @@ class ForumCategory(models.Model):
     topic_count = models.PositiveIntegerField(default=0)
     post_count = models.PositiveIntegerField(default=0)
     
+    # Discourse sync (see apps.forum.discourse)
+    discourse_id = models.PositiveIntegerField(unique=True, null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -67,11 +71,18 @@ class ForumTopic(models.Model):
     like_count = models.PositiveIntegerField(default=0)
     reply_count = models.PositiveIntegerField(default=0)
     
+    # Discourse sync: the topic and its first post, which holds the content
+    discourse_id = models.PositiveIntegerField(unique=True, null=True, blank=True)
+    discourse_post_id = models.PositiveIntegerField(null=True, blank=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     last_activity = models.DateTimeField(auto_now_add=True)
     
+    # Full-text search (maintained by a database trigger on PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'forum_topics'
         verbose_name = 'Forum Topic'
@@ -99,6 +110,9 @@ class ForumPost(models.Model):
     # Engagement
     like_count = models.PositiveIntegerField(default=0)
     
+    # Discourse sync
+    discourse_id = models.PositiveIntegerField(unique=True, null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
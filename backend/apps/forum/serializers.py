@@ -11,7 +11,7 @@ class ForumCategorySerializer(serializers.ModelSerializer):
 class ForumTopicSerializer(serializers.ModelSerializer):
     class Meta:
         model = ForumTopic
-        fields = '__all__'
+        exclude = ['search_vector']
 
 
 class ForumPostSerializer(serializers.ModelSerializer):
@@ -0,0 +1,32 @@
+"""
+Forum counter maintenance for bulk writes, which skip the signals in
+``apps.forum.signals``. Each function recomputes the denormalized counters
+of the given rows from their children in one UPDATE, so it can run inside
+the transaction that made the change.
+"""
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import ForumCategory, ForumPost, ForumTopic
+
+
+def _aggregate(queryset, expression):
+    return Subquery(queryset.annotate(value=expression).values('value'))
+
+
+def refresh_topic_counts(topic_ids):
+    """reply_count from posts; last_activity moves forward to the newest post"""
+    posts = ForumPost.objects.filter(topic=OuterRef('pk')).order_by().values('topic')
+    return ForumTopic.objects.filter(pk__in=list(topic_ids)).update(
+        reply_count=Coalesce(_aggregate(posts, Count('pk')), 0),
+        last_activity=Greatest('last_activity', Coalesce(_aggregate(posts, Max('created_at')), 'last_activity')),
+    )
+
+
+def refresh_category_counts(category_ids):
+    topics = ForumTopic.objects.filter(category=OuterRef('pk')).order_by().values('category')
+    posts = ForumPost.objects.filter(topic__category=OuterRef('pk')).order_by().values('topic__category')
+    return ForumCategory.objects.filter(pk__in=list(category_ids)).update(
+        topic_count=Coalesce(_aggregate(topics, Count('pk')), 0),
+        post_count=Coalesce(_aggregate(posts, Count('pk')), 0),
+    )
@@ -0,0 +1,50 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import ForumCategory, ForumTopic, ForumPost
+
+
+def _adjust(queryset, field, delta):
+    """Apply field += delta in the database, never going below zero"""
+    if delta < 0:
+        queryset = queryset.filter(**{f'{field}__gte': -delta})
+    queryset.update(**{field: F(field) + delta})
+
+
+@receiver(post_save, sender=ForumTopic)
+def topic_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _adjust(ForumCategory.objects.filter(pk=instance.category_id), 'topic_count', 1)
+
+
+@receiver(post_delete, sender=ForumTopic)
+def topic_deleted(sender, instance, **kwargs):
+    # The topic's posts are cascade-deleted first and adjust post_count themselves
+    _adjust(ForumCategory.objects.filter(pk=instance.category_id), 'topic_count', -1)
+
+
+@receiver(post_save, sender=ForumPost)
+def post_created(sender, instance, created, raw=False, **kwargs):
+    if not created or raw:
+        return
+    ForumTopic.objects.filter(pk=instance.topic_id).update(
+        reply_count=F('reply_count') + 1,
+        last_activity=timezone.now(),
+    )
+    _adjust(
+        ForumCategory.objects.filter(topics__pk=instance.topic_id),
+        'post_count',
+        1,
+    )
+
+
+@receiver(post_delete, sender=ForumPost)
+def post_deleted(sender, instance, **kwargs):
+    _adjust(ForumTopic.objects.filter(pk=instance.topic_id), 'reply_count', -1)
+    _adjust(
+        ForumCategory.objects.filter(topics__pk=instance.topic_id),
+        'post_count',
+        -1,
+    )
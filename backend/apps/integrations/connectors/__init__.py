@@ -0,0 +1,34 @@
+"""
+Sync connectors, one per ``Integration.integration_type``.
+
+``get_connector(integration)`` returns the connector for an integration;
+``connector.run()`` performs one sync and returns its ``SyncLog``.
+"""
+from .base import BaseConnector, ConnectorError, Page
+from .discourse import DiscourseConnector
+from .eventbrite import EventBriteConnector
+from .quickbooks import QuickBooksConnector
+from .salesforce import SalesforceConnector
+from .wordpress import WordPressConnector
+
+CONNECTORS = {
+    connector.integration_type: connector
+    for connector in (
+        DiscourseConnector,
+        EventBriteConnector,
+        QuickBooksConnector,
+        SalesforceConnector,
+        WordPressConnector,
+    )
+}
+
+
+def get_connector(integration, transport=None):
+    try:
+        connector_class = CONNECTORS[integration.integration_type]
+    except KeyError:
+        raise ConnectorError(f"No sync connector for {integration.get_integration_type_display()} integrations")
+    return connector_class(integration, transport=transport)
+
+
+__all__ = ['BaseConnector', 'CONNECTORS', 'ConnectorError', 'Page', 'get_connector']
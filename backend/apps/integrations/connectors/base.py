@@ -0,0 +1,349 @@
+"""
+Base connector: concurrent page fetching, batched upserts, cursor checkpoints.
+
+A connector syncs one or more ``object_types`` of an ``Integration``. For
+each type it fetches page 1; if the API reports a page count, the remaining
+pages are fetched concurrently (at most ``max_concurrency`` requests in
+flight, from ``configuration['max_concurrency']``), otherwise pages are
+followed one by one. Records are buffered and written ``batch_size`` at a
+time, each batch in its own transaction, on Django's sync thread while the
+next pages download.
+
+Connectors that write back upstream override ``push``, which runs before
+the pull on the same client (the Discourse connector drains its outbox
+there).
+
+Incremental sync: the newest ``record_updated`` value seen for a type is
+stored in ``configuration['sync_cursors'][object_type]`` once the type has
+synced without failures, and passed back to ``fetch_page`` next time.
+
+Requests go through the shared pool in ``apps.integrations.http``, which
+keeps connections alive per host and applies the integration's rate limit
+(``rate_limit`` below, or ``configuration['rate_limit']``), conditional
+GETs and retries.
+
+Every run is a ``SyncLog`` with processed/created/updated/failed counts and
+the run's request metrics in ``error_details['http']``. Connectors take an
+optional httpx transport, so they can be pointed at a local stub
+(``httpx.MockTransport``) instead of the real API; they then get a private
+pool for the run.
+"""
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, connections, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from ..http import IntegrationClient, OutboundHTTP, RequestMetrics, rate_limit_for
+from ..models import ExternalRecord, Integration, SyncLog
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_ERRORS = 20
+
+
+class ConnectorError(Exception):
+    pass
+
+
+class Page:
+    """One page of upstream records"""
+
+    def __init__(self, records, total_pages=None, has_more=False, next_url=None):
+        self.records = records
+        self.total_pages = total_pages
+        self.has_more = has_more
+        self.next_url = next_url
+
+
+class SyncStats:
+    def __init__(self):
+        self.processed = 0
+        self.pushed = 0
+        self.created = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors = []
+        self.cursors = {}
+        self.failed_types = set()
+
+    def error(self, object_type, message):
+        self.failed_types.add(object_type)
+        if len(self.errors) < MAX_LOGGED_ERRORS:
+            self.errors.append({'object_type': object_type, 'error': message})
+
+
+class BaseConnector:
+    integration_type = None
+    object_types = ('default',)
+    page_size = 100
+    default_concurrency = 4
+    batch_size = 500
+    timeout = 30
+    # Provider quota as (requests per second, burst); None uses the settings default
+    rate_limit = None
+    # Sync object types one after another (when later types refer to earlier ones)
+    ordered_types = False
+
+    def __init__(self, integration, transport=None):
+        self.integration = integration
+        self.transport = transport
+        self.metrics = RequestMetrics()
+        self._default_user = None
+
+    @property
+    def config(self):
+        return self.integration.configuration or {}
+
+    @property
+    def concurrency(self):
+        return max(int(self.config.get('max_concurrency', self.default_concurrency)), 1)
+
+    def get_object_types(self):
+        return tuple(self.config.get('object_types') or self.object_types)
+
+    def default_user(self):
+        """Owner of imported rows with no local author: configuration['owner_id'] or the first superuser"""
+        if self._default_user is None:
+            users = get_user_model().objects
+            owner_id = self.config.get('owner_id')
+            self._default_user = (
+                users.filter(pk=owner_id).first() if owner_id
+                else users.filter(is_superuser=True, is_active=True).order_by('pk').first()
+            )
+            if self._default_user is None:
+                raise ConnectorError(f"{self.integration} needs configuration['owner_id'] or a superuser")
+        return self._default_user
+
+    # Upstream API
+
+    def base_url(self):
+        if not self.integration.api_endpoint:
+            raise ConnectorError(f"{self.integration} has no api_endpoint")
+        return self.integration.api_endpoint.rstrip('/')
+
+    def headers(self):
+        return {'Accept': 'application/json'}
+
+    def auth(self):
+        return None
+
+    def make_client(self):
+        return IntegrationClient(
+            self.integration,
+            self.base_url(),
+            headers=self.headers(),
+            auth=self.auth(),
+            rate_limit=rate_limit_for(self.integration, self.rate_limit),
+            timeout=self.timeout,
+            metrics=self.metrics,
+            pool=OutboundHTTP(transport=self.transport) if self.transport is not None else None,
+        )
+
+    async def fetch_page(self, client, object_type, page, cursor, next_url=None):
+        """Return a Page; cursor is the checkpoint from the last successful sync (or None)"""
+        raise NotImplementedError
+
+    async def get_json(self, client, url, **kwargs):
+        response = await client.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    # Records
+
+    def record_key(self, object_type, record):
+        return str(record['id'])
+
+    def record_updated(self, object_type, record):
+        """Sortable last-modified value used as the incremental cursor"""
+        return None
+
+    def upsert(self, object_type, records):
+        """Write a batch (inside a transaction); returns (created, updated)"""
+        return upsert_external_records(self, object_type, records)
+
+    async def push(self, client, stats):
+        """Send local changes upstream before pulling; count them in stats.pushed"""
+
+    # Running
+
+    def start(self):
+        return SyncLog.objects.create(integration=self.integration, status='in_progress')
+
+    def run(self, full=False, log=None):
+        """Sync every object type; returns the finished SyncLog"""
+        log = log or self.start()
+        stats = SyncStats()
+        self.metrics = RequestMetrics()
+        cursors = {} if full else dict(self.config.get('sync_cursors') or {})
+        try:
+            asyncio.run(self._sync(stats, cursors))
+        except Exception as e:
+            logger.exception(f"Sync of {self.integration} failed")
+            stats.error(None, str(e))
+        finally:
+            close_old_connections()
+
+        self._finish(log, stats)
+        return log
+
+    async def _sync(self, stats, cursors):
+        try:
+            async with self.make_client() as client:
+                try:
+                    await self.push(client, stats)
+                except Exception as e:
+                    logger.warning(f"{self.integration} push: {e}")
+                    stats.error('push', str(e))
+                if self.ordered_types:
+                    for object_type in self.get_object_types():
+                        await self._sync_type(client, object_type, cursors.get(object_type), stats)
+                else:
+                    await asyncio.gather(*(
+                        self._sync_type(client, object_type, cursors.get(object_type), stats)
+                        for object_type in self.get_object_types()
+                    ))
+        finally:
+            # Writes ran on the sync thread; don't leave its connection open
+            await sync_to_async(connections.close_all, thread_sensitive=True)()
+
+    async def _sync_type(self, client, object_type, cursor, stats):
+        buffer = []
+        newest = cursor
+        write = sync_to_async(self._write, thread_sensitive=True)
+
+        async def on_page(page):
+            nonlocal newest
+            buffer.extend(page.records)
+            for record in page.records:
+                updated = self.record_updated(object_type, record)
+                if updated is not None and (newest is None or updated > newest):
+                    newest = updated
+            while len(buffer) >= self.batch_size:
+                batch = buffer[:self.batch_size]
+                del buffer[:self.batch_size]
+                await write(object_type, batch, stats)
+
+        try:
+            await self._pages(client, object_type, cursor, on_page, stats)
+        except Exception as e:
+            logger.warning(f"{self.integration} {object_type}: {e}")
+            stats.error(object_type, str(e))
+        if buffer:
+            await write(object_type, buffer, stats)
+        if object_type not in stats.failed_types and newest is not None:
+            stats.cursors[object_type] = newest
+
+    async def _pages(self, client, object_type, cursor, on_page, stats):
+        page = await self.fetch_page(client, object_type, 1, cursor)
+        await on_page(page)
+
+        if page.total_pages and page.total_pages > 1:
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def fetch(number):
+                async with semaphore:
+                    result = await self.fetch_page(client, object_type, number, cursor)
+                await on_page(result)
+
+            outcomes = await asyncio.gather(
+                *(fetch(number) for number in range(2, page.total_pages + 1)),
+                return_exceptions=True,
+            )
+            for number, outcome in enumerate(outcomes, 2):
+                if isinstance(outcome, Exception):
+                    stats.error(object_type, f'page {number}: {outcome}')
+            return
+
+        number = 1
+        while page.has_more:
+            number += 1
+            page = await self.fetch_page(client, object_type, number, cursor, page.next_url)
+            await on_page(page)
+
+    def _write(self, object_type, batch, stats):
+        stats.processed += len(batch)
+        try:
+            with transaction.atomic():
+                created, updated = self.upsert(object_type, batch)
+            stats.created += created
+            stats.updated += updated
+        except Exception as e:
+            logger.exception(f"Failed to write {len(batch)} {object_type} records from {self.integration}")
+            stats.failed += len(batch)
+            stats.error(object_type, str(e))
+
+    def _finish(self, log, stats):
+        if not stats.errors:
+            status = 'success'
+        elif stats.created or stats.updated or stats.pushed:
+            status = 'partial'
+        else:
+            status = 'error'
+
+        log.status = status
+        log.completed_at = timezone.now()
+        log.records_processed = stats.processed
+        log.records_created = stats.created
+        log.records_updated = stats.updated
+        log.records_failed = stats.failed
+        log.error_message = stats.errors[0]['error'] if stats.errors else None
+        log.error_details = {
+            'errors': stats.errors,
+            'cursors': stats.cursors,
+            'pushed': stats.pushed,
+            'http': self.metrics.snapshot(),
+        }
+        log.save()
+
+        with transaction.atomic():
+            integration = Integration.objects.select_for_update().get(pk=self.integration.pk)
+            configuration = dict(integration.configuration or {})
+            if stats.cursors:
+                configuration['sync_cursors'] = {**configuration.get('sync_cursors', {}), **stats.cursors}
+            integration.configuration = configuration
+            integration.last_sync = log.completed_at
+            integration.status = 'error' if status == 'error' else 'active'
+            integration.last_error = log.error_message
+            integration.save(update_fields=['configuration', 'last_sync', 'status', 'last_error', 'updated_at'])
+        self.integration = integration
+
+
+def upsert_external_records(connector, object_type, records):
+    """Create or update ExternalRecord rows for a batch; unchanged records are left alone"""
+    by_key = {connector.record_key(object_type, record): record for record in records}
+    existing = {
+        record.external_id: record
+        for record in ExternalRecord.objects.filter(
+            integration=connector.integration,
+            object_type=object_type,
+            external_id__in=list(by_key),
+        )
+    }
+
+    to_create, to_update = [], []
+    now = timezone.now()
+    for key, data in by_key.items():
+        updated = connector.record_updated(object_type, data)
+        updated_at = parse_datetime(updated) if isinstance(updated, str) else updated
+        record = existing.get(key)
+        if record is None:
+            to_create.append(ExternalRecord(
+                integration=connector.integration,
+                object_type=object_type,
+                external_id=key,
+                data=data,
+                external_updated_at=updated_at,
+            ))
+        elif record.data != data:
+            record.data = data
+            record.external_updated_at = updated_at
+            record.synced_at = now
+            to_update.append(record)
+
+    ExternalRecord.objects.bulk_create(to_create, batch_size=1000)
+    ExternalRecord.objects.bulk_update(to_update, ['data', 'external_updated_at', 'synced_at'], batch_size=1000)
+    return len(to_create), len(to_update)
@@ -0,0 +1,131 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from apps.forum.discourse import import_posts, import_topics, pending_changes, record_pushed
+from apps.forum.models import ForumCategory
+
+from .base import BaseConnector, ConnectorError, Page
+
+
+class DiscourseConnector(BaseConnector):
+    """
+    Two-way forum sync with Discourse (see ``apps.forum.discourse``).
+
+    Each run first pushes the outbox: topic changes, then post changes (so
+    new posts can refer to topics created in the same run), up to
+    ``max_concurrency`` requests at a time. It then pulls topics from
+    ``/latest.json`` by activity, stopping at the ``bumped_at`` cursor, and
+    posts from ``/posts.json`` back to the last post id seen. Neither list
+    has a page count, so pages are followed one by one. Edits to old posts
+    do not move the post cursor; ``--full`` picks them up.
+
+    Topics in Discourse categories with no matching
+    ``ForumCategory.discourse_id`` go to ``configuration['category_id']``
+    (default: the first active category).
+    """
+    integration_type = 'discourse'
+    object_types = ('topics', 'posts')
+    ordered_types = True
+    outbox_batch_size = 100
+    # Discourse's default admin API limit is 60 requests a minute
+    rate_limit = (1, 10)
+
+    def __init__(self, integration, transport=None):
+        super().__init__(integration, transport)
+        self._default_category = None
+
+    def base_url(self):
+        return (self.integration.api_endpoint or settings.DISCOURSE_BASE_URL).rstrip('/')
+
+    def headers(self):
+        headers = super().headers()
+        api_key = self.integration.api_key or settings.DISCOURSE_API_KEY
+        if api_key:
+            headers['Api-Key'] = api_key
+            headers['Api-Username'] = self.config.get('api_username') or settings.DISCOURSE_API_USERNAME
+        return headers
+
+    def default_category(self):
+        if self._default_category is None:
+            category_id = self.config.get('category_id')
+            categories = ForumCategory.objects.filter(is_active=True)
+            self._default_category = (
+                categories.filter(pk=category_id).first() if category_id else categories.order_by('pk').first()
+            )
+            if self._default_category is None:
+                raise ConnectorError("Discourse imports need configuration['category_id'] or an active forum category")
+        return self._default_category
+
+    # Pull
+
+    async def fetch_page(self, client, object_type, page, cursor, next_url=None):
+        if object_type == 'posts':
+            return await self.fetch_posts(client, cursor, next_url)
+
+        data = await self.get_json(client, '/latest.json', params={'order': 'activity', 'page': page - 1})
+        usernames = {user['id']: user.get('username') for user in data.get('users', [])}
+        topic_list = data.get('topic_list', {})
+        topics = []
+        for topic in topic_list.get('topics', []):
+            if cursor is not None and (self.record_updated(object_type, topic) or '') <= cursor:
+                continue
+            # The original poster is listed first
+            posters = topic.get('posters') or [{}]
+            topics.append({**topic, 'author_username': usernames.get(posters[0].get('user_id'))})
+        return Page(topics, has_more=bool(topics) and bool(topic_list.get('more_topics_url')))
+
+    async def fetch_posts(self, client, cursor, next_url=None):
+        data = await self.get_json(client, next_url or '/posts.json')
+        latest = data.get('latest_posts', [])
+        posts = [post for post in latest if cursor is None or post['id'] > cursor]
+        oldest = min((post['id'] for post in latest), default=None)
+        has_more = bool(posts) and len(posts) == len(latest) and oldest > 1
+        return Page(posts, has_more=has_more, next_url=f'/posts.json?before={oldest}' if has_more else None)
+
+    def record_updated(self, object_type, record):
+        if object_type == 'posts':
+            return record.get('id')
+        return record.get('bumped_at') or record.get('last_posted_at')
+
+    def upsert(self, object_type, records):
+        if object_type == 'posts':
+            return import_posts(records, self.default_user())
+        return import_topics(records, self.default_user(), self.default_category())
+
+    # Push
+
+    async def push(self, client, stats):
+        load = sync_to_async(pending_changes, thread_sensitive=True)
+        save = sync_to_async(record_pushed, thread_sensitive=True)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(change):
+            async with semaphore:
+                return await self.send_change(client, change)
+
+        for object_type in ('topic', 'post'):
+            after = 0
+            while True:
+                changes, after = await load(object_type, after, self.outbox_batch_size)
+                if not changes:
+                    break
+                results = await asyncio.gather(*(send(change) for change in changes), return_exceptions=True)
+                pushed, _ = await save(changes, results)
+                stats.pushed += pushed
+                for change, result in zip(changes, results):
+                    if isinstance(result, Exception):
+                        stats.error(f'push:{object_type}', f'{object_type} {change.object_id}: {result}')
+
+    async def send_change(self, client, change):
+        """Send a change's requests in order; returns the body of the create, if any"""
+        created = None
+        for method, url, body in change.requests or []:
+            response = await client.request(method, url, json=body, cache=False)
+            if method == 'DELETE' and response.status_code == 404:
+                continue
+            response.raise_for_status()
+            if method == 'POST':
+                created = response.json()
+        return created
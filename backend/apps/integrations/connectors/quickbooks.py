@@ -0,0 +1,41 @@
+from .base import BaseConnector, ConnectorError, Page
+
+
+class QuickBooksConnector(BaseConnector):
+    """
+    QuickBooks Online query API for company ``configuration['realm_id']``.
+    Pages with STARTPOSITION/MAXRESULTS and filters on
+    ``Metadata.LastUpdatedTime`` for incremental syncs.
+    """
+    integration_type = 'quickbooks'
+    object_types = ('Customer', 'Invoice')
+    page_size = 1000
+    # 500 requests a minute per company
+    rate_limit = (8, 10)
+
+    def base_url(self):
+        return (self.integration.api_endpoint or 'https://quickbooks.api.intuit.com').rstrip('/')
+
+    def headers(self):
+        headers = super().headers()
+        if self.integration.access_token:
+            headers['Authorization'] = f'Bearer {self.integration.access_token}'
+        return headers
+
+    async def fetch_page(self, client, object_type, page, cursor, next_url=None):
+        realm_id = self.config.get('realm_id')
+        if not realm_id:
+            raise ConnectorError("QuickBooks integrations need configuration['realm_id']")
+        query = f"SELECT * FROM {object_type}"
+        if cursor:
+            query += f" WHERE Metadata.LastUpdatedTime > '{cursor}'"
+        query += f" STARTPOSITION {(page - 1) * self.page_size + 1} MAXRESULTS {self.page_size}"
+        data = await self.get_json(client, f'/v3/company/{realm_id}/query', params={'query': query})
+        records = data.get('QueryResponse', {}).get(object_type, [])
+        return Page(records, has_more=len(records) == self.page_size)
+
+    def record_key(self, object_type, record):
+        return str(record['Id'])
+
+    def record_updated(self, object_type, record):
+        return record.get('MetaData', {}).get('LastUpdatedTime')
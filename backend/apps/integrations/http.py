@@ -0,0 +1,400 @@
+"""
+Shared outbound HTTP for integrations.
+
+Every integration request in a process goes through one ``OutboundHTTP``
+pool (``outbound``), which owns a background event loop and one
+``httpx.AsyncClient`` per upstream host, so keep-alive connections are
+reused across concurrent syncs instead of each sync opening its own. Calls
+are made from any thread or event loop: ``await outbound.request(...)``
+from async code, ``outbound.request_sync(...)`` from plain sync code.
+
+On top of the pool:
+
+- rate limiting: a token bucket per ``Integration`` (``rate`` requests per
+  second, bursts of ``burst``), from ``configuration['rate_limit']``, the
+  connector's ``rate_limit`` or ``INTEGRATION_HTTP_RATE_LIMIT``. Requests
+  wait for a token rather than fail, so concurrent syncs share the quota
+  without being serialized. A 429 with ``Retry-After`` pauses the bucket.
+  Buckets are per process; divide the rate across workers that sync the
+  same integration.
+- conditional GETs: responses with an ``ETag`` or ``Last-Modified`` are
+  kept in the cache (up to ``INTEGRATION_HTTP_CACHE_MAX_BYTES``) and
+  revalidated with ``If-None-Match``/``If-Modified-Since``; a 304 is
+  answered with the cached body.
+- retries: transport errors and 502/503/504 on idempotent methods, and 429
+  on any method, are retried up to ``INTEGRATION_HTTP_MAX_RETRIES`` times
+  with full-jitter exponential backoff (or after ``Retry-After``).
+- metrics: count, errors, retries, 304s, time spent waiting for tokens and
+  request time per host (``outbound.metrics()``), and per run when a
+  ``RequestMetrics`` is passed in (connectors store theirs on the SyncLog).
+
+The shared clients never store cookies, since they serve every integration
+on a host.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import httpx
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+MAX_RETRY_AFTER = 300
+CACHE_KEY = 'integrations:http:{}'
+# httpx has already decoded the body, so these no longer describe it
+STALE_HEADERS = frozenset({'content-encoding', 'content-length', 'transfer-encoding'})
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0), MAX_RETRY_AFTER)
+
+
+def backoff(attempt):
+    """Full-jitter exponential backoff for retry number attempt (from 1)"""
+    base = _setting('INTEGRATION_HTTP_BACKOFF', 0.5)
+    cap = _setting('INTEGRATION_HTTP_BACKOFF_MAX', 30)
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class TokenBucket:
+    """Token bucket; only used from the pool's event loop, so it needs no lock"""
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.paused_until = 0
+
+    def configure(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Wait for a token; returns the seconds waited"""
+        started = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return now - started
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RequestMetrics:
+    """Request counters and timings; only updated from the pool's event loop"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.throttled_seconds = 0.0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def observe(self, elapsed, error=False):
+        self.requests += 1
+        self.errors += error
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+
+    def snapshot(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'not_modified': self.not_modified,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'total_seconds': round(self.total_seconds, 3),
+            'avg_seconds': round(self.total_seconds / self.requests, 3) if self.requests else None,
+            'max_seconds': round(self.max_seconds, 3),
+        }
+
+
+class OutboundHTTP:
+    """Process-wide keep-alive pool with rate limiting, conditional GETs and retries"""
+
+    def __init__(self, transport=None):
+        self.transport = transport
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pid = None
+        self._clients = {}
+        self._buckets = {}
+        self._metrics = {}
+
+    # Event loop
+
+    def _ensure_loop(self):
+        # Restart after fork: the loop thread does not survive into children
+        with self._lock:
+            if self._loop is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return self._loop
+            self._pid = os.getpid()
+            self._clients, self._buckets, self._metrics = {}, {}, {}
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._loop.run_forever, name='integrations-http', daemon=True)
+            self._thread.start()
+            return self._loop
+
+    def _submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_loop())
+
+    async def request(self, method, url, **kwargs):
+        """Send a request from any event loop; see _request for the arguments"""
+        return await asyncio.wrap_future(self._submit(self._request(method, url, **kwargs)))
+
+    def request_sync(self, method, url, **kwargs):
+        """Send a request from sync code (not from the pool's own thread)"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("request_sync() called from the outbound HTTP loop")
+        return self._submit(self._request(method, url, **kwargs)).result()
+
+    def close(self):
+        if self._loop is None or self._pid != os.getpid():
+            return
+        self._submit(self._close_clients()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _close_clients(self):
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    # Pool
+
+    def _client(self, origin):
+        client = self._clients.get(origin)
+        if client is None:
+            per_host = _setting('INTEGRATION_HTTP_MAX_CONNECTIONS_PER_HOST', 10)
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=per_host,
+                    max_keepalive_connections=per_host,
+                    keepalive_expiry=_setting('INTEGRATION_HTTP_KEEPALIVE_EXPIRY', 30),
+                ),
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+                transport=self.transport,
+            )
+            self._clients[origin] = client
+        return client
+
+    def _bucket(self, key, rate_limit):
+        rate, burst = rate_limit
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+        else:
+            bucket.configure(rate, burst)
+        return bucket
+
+    def metrics(self):
+        """Per-host request metrics for this process"""
+        return {host: metrics.snapshot() for host, metrics in list(self._metrics.items())}
+
+    # Requests
+
+    async def _request(self, method, url, *, params=None, headers=None, json=None, data=None,
+                       content=None, auth=None, timeout=None, rate_key=None, rate_limit=None,
+                       cache_key=None, metrics=None):
+        """
+        rate_key/rate_limit select the token bucket ((rate, burst) per second);
+        cache_key scopes conditional-GET caching (None disables it).
+        """
+        method = method.upper()
+        parts = urlsplit(str(url))
+        client = self._client(f'{parts.scheme}://{parts.netloc}')
+        request = client.build_request(
+            method, url, params=params, headers=headers, json=json, data=data, content=content,
+            timeout=timeout or _setting('INTEGRATION_HTTP_TIMEOUT', 30),
+        )
+        host_metrics = self._metrics.setdefault(parts.netloc, RequestMetrics())
+        run_metrics = [host_metrics] + ([metrics] if metrics is not None else [])
+        bucket = self._bucket(rate_key, rate_limit) if rate_key is not None and rate_limit else None
+
+        cached = None
+        if cache_key is not None and method == 'GET':
+            cache_key = CACHE_KEY.format(hashlib.sha256(f'{cache_key} {request.url}'.encode()).hexdigest())
+            cached = await asyncio.get_running_loop().run_in_executor(None, cache.get, cache_key)
+            if cached:
+                if cached.get('etag'):
+                    request.headers['If-None-Match'] = cached['etag']
+                if cached.get('last_modified'):
+                    request.headers['If-Modified-Since'] = cached['last_modified']
+
+        max_retries = _setting('INTEGRATION_HTTP_MAX_RETRIES', 3)
+        attempt = 0
+        while True:
+            if bucket is not None:
+                waited = await bucket.acquire()
+                for item in run_metrics:
+                    item.throttled_seconds += waited
+
+            started = time.monotonic()
+            try:
+                response = await client.send(request, auth=auth)
+            except httpx.TransportError as e:
+                elapsed = time.monotonic() - started
+                for item in run_metrics:
+                    item.observe(elapsed, error=True)
+                if method not in IDEMPOTENT_METHODS or attempt >= max_retries:
+                    raise
+                attempt += 1
+                delay = backoff(attempt)
+                logger.info(f"{method} {parts.netloc}{parts.path} failed ({e!r}); retry {attempt} in {delay:.1f}s")
+            else:
+                elapsed = time.monotonic() - started
+                retry = (
+                    response.status_code in RETRY_STATUSES
+                    and (response.status_code == 429 or method in IDEMPOTENT_METHODS)
+                    and attempt < max_retries
+                )
+                for item in run_metrics:
+                    item.observe(elapsed, error=response.status_code >= 400)
+                logger.debug(f"{method} {parts.netloc}{parts.path} {response.status_code} {elapsed:.3f}s")
+                if not retry:
+                    break
+                attempt += 1
+                retry_after = _retry_after(response)
+                delay = retry_after if retry_after is not None else backoff(attempt)
+                if response.status_code == 429 and bucket is not None:
+                    bucket.pause(delay)
+                logger.info(f"{method} {parts.netloc}{parts.path} {response.status_code}; retry {attempt} in {delay:.1f}s")
+            for item in run_metrics:
+                item.retries += 1
+            await asyncio.sleep(delay)
+
+        if cached and response.status_code == 304:
+            for item in run_metrics:
+                item.not_modified += 1
+            return httpx.Response(
+                cached['status'], headers=cached['headers'], content=cached['content'], request=request
+            )
+        if cache_key is not None and method == 'GET' and response.status_code == 200:
+            await self._store(cache_key, response)
+        return response
+
+    async def _store(self, cache_key, response):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified) or len(response.content) > _setting('INTEGRATION_HTTP_CACHE_MAX_BYTES', 1048576):
+            return
+        entry = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'status': response.status_code,
+            'headers': [(k, v) for k, v in response.headers.multi_items() if k.lower() not in STALE_HEADERS],
+            'content': response.content,
+        }
+        timeout = _setting('INTEGRATION_HTTP_CACHE_TIMEOUT', 60 * 60 * 24 * 7)
+        await asyncio.get_running_loop().run_in_executor(None, cache.set, cache_key, entry, timeout)
+
+
+outbound = OutboundHTTP()
+
+
+def rate_limit_for(integration, default=None):
+    """(rate, burst) for an integration: configuration, then default, then settings"""
+    configured = (integration.configuration or {}).get('rate_limit') or {}
+    rate, burst = default or (None, None)
+    rate = float(configured.get('rate', rate or _setting('INTEGRATION_HTTP_RATE_LIMIT', 10)))
+    burst = int(configured.get('burst', burst or _setting('INTEGRATION_HTTP_RATE_BURST', 20)))
+    return (rate, max(burst, 1)) if rate > 0 else None
+
+
+class IntegrationClient:
+    """
+    An integration's view of the pool: a base URL, default headers and auth,
+    its token bucket and conditional-GET cache scope, and run metrics.
+    Usable as an async context manager like ``httpx.AsyncClient``.
+    """
+
+    def __init__(self, integration, base_url, headers=None, auth=None, rate_limit=None,
+                 timeout=None, metrics=None, pool=None):
+        self.integration = integration
+        self.base_url = base_url.rstrip('/')
+        self.headers = headers or {}
+        self.auth = auth
+        self.rate_limit = rate_limit
+        self.timeout = timeout
+        self.metrics = metrics
+        self.pool = pool or outbound
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self.pool is not outbound:
+            await asyncio.get_running_loop().run_in_executor(None, self.pool.close)
+
+    def _options(self, url, headers=None, cache=True, **kwargs):
+        if not url.startswith(('http://', 'https://')):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        return url, dict(
+            kwargs,
+            headers={**self.headers, **(headers or {})},
+            auth=self.auth,
+            timeout=self.timeout,
+            rate_key=self.integration.pk,
+            rate_limit=self.rate_limit,
+            cache_key=f'integration:{self.integration.pk}' if cache else None,
+            metrics=self.metrics,
+        )
+
+    async def request(self, method, url, **kwargs):
+        url, options = self._options(url, **kwargs)
+        return await self.pool.request(method, url, **options)
+
+    def request_sync(self, method, url, **kwargs):
+        url, options = self._options(url, **kwargs)
+        return self.pool.request_sync(method, url, **options)
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request('POST', url, **kwargs)
+
+    async def put(self, url, **kwargs):
+        return await self.request('PUT', url, **kwargs)
+
+    async def delete(self, url, **kwargs):
+        return await self.request('DELETE', url, **kwargs)
@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.integrations.connectors import ConnectorError, get_connector
+from apps.integrations.models import Integration
+from apps.integrations.recording import RecordingTransport, ReplayTransport
+from apps.integrations.sync import sync_due, sync_integration
+
+
+class Command(BaseCommand):
+    help = 'Sync integrations whose sync_frequency has elapsed (run from cron or celery beat)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--integration',
+            type=int,
+            action='append',
+            help='Sync this integration id now, whether or not it is due (repeatable)'
+        )
+        parser.add_argument(
+            '--full',
+            action='store_true',
+            help='Ignore saved cursors and resync everything (with --integration)'
+        )
+        recording = parser.add_mutually_exclusive_group()
+        recording.add_argument(
+            '--record',
+            metavar='DIR',
+            help='Save upstream responses to DIR (with --integration)'
+        )
+        recording.add_argument(
+            '--replay',
+            metavar='DIR',
+            help='Answer upstream requests from responses recorded in DIR (with --integration)'
+        )
+
+    def handle(self, *args, **options):
+        if (options['record'] or options['replay']) and not options['integration']:
+            raise CommandError('--record and --replay need --integration')
+
+        if options['integration']:
+            results = []
+            for integration in Integration.objects.filter(pk__in=options['integration']):
+                try:
+                    if options['record'] or options['replay']:
+                        transport = (
+                            RecordingTransport(options['record']) if options['record']
+                            else ReplayTransport(options['replay'])
+                        )
+                        log = get_connector(integration, transport=transport).run(full=options['full'])
+                    else:
+                        log = sync_integration(integration, full=options['full'])
+                except (ConnectorError, FileNotFoundError) as e:
+                    raise CommandError(str(e))
+                results.append((integration, log))
+        else:
+            results = sync_due()
+
+        if not results:
+            self.stdout.write('No integrations due')
+            return
+
+        for integration, log in results:
+            style = self.style.SUCCESS if log.status == 'success' else self.style.WARNING
+            seconds = (log.completed_at - log.started_at).total_seconds()
+            rate = f', {log.records_processed / seconds:.1f} records/s' if seconds > 0 else ''
+            self.stdout.write(style(
+                f'{integration}: {log.status}, {log.records_processed} processed, '
+                f'{log.records_created} created, {log.records_updated} updated, {log.records_failed} failed '
+                f'in {seconds:.2f}s{rate}'
+            ))
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExternalRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("object_type", models.CharField(max_length=50)),
+                ("external_id", models.CharField(max_length=100)),
+                ("data", models.JSONField(default=dict)),
+                ("external_updated_at", models.DateTimeField(blank=True, null=True)),
+                ("synced_at", models.DateTimeField(auto_now=True)),
+                (
+                    "integration",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="records",
+                        to="integrations.integration",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "External Record",
+                "verbose_name_plural": "External Records",
+                "db_table": "integration_records",
+                "ordering": ["-external_updated_at"],
+                "unique_together": {("integration", "object_type", "external_id")},
+            },
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("integrations", "0002_externalrecord"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "integration_type",
+                    models.CharField(
+                        choices=[
+                            ("salesforce", "Salesforce"),
+                            ("quickbooks", "QuickBooks"),
+                            ("wordpress", "WordPress"),
+                            ("discourse", "Discourse"),
+                            ("eventbrite", "EventBrite"),
+                            ("google_analytics", "Google Analytics"),
+                            ("social_media", "Social Media"),
+                            ("email_marketing", "Email Marketing"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("object_type", models.CharField(max_length=50)),
+                ("object_id", models.PositiveBigIntegerField()),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[("upsert", "Create or update"), ("delete", "Delete")],
+                        default="upsert",
+                        max_length=10,
+                    ),
+                ),
+                ("payload", models.JSONField(default=dict)),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True, null=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Outbox Entry",
+                "verbose_name_plural": "Outbox Entries",
+                "db_table": "integration_outbox",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["integration_type", "object_type", "id"],
+                        name="integration_outbox_type_idx",
+                    )
+                ],
+            },
+        ),
+    ]
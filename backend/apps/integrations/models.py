@@ -96,3 +96,63 @@ class SyncLog(models.Model):
     
     def __str__(self):
         return f"{self.integration.name} sync at {self.started_at}"
+
+
+class ExternalRecord(models.Model):
+    """
+    Records pulled from an integration that have no native model
+    (WordPress posts, Salesforce contacts, ...), keyed by their upstream id
+    """
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name='records')
+    object_type = models.CharField(max_length=50)
+    external_id = models.CharField(max_length=100)
+    
+    data = models.JSONField(default=dict)
+    external_updated_at = models.DateTimeField(null=True, blank=True)
+    synced_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'integration_records'
+        verbose_name = 'External Record'
+        verbose_name_plural = 'External Records'
+        unique_together = ['integration', 'object_type', 'external_id']
+        ordering = ['-external_updated_at']
+    
+    def __str__(self):
+        return f"{self.integration.name} {self.object_type} {self.external_id}"
+
+
+class OutboxEntry(models.Model):
+    """
+    A local change waiting to be pushed to an integration. Entries are
+    written in the same transaction as the change and deleted once pushed;
+    failed pushes keep their last error and are retried up to MAX_ATTEMPTS.
+    """
+    ACTION_CHOICES = [
+        ('upsert', 'Create or update'),
+        ('delete', 'Delete'),
+    ]
+    
+    MAX_ATTEMPTS = 5
+    
+    integration_type = models.CharField(max_length=30, choices=Integration.INTEGRATION_TYPES)
+    object_type = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES, default='upsert')
+    payload = models.JSONField(default=dict)
+    
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'integration_outbox'
+        verbose_name = 'Outbox Entry'
+        verbose_name_plural = 'Outbox Entries'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['integration_type', 'object_type', 'id'], name='integration_outbox_type_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_integration_type_display()} {self.action} {self.object_type} {self.object_id}"
@@ -0,0 +1,69 @@
+"""
+Record and replay upstream API responses.
+
+``RecordingTransport`` passes requests through to the real API and saves
+each response as a JSON file in a directory; ``ReplayTransport`` answers
+requests from those files, so a connector can be run (and timed) against a
+recorded sync without network access or credentials::
+
+    manage.py sync_integrations --integration 3 --full --record fixtures/eventbrite
+    manage.py sync_integrations --integration 3 --full --replay fixtures/eventbrite
+
+Files are named after the method, path and a hash of the query string.
+Request headers (and so credentials) are never written.
+"""
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import httpx
+
+from .http import STALE_HEADERS
+
+
+def fixture_name(request):
+    query = '&'.join(sorted(f'{key}={value}' for key, value in request.url.params.multi_items()))
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', request.url.path).strip('_') or 'root'
+    return f'{request.method.lower()}_{slug}_{hashlib.sha1(query.encode()).hexdigest()[:10]}.json'
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    def __init__(self, directory, transport=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request):
+        response = await self.transport.handle_async_request(request)
+        content = await response.aread()
+        await response.aclose()
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in STALE_HEADERS]
+        (self.directory / fixture_name(request)).write_text(json.dumps({
+            'method': request.method,
+            'url': str(request.url.copy_with(query=None)),
+            'params': list(request.url.params.multi_items()),
+            'status': response.status_code,
+            'headers': headers,
+            'body': content.decode('utf-8', errors='replace'),
+        }, indent=1))
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise FileNotFoundError(f"No recordings in {self.directory}")
+
+    async def handle_async_request(self, request):
+        path = self.directory / fixture_name(request)
+        if not path.exists():
+            return httpx.Response(404, json={'error': f'No recording {path.name}'}, request=request)
+        recording = json.loads(path.read_text())
+        return httpx.Response(
+            recording['status'], headers=recording['headers'], content=recording['body'].encode(), request=request
+        )
@@ -6,6 +6,11 @@ class IntegrationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Integration
         fields = '__all__'
+        # Credentials can be set but are never sent back
+        extra_kwargs = {
+            field: {'write_only': True}
+            for field in ('api_key', 'api_secret', 'access_token', 'refresh_token')
+        }
 
 
 class SyncLogSerializer(serializers.ModelSerializer):
@@ -0,0 +1,41 @@
+"""
+Outbox producers: queue local changes for integrations that push them
+upstream. Entries are written in the same transaction as the change, so a
+change is never lost or pushed without being committed.
+"""
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.forum.models import ForumPost, ForumTopic
+
+from .models import OutboxEntry
+
+FORUM_OBJECT_TYPES = {ForumTopic: 'topic', ForumPost: 'post'}
+
+
+@receiver(post_save, sender=ForumTopic)
+@receiver(post_save, sender=ForumPost)
+def queue_forum_change(sender, instance, raw=False, **kwargs):
+    if raw or not settings.DISCOURSE_INTEGRATION_ENABLED:
+        return
+    OutboxEntry.objects.create(
+        integration_type='discourse',
+        object_type=FORUM_OBJECT_TYPES[sender],
+        object_id=instance.pk,
+    )
+
+
+@receiver(post_delete, sender=ForumTopic)
+@receiver(post_delete, sender=ForumPost)
+def queue_forum_delete(sender, instance, **kwargs):
+    # Nothing to delete upstream if it was never pushed
+    if not settings.DISCOURSE_INTEGRATION_ENABLED or instance.discourse_id is None:
+        return
+    OutboxEntry.objects.create(
+        integration_type='discourse',
+        object_type=FORUM_OBJECT_TYPES[sender],
+        object_id=instance.pk,
+        action='delete',
+        payload={'discourse_id': instance.discourse_id},
+    )
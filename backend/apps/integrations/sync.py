@@ -0,0 +1,44 @@
+"""
+Scheduling for integration syncs.
+
+``due_integrations`` are enabled, auto-syncing integrations whose
+``sync_frequency`` has elapsed since ``last_sync``; ``sync_integration``
+runs one through its connector (``apps.integrations.connectors``).
+"""
+import logging
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .connectors import CONNECTORS, ConnectorError, get_connector
+from .models import Integration
+
+logger = logging.getLogger(__name__)
+
+
+def due_integrations(now=None):
+    now = now or timezone.now()
+    candidates = Integration.objects.filter(
+        is_enabled=True, auto_sync=True, integration_type__in=list(CONNECTORS)
+    )
+    return [
+        integration for integration in candidates
+        if integration.last_sync is None
+        or integration.last_sync + timedelta(seconds=integration.sync_frequency) <= now
+    ]
+
+
+def sync_integration(integration, full=False, log=None):
+    """Run one sync; returns its SyncLog"""
+    connector = get_connector(integration)
+    return connector.run(full=full, log=log)
+
+
+def sync_due(now=None):
+    results = []
+    for integration in due_integrations(now):
+        try:
+            results.append((integration, sync_integration(integration)))
+        except ConnectorError as e:
+            logger.warning(f"Skipping {integration}: {e}")
+    return results
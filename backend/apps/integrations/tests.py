@@ -0,0 +1,105 @@
+import httpx
+from django.test import TransactionTestCase, override_settings
+
+from .connectors import get_connector
+from .models import ExternalRecord, Integration
+
+PAGE_SIZE = 2
+
+
+def post(pk, modified):
+    return {'id': pk, 'title': {'rendered': f'Post {pk}'}, 'modified_gmt': modified}
+
+
+POSTS = [
+    post(1, '2024-01-01T00:00:00'),
+    post(2, '2024-01-02T00:00:00'),
+    post(3, '2024-01-03T00:00:00'),
+    post(4, '2024-01-04T00:00:00'),
+    post(5, '2024-01-05T00:00:00'),
+]
+
+
+class WordPressStub:
+    """wp/v2 posts endpoint: paged by per_page, filtered by modified_after, X-WP-TotalPages"""
+
+    def __init__(self, posts, failing_pages=()):
+        self.posts = posts
+        self.failing_pages = set(failing_pages)
+        self.requests = []
+
+    def __call__(self, request):
+        params = request.url.params
+        self.requests.append(dict(params))
+        page = int(params['page'])
+        per_page = int(params['per_page'])
+        if page in self.failing_pages:
+            return httpx.Response(500, json={'code': 'internal_error'})
+        since = params.get('modified_after')
+        posts = [p for p in self.posts if since is None or f"{p['modified_gmt']}Z" > since]
+        total_pages = max((len(posts) + per_page - 1) // per_page, 1)
+        start = (page - 1) * per_page
+        return httpx.Response(
+            200, json=posts[start:start + per_page], headers={'X-WP-TotalPages': str(total_pages)},
+        )
+
+
+@override_settings(INTEGRATION_HTTP_MAX_RETRIES=0)
+class ConnectorSyncTests(TransactionTestCase):
+    """BaseConnector paging, cursors and SyncLog counts against a local stub (no network)"""
+
+    def setUp(self):
+        self.integration = Integration.objects.create(
+            name='Blog',
+            integration_type='wordpress',
+            api_endpoint='https://blog.example.org',
+            configuration={'object_types': ['posts'], 'max_concurrency': 2},
+        )
+
+    def sync(self, stub, full=False):
+        connector = get_connector(self.integration, transport=httpx.MockTransport(stub))
+        connector.page_size = PAGE_SIZE
+        log = connector.run(full=full)
+        self.integration.refresh_from_db()
+        return log
+
+    def cursor(self):
+        return self.integration.configuration.get('sync_cursors', {}).get('posts')
+
+    def test_paged_sync(self):
+        stub = WordPressStub(POSTS)
+        log = self.sync(stub)
+
+        self.assertEqual(log.status, 'success')
+        self.assertEqual(sorted(request['page'] for request in stub.requests), ['1', '2', '3'])
+        self.assertEqual((log.records_processed, log.records_created, log.records_updated), (5, 5, 0))
+        self.assertEqual(
+            sorted(ExternalRecord.objects.filter(object_type='posts').values_list('external_id', flat=True)),
+            ['1', '2', '3', '4', '5'],
+        )
+        self.assertEqual(self.cursor(), '2024-01-05T00:00:00Z')
+
+    def test_incremental_sync_uses_stored_cursor(self):
+        self.sync(WordPressStub(POSTS[:3]))
+        self.assertEqual(self.cursor(), '2024-01-03T00:00:00Z')
+
+        changed = post(2, '2024-01-06T00:00:00')
+        stub = WordPressStub([POSTS[0], POSTS[2], POSTS[3], changed])
+        log = self.sync(stub)
+
+        self.assertEqual({request.get('modified_after') for request in stub.requests}, {'2024-01-03T00:00:00Z'})
+        self.assertEqual(log.status, 'success')
+        self.assertEqual((log.records_processed, log.records_created, log.records_updated), (2, 1, 1))
+        self.assertEqual(self.cursor(), '2024-01-06T00:00:00Z')
+
+    def test_failed_page_is_partial_and_keeps_cursor(self):
+        self.sync(WordPressStub(POSTS[:1]))
+        self.assertEqual(self.cursor(), '2024-01-01T00:00:00Z')
+
+        log = self.sync(WordPressStub(POSTS, failing_pages={2}))
+
+        self.assertEqual(log.status, 'partial')
+        self.assertEqual(log.records_created, 2)
+        self.assertIn('page 2', log.error_message)
+        self.assertEqual(self.cursor(), '2024-01-01T00:00:00Z')
+        self.assertEqual(self.integration.status, 'active')
@@ -1,7 +1,13 @@
+import threading
+
 from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.conf import settings
+from django.db import connections
+from .connectors import ConnectorError, get_connector
 from .models import Integration, SyncLog
+from .serializers import IntegrationSerializer, SyncLogSerializer
 
 
 def _is_integrations_enabled() -> bool:
@@ -10,7 +16,9 @@ def _is_integrations_enabled() -> bool:
 
 class IntegrationViewSet(viewsets.ModelViewSet):
     queryset = Integration.objects.all()
-    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = IntegrationSerializer
+    # Integrations hold third-party credentials and decide where they are sent
+    permission_classes = [permissions.IsAdminUser]
 
     def dispatch(self, request, *args, **kwargs):
         if not _is_integrations_enabled():
@@ -22,10 +30,31 @@ class IntegrationViewSet(viewsets.ModelViewSet):
             )
         return super().dispatch(request, *args, **kwargs)
 
+    @action(detail=True, methods=['post'])
+    def sync(self, request, pk=None):
+        """Start a sync in the background (?full=1 ignores saved cursors); poll the returned SyncLog"""
+        integration = self.get_object()
+        try:
+            connector = get_connector(integration)
+        except ConnectorError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        log = connector.start()
+        full = request.query_params.get('full') in ('1', 'true')
+
+        def work():
+            try:
+                connector.run(full=full, log=log)
+            finally:
+                connections.close_all()
+
+        threading.Thread(target=work, name=f'sync-{integration.pk}', daemon=True).start()
+        return Response(SyncLogSerializer(log).data, status=status.HTTP_202_ACCEPTED)
+
 
 class SyncLogViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = SyncLog.objects.all()
-    permission_classes = [permissions.IsAuthenticated]
+    queryset = SyncLog.objects.select_related('integration')
+    serializer_class = SyncLogSerializer
+    permission_classes = [permissions.IsAdminUser]
 
     def dispatch(self, request, *args, **kwargs):
         if not _is_integrations_enabled():
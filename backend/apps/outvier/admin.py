@@ -1,8 +1,10 @@
 from django.contrib import admin
+from import_export.admin import ImportExportMixin
 from .models import (
     PersonalProfile, Goal, GoalMilestone, TeamMatch, 
     GrowthPathway, ProgressInsight
 )
+from .resources import GoalResource, GrowthPathwayResource
 
 
 @admin.register(PersonalProfile)
@@ -38,7 +40,8 @@ class GoalMilestoneInline(admin.TabularInline):
 
 
 @admin.register(Goal)
-class GoalAdmin(admin.ModelAdmin):
+class GoalAdmin(ImportExportMixin, admin.ModelAdmin):
+    resource_classes = [GoalResource]
     list_display = ['title', 'user', 'goal_type', 'priority', 'progress_percentage', 'is_completed', 'target_date']
     list_filter = ['goal_type', 'priority', 'is_completed', 'created_at']
     search_fields = ['title', 'user__first_name', 'user__last_name', 'user__email']
@@ -92,7 +95,8 @@ class TeamMatchAdmin(admin.ModelAdmin):
 
 
 @admin.register(GrowthPathway)
-class GrowthPathwayAdmin(admin.ModelAdmin):
+class GrowthPathwayAdmin(ImportExportMixin, admin.ModelAdmin):
+    resource_classes = [GrowthPathwayResource]
     list_display = ['title', 'user', 'pathway_type', 'difficulty_level', 'current_step', 'total_steps', 'is_completed']
     list_filter = ['pathway_type', 'difficulty_level', 'is_completed', 'created_at']
     search_fields = ['title', 'user__first_name', 'user__last_name', 'user__email']
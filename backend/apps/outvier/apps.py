@@ -5,3 +5,6 @@ class OutvierConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.outvier'
     verbose_name = 'Outvier'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,103 @@
+import hashlib
+from datetime import datetime, time
+
+from django.db.models import Count, Max
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+
+class ConditionalGetMixin:
+    """
+    Answer conditional GETs (If-None-Match / If-Modified-Since) with
+    304 Not Modified before anything is serialized.
+
+    List routes are fingerprinted with a single aggregate query over the
+    filtered queryset (Max of the timestamp field plus a row count, so
+    deletions change the tag too). Detail routes use the object's own
+    timestamp. Embedded children and many-to-many relations touch the
+    parent's timestamp when they change (``apps.outvier.signals``), and the
+    current date is part of every tag because serializers compute
+    date-relative fields (days_remaining, is_overdue, ...).
+    """
+
+    updated_at_field = 'updated_at'
+
+    def _make_etag(self, *parts):
+        raw = ':'.join(str(part) for part in (*parts, timezone.localdate().isoformat()))
+        return quote_etag(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+    def _since_today(self, last_modified):
+        # Date-relative fields change at midnight, so If-Modified-Since must too
+        today = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        return max(last_modified, today) if last_modified else None
+
+    def _collection_fingerprint(self, queryset):
+        """Return (etag, last_modified) for a queryset in one query"""
+        stats = queryset.order_by().aggregate(
+            last_modified=Max(self.updated_at_field),
+            count=Count('pk'),
+        )
+        last_modified = stats['last_modified']
+        etag = self._make_etag(
+            queryset.model._meta.label,
+            self.request.user.pk,
+            self.request.get_full_path(),
+            stats['count'],
+            last_modified.isoformat() if last_modified else '',
+        )
+        return etag, self._since_today(last_modified)
+
+    def _object_fingerprint(self, instance):
+        """Return (etag, last_modified) for a single object"""
+        last_modified = getattr(instance, self.updated_at_field, None)
+        etag = self._make_etag(
+            instance._meta.label,
+            instance.pk,
+            last_modified.isoformat() if last_modified else '',
+        )
+        return etag, self._since_today(last_modified)
+
+    def _conditional_response(self, request, etag, last_modified):
+        """Return a 304 response if the client's copy is current, else None"""
+        timestamp = last_modified.timestamp() if last_modified else None
+        response = get_conditional_response(
+            request, etag=etag, last_modified=timestamp
+        )
+        if isinstance(response, HttpResponseNotModified):
+            self._set_validators(response, etag, last_modified)
+            return response
+        return None
+
+    def _set_validators(self, response, etag, last_modified):
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        # List tags are per user, so shared caches must not mix them up
+        patch_vary_headers(response, ('Authorization', 'Cookie'))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag, last_modified = self._collection_fingerprint(queryset)
+
+        not_modified = self._conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        return self._set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = self._object_fingerprint(instance)
+
+        not_modified = self._conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        return self._set_validators(response, etag, last_modified)
@@ -0,0 +1,64 @@
+from import_export import fields
+
+from apps.core.resources import BulkModelResource, CachedForeignKeyWidget
+from apps.projects.models import Project
+from apps.users.models import User
+
+from .models import Goal, GrowthPathway
+
+
+class GoalResource(BulkModelResource):
+    """Goals by id (blank id creates); related skills are export-only"""
+
+    user = fields.Field(attribute='user', column_name='user', widget=CachedForeignKeyWidget(User, 'username'))
+    related_project = fields.Field(
+        attribute='related_project', column_name='related_project', widget=CachedForeignKeyWidget(Project, 'slug')
+    )
+    related_skills = fields.Field(column_name='related_skills', readonly=True)
+
+    class Meta(BulkModelResource.Meta):
+        model = Goal
+        import_id_fields = ('id',)
+        fields = (
+            'id', 'user', 'title', 'description', 'goal_type', 'priority', 'status',
+            'start_date', 'target_date', 'completed_date', 'progress_percentage', 'is_completed',
+            'target_value', 'current_value', 'unit', 'related_project', 'related_pathway',
+            'is_public', 'allow_mentorship', 'reminder_frequency', 'time_spent', 'related_skills',
+        )
+        export_order = fields
+
+    def get_queryset(self):
+        return Goal.objects.select_related('user', 'related_project').prefetch_related('related_skills')
+
+    def dehydrate_related_skills(self, goal):
+        return ', '.join(skill.name for skill in goal.related_skills.all())
+
+
+class GrowthPathwayResource(BulkModelResource):
+    """Growth pathways by id (blank id creates); skills and projects are export-only"""
+
+    user = fields.Field(attribute='user', column_name='user', widget=CachedForeignKeyWidget(User, 'username'))
+    required_skills = fields.Field(column_name='required_skills', readonly=True)
+    recommended_projects = fields.Field(column_name='recommended_projects', readonly=True)
+
+    class Meta(BulkModelResource.Meta):
+        model = GrowthPathway
+        import_id_fields = ('id',)
+        fields = (
+            'id', 'user', 'title', 'description', 'pathway_type', 'difficulty_level', 'status',
+            'learning_resources', 'current_step', 'total_steps', 'is_completed', 'completed_at',
+            'estimated_duration', 'is_public', 'allow_collaboration', 'total_time_spent',
+            'preferred_learning_style', 'required_skills', 'recommended_projects',
+        )
+        export_order = fields
+
+    def get_queryset(self):
+        return GrowthPathway.objects.select_related('user').prefetch_related(
+            'required_skills', 'recommended_projects'
+        )
+
+    def dehydrate_required_skills(self, pathway):
+        return ', '.join(skill.name for skill in pathway.required_skills.all())
+
+    def dehydrate_recommended_projects(self, pathway):
+        return ', '.join(project.slug for project in pathway.recommended_projects.all())
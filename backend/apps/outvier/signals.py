@@ -0,0 +1,53 @@
+"""
+Touch a parent's ``updated_at`` when something its serializer embeds
+changes, so the ETags of ``ConditionalGetMixin`` (which read only the
+parent's timestamp) move with the response body: goal milestones and
+pathway steps, and the many-to-many relations shown by name.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Goal, GoalMilestone, GrowthPathway, PathwayStep, TeamMatch
+
+EMBEDDED_M2M = {
+    Goal.related_skills.through: Goal,
+    TeamMatch.matched_users.through: TeamMatch,
+    TeamMatch.required_skills.through: TeamMatch,
+    TeamMatch.project_categories.through: TeamMatch,
+    GrowthPathway.required_skills.through: GrowthPathway,
+    GrowthPathway.recommended_projects.through: GrowthPathway,
+    PathwayStep.prerequisites.through: PathwayStep,
+}
+
+
+def touch(model, pks):
+    model.objects.filter(pk__in=list(pks)).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=GoalMilestone)
+@receiver(post_delete, sender=GoalMilestone)
+def touch_goal(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch(Goal, [instance.goal_id])
+
+
+@receiver(post_save, sender=PathwayStep)
+@receiver(post_delete, sender=PathwayStep)
+def touch_pathway(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch(GrowthPathway, [instance.pathway_id])
+
+
+@receiver(m2m_changed)
+def touch_m2m_owner(sender, instance, action, reverse, pk_set, **kwargs):
+    model = EMBEDDED_M2M.get(sender)
+    if model is None or action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    # Reverse changes (skill.goal_set.add(...)) name the owners in pk_set;
+    # a reverse clear doesn't say which owners it touched
+    owners = [instance.pk] if not reverse else list(pk_set or ())
+    touch(model, owners)
+    if model is PathwayStep:
+        # Steps are embedded in their pathway, whose ETag has to move as well
+        touch(GrowthPathway, PathwayStep.objects.filter(pk__in=owners).values_list('pathway_id', flat=True))
@@ -20,6 +20,7 @@ from .serializers import (
     NotificationPreferenceSerializer, NotificationScheduleSerializer
 )
 from .services import NotificationService, NotificationScheduler
+from .mixins import ConditionalGetMixin
 from apps.users.permissions import IsMemberOrAbove, IsMentorOrAdmin
 from apps.users.models import Skill
 from apps.projects.models import Project, ProjectCategory
@@ -114,7 +115,7 @@ class PersonalProfileViewSet(viewsets.ModelViewSet):
             )
 
 
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Goal.objects.all()
     serializer_class = GoalSerializer
     permission_classes = [IsMemberOrAbove]
@@ -192,7 +193,7 @@ class GoalViewSet(viewsets.ModelViewSet):
             )
 
 
-class TeamMatchViewSet(viewsets.ModelViewSet):
+class TeamMatchViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = TeamMatch.objects.all()
     serializer_class = TeamMatchSerializer
     permission_classes = [IsMemberOrAbove]
@@ -295,7 +296,7 @@ class TeamMatchViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class GrowthPathwayViewSet(viewsets.ModelViewSet):
+class GrowthPathwayViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = GrowthPathway.objects.all()
     serializer_class = GrowthPathwaySerializer
     permission_classes = [IsMemberOrAbove]
@@ -453,7 +454,7 @@ class OutvierDashboardViewSet(viewsets.ReadOnlyModelViewSet):
         })
 
 
-class PathwayStepViewSet(viewsets.ModelViewSet):
+class PathwayStepViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Manage pathway learning steps"""
     queryset = PathwayStep.objects.all()
     serializer_class = PathwayStepSerializer
@@ -726,7 +727,7 @@ class NotificationPreferenceViewSet(viewsets.ModelViewSet):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class NotificationScheduleViewSet(viewsets.ModelViewSet):
+class NotificationScheduleViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     """Manage notification schedules"""
     queryset = NotificationSchedule.objects.all()
     serializer_class = NotificationScheduleSerializer
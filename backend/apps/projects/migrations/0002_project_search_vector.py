@@ -0,0 +1,67 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# PostgreSQL only: a trigger keeps search_vector current (it fires only when
+# the indexed columns are written, so counter updates don't rebuild it), a GIN
+# index serves full-text queries and pg_trgm indexes serve ILIKE typeahead
+# lookups. Other databases keep the unused column and fall back to icontains.
+FORWARD_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION projects_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.title, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.short_description, '')), 'B') ||
+        setweight(to_tsvector('pg_catalog.english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS projects_search_vector_trigger ON projects;
+CREATE TRIGGER projects_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, short_description, description ON projects
+    FOR EACH ROW EXECUTE FUNCTION projects_search_vector_update();
+
+-- Backfill existing rows through the trigger
+UPDATE projects SET title = title;
+
+CREATE INDEX IF NOT EXISTS projects_search_vector_gin ON projects USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS projects_title_trgm ON projects USING gin (title gin_trgm_ops);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS projects_search_vector_gin;
+DROP INDEX IF EXISTS projects_title_trgm;
+DROP TRIGGER IF EXISTS projects_search_vector_trigger ON projects;
+DROP FUNCTION IF EXISTS projects_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FORWARD_SQL)
+
+
+def remove_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, remove_search),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# application_count and member_count were never maintained before
+# apps.projects.services; compute them once from the rows (one UPDATE)
+
+
+def count(rows):
+    return Coalesce(Subquery(rows.annotate(n=Count("pk")).values("n")), 0)
+
+
+def backfill_counts(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    ProjectApplication = apps.get_model("projects", "ProjectApplication")
+    ProjectMember = apps.get_model("projects", "ProjectMember")
+
+    applications = ProjectApplication.objects.filter(project=OuterRef("pk")).order_by().values("project")
+    members = ProjectMember.objects.filter(project=OuterRef("pk")).order_by().values("project")
+    Project.objects.update(
+        application_count=count(applications.exclude(status="withdrawn")),
+        member_count=count(members.filter(status="active")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_project_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
@@ -92,6 +93,9 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Full-text search (maintained by a database trigger on PostgreSQL)
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     class Meta:
         db_table = 'projects'
         verbose_name = 'Project'
@@ -0,0 +1,45 @@
+from import_export import fields
+
+from apps.core.resources import BulkModelResource, CachedForeignKeyWidget
+from apps.users.models import User
+
+from .models import Project, ProjectCategory
+
+
+class ProjectResource(BulkModelResource):
+    """Projects by slug; skills are exported by name but not imported (bulk saves skip M2M)"""
+
+    category = fields.Field(
+        attribute='category', column_name='category', widget=CachedForeignKeyWidget(ProjectCategory, 'name')
+    )
+    created_by = fields.Field(
+        attribute='created_by', column_name='created_by', widget=CachedForeignKeyWidget(User, 'username')
+    )
+    project_lead = fields.Field(
+        attribute='project_lead', column_name='project_lead', widget=CachedForeignKeyWidget(User, 'username')
+    )
+    required_skills = fields.Field(column_name='required_skills', readonly=True)
+    preferred_skills = fields.Field(column_name='preferred_skills', readonly=True)
+
+    class Meta(BulkModelResource.Meta):
+        model = Project
+        import_id_fields = ('slug',)
+        fields = (
+            'slug', 'title', 'short_description', 'description', 'category', 'status', 'visibility',
+            'created_by', 'project_lead', 'start_date', 'expected_end_date', 'actual_end_date',
+            'goals', 'max_team_size', 'requires_approval', 'is_featured',
+            'repository_url', 'demo_url', 'documentation_url',
+            'required_skills', 'preferred_skills',
+        )
+        export_order = fields
+
+    def get_queryset(self):
+        return Project.objects.select_related('category', 'created_by', 'project_lead').prefetch_related(
+            'required_skills', 'preferred_skills'
+        )
+
+    def dehydrate_required_skills(self, project):
+        return ', '.join(skill.name for skill in project.required_skills.all())
+
+    def dehydrate_preferred_skills(self, project):
+        return ', '.join(skill.name for skill in project.preferred_skills.all())
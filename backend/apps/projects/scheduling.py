@@ -0,0 +1,198 @@
+"""
+Critical-path scheduling over ``ProjectMilestone.depends_on``.
+
+A project's milestones and their dependencies form a directed acyclic graph
+(an edge ``a -> b`` means ``a`` depends on ``b``). ``project_schedule``
+loads the graph with one query (``values_list`` over ``depends_on`` is a
+LEFT JOIN on the through table, one row per edge) and computes, in O(V+E):
+
+- a topological order (Kahn's algorithm; ties keep due-date order),
+- earliest start/finish by a forward pass in that order,
+- latest start/finish by a backward pass from the project's end,
+- slack (latest minus earliest start) and the critical path, a chain of
+  zero-slack milestones from the start of the project to its end.
+
+Durations are the remaining estimated hours: ``estimated_hours`` minus
+``actual_hours``, and zero for completed or cancelled milestones, so the
+schedule shows what is left to do. Times are hours from now.
+
+Results are cached per project until a milestone or dependency changes (see
+``apps.projects.signals``, which also refuses dependencies that would close
+a cycle).
+"""
+from collections import deque
+
+from django.core.cache import cache
+
+from .models import ProjectMilestone
+
+SCHEDULE_CACHE_KEY = 'projects:schedule:{}'
+SCHEDULE_TIMEOUT = 60 * 60
+DONE_STATUSES = ('completed', 'cancelled')
+
+
+class ScheduleCycleError(Exception):
+    def __init__(self, milestone_ids):
+        self.milestone_ids = sorted(milestone_ids)
+        super().__init__(f"Milestone dependencies form a cycle through {self.milestone_ids}")
+
+
+def schedule_cache_key(project_id):
+    return SCHEDULE_CACHE_KEY.format(project_id)
+
+
+def invalidate_schedule(*project_ids):
+    cache.delete_many([schedule_cache_key(project_id) for project_id in project_ids if project_id])
+
+
+def topological_order(nodes, edges):
+    """
+    nodes in dependency order (dependencies first). edges maps a node to the
+    nodes it depends on. Raises ScheduleCycleError with the nodes on cycles
+    when there are any.
+    """
+    dependents = {node: [] for node in nodes}
+    waiting = {node: 0 for node in nodes}
+    for node in nodes:
+        for dependency in edges.get(node, ()):
+            dependents[dependency].append(node)
+            waiting[node] += 1
+
+    ready = deque(node for node in nodes if not waiting[node])
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for dependent in dependents[node]:
+            waiting[dependent] -= 1
+            if not waiting[dependent]:
+                ready.append(dependent)
+
+    if len(order) < len(nodes):
+        raise ScheduleCycleError(_cycle_nodes({node for node in nodes if waiting[node]}, dependents))
+    return order
+
+
+def _cycle_nodes(blocked, dependents):
+    """
+    Trim the nodes Kahn's algorithm could not order down to those on a
+    cycle: peel off, repeatedly, blocked nodes that no blocked node depends on.
+    """
+    depended_on = {node: sum(1 for dependent in dependents[node] if dependent in blocked) for node in blocked}
+    dependencies = {node: [] for node in blocked}
+    for node in blocked:
+        for dependent in dependents[node]:
+            if dependent in blocked:
+                dependencies[dependent].append(node)
+    leaves = deque(node for node in blocked if not depended_on[node])
+    while leaves:
+        node = leaves.popleft()
+        blocked.discard(node)
+        for dependency in dependencies[node]:
+            depended_on[dependency] -= 1
+            if not depended_on[dependency]:
+                leaves.append(dependency)
+    return blocked
+
+
+def _load(project_id):
+    """Milestones (in due-date order) and their dependency lists, from one query"""
+    milestones = {}
+    edges = {}
+    rows = ProjectMilestone.objects.filter(project_id=project_id).order_by('due_date', 'pk').values_list(
+        'pk', 'title', 'status', 'due_date', 'estimated_hours', 'actual_hours', 'depends_on',
+    )
+    for pk, title, status, due_date, estimated_hours, actual_hours, dependency in rows:
+        if pk not in milestones:
+            remaining = 0 if status in DONE_STATUSES else max((estimated_hours or 0) - actual_hours, 0)
+            milestones[pk] = {
+                'id': pk, 'title': title, 'status': status, 'due_date': due_date, 'duration': remaining,
+            }
+            edges[pk] = []
+        if dependency is not None:
+            edges[pk].append(dependency)
+    # Dependencies on another project's milestones can't be scheduled here
+    for pk, dependencies in edges.items():
+        edges[pk] = [dependency for dependency in dependencies if dependency in milestones]
+    return milestones, edges
+
+
+def build_schedule(project_id):
+    milestones, edges = _load(project_id)
+    order = topological_order(list(milestones), edges)
+    dependents = {pk: [] for pk in order}
+    for pk in order:
+        for dependency in edges[pk]:
+            dependents[dependency].append(pk)
+
+    # Forward pass: a milestone starts when its last dependency finishes
+    for pk in order:
+        milestone = milestones[pk]
+        milestone['earliest_start'] = max((milestones[dep]['earliest_finish'] for dep in edges[pk]), default=0)
+        milestone['earliest_finish'] = milestone['earliest_start'] + milestone['duration']
+    duration = max((milestone['earliest_finish'] for milestone in milestones.values()), default=0)
+
+    # Backward pass: a milestone must finish before its first dependent has to start
+    for pk in reversed(order):
+        milestone = milestones[pk]
+        milestone['latest_finish'] = min(
+            (milestones[dependent]['latest_start'] for dependent in dependents[pk]), default=duration,
+        )
+        milestone['latest_start'] = milestone['latest_finish'] - milestone['duration']
+        milestone['slack'] = milestone['latest_start'] - milestone['earliest_start']
+        milestone['critical'] = milestone['slack'] == 0
+        milestone['depends_on'] = edges[pk]
+
+    # Every zero-slack milestone has a zero-slack dependent starting as it
+    # finishes (unless it ends the project), so the chain can be walked forward
+    critical_path = []
+    current = next((pk for pk in order if milestones[pk]['critical'] and not edges[pk]), None)
+    while current is not None:
+        critical_path.append(current)
+        finish = milestones[current]['earliest_finish']
+        current = next(
+            (
+                pk for pk in dependents[current]
+                if milestones[pk]['critical'] and milestones[pk]['earliest_start'] == finish
+            ),
+            None,
+        )
+
+    return {
+        'project': project_id,
+        'duration': duration,
+        'order': order,
+        'critical_path': critical_path,
+        'milestones': [milestones[pk] for pk in order],
+    }
+
+
+def project_schedule(project_id):
+    """The cached schedule for a project; raises ScheduleCycleError for cyclic data"""
+    key = schedule_cache_key(project_id)
+    schedule = cache.get(key)
+    if schedule is None:
+        schedule = build_schedule(project_id)
+        cache.set(key, schedule, SCHEDULE_TIMEOUT)
+    return schedule
+
+
+def check_dependencies(project_id, new_edges):
+    """
+    Raise ScheduleCycleError if adding new_edges ((milestone, dependency)
+    pairs) to the project's dependency graph would close a cycle.
+    """
+    edges = {}
+    for milestone, dependency in ProjectMilestone.depends_on.through.objects.filter(
+        from_projectmilestone__project_id=project_id,
+    ).values_list('from_projectmilestone_id', 'to_projectmilestone_id'):
+        edges.setdefault(milestone, []).append(dependency)
+    for milestone, dependency in new_edges:
+        if milestone == dependency:
+            raise ScheduleCycleError([milestone])
+        edges.setdefault(milestone, []).append(dependency)
+
+    nodes = set(edges)
+    for dependencies in edges.values():
+        nodes.update(dependencies)
+    topological_order(list(nodes), edges)
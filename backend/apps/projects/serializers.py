@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from apps.core.serializers import EditedFieldsUpdateMixin
 from .models import (
     Project, ProjectCategory, ProjectMember, ProjectMilestone,
     ProjectUpdate, ProjectApplication
 )
+from .scheduling import ScheduleCycleError, check_dependencies
 
 
 class ProjectCategorySerializer(serializers.ModelSerializer):
@@ -11,10 +13,12 @@ class ProjectCategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(EditedFieldsUpdateMixin, serializers.ModelSerializer):
     class Meta:
         model = Project
-        fields = '__all__'
+        exclude = ['search_vector']
+        # Maintained by apps.projects.services and the view counter
+        read_only_fields = ['view_count', 'application_count', 'member_count']
 
 
 class ProjectMemberSerializer(serializers.ModelSerializer):
@@ -28,6 +32,21 @@ class ProjectMilestoneSerializer(serializers.ModelSerializer):
         model = ProjectMilestone
         fields = '__all__'
 
+    def validate(self, attrs):
+        project = attrs.get('project') or getattr(self.instance, 'project', None)
+        dependencies = attrs.get('depends_on')
+        if project is None or dependencies is None:
+            return attrs
+        if any(dependency.project_id != project.pk for dependency in dependencies):
+            raise serializers.ValidationError({'depends_on': 'Milestones can only depend on milestones of the same project.'})
+        if self.instance is not None:
+            # A new milestone has no dependents yet, so only an existing one can close a cycle
+            try:
+                check_dependencies(project.pk, [(self.instance.pk, dependency.pk) for dependency in dependencies])
+            except ScheduleCycleError as e:
+                raise serializers.ValidationError({'depends_on': str(e)})
+        return attrs
+
 
 class ProjectUpdateSerializer(serializers.ModelSerializer):
     class Meta:
@@ -39,3 +58,13 @@ class ProjectApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = ProjectApplication
         fields = '__all__'
+        # Set by apply()/review() in apps.projects.services
+        read_only_fields = ['applicant', 'status', 'reviewed_by', 'review_notes', 'reviewed_at']
+
+
+class ApplicationReviewSerializer(serializers.Serializer):
+    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    applications = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=500)
+    decision = serializers.ChoiceField(choices=['accept', 'reject'])
+    review_notes = serializers.CharField(required=False, allow_blank=True)
+    role = serializers.ChoiceField(choices=ProjectMember.ROLE_CHOICES, default='contributor')
@@ -0,0 +1,194 @@
+"""
+Project applications and team membership.
+
+``Project.application_count`` counts applications that have not been
+withdrawn and ``Project.member_count`` counts active members. Both are kept
+with ``F()`` updates in the transaction that changes the rows:
+
+- ``apply`` inserts the application and lets the ``(project, applicant)``
+  unique constraint reject duplicates, then bumps ``application_count``.
+  The counter UPDATE is the last statement, so the project row is locked
+  only until the commit.
+- ``review`` accepts or rejects a batch of applications. Accepting locks the
+  project row first (``SELECT ... FOR UPDATE``), so concurrent reviews of one
+  project see each other's ``member_count`` and cannot overfill
+  ``max_team_size``. Applicants go onto the team oldest first; those beyond
+  the limit stay pending. New members are inserted with one
+  ``bulk_create``, returning members (inactive or removed) are reactivated
+  with one UPDATE, and ``member_count`` moves once per batch.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.core.dashboard import invalidate_dashboard
+
+from .models import Project, ProjectApplication, ProjectMember
+
+OPEN_STATUSES = ('planning', 'active')
+REVIEWABLE_STATUSES = ('pending', 'under_review')
+DECISIONS = {'accept': 'accepted', 'reject': 'rejected'}
+
+
+class ApplicationError(Exception):
+    pass
+
+
+class ApplicationClosed(ApplicationError):
+    pass
+
+
+class AlreadyApplied(ApplicationError):
+    pass
+
+
+def _count(rows):
+    return Coalesce(Subquery(rows.annotate(n=Count('pk')).values('n')), 0)
+
+
+def refresh_counts(project_ids):
+    """Recompute application_count and member_count from their rows in one UPDATE"""
+    applications = ProjectApplication.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    members = ProjectMember.objects.filter(project=OuterRef('pk')).order_by().values('project')
+    return Project.objects.filter(pk__in=list(project_ids)).update(
+        application_count=_count(applications.exclude(status='withdrawn')),
+        member_count=_count(members.filter(status='active')),
+    )
+
+
+def _add_applications(project_id, n):
+    Project.objects.filter(pk=project_id).update(application_count=F('application_count') + n)
+
+
+def check_open(project):
+    if project.status not in OPEN_STATUSES:
+        raise ApplicationClosed("This project is not taking applications.")
+
+
+def apply(project, user, **details):
+    """
+    Apply to project as user; details are the application fields (message,
+    relevant_experience, time_commitment, weekly_hours, start_date). An
+    earlier withdrawn application is reopened. Projects that don't require
+    approval accept the applicant straight away if the team has room.
+
+    Raises ApplicationClosed or AlreadyApplied.
+    """
+    check_open(project)
+    try:
+        with transaction.atomic():
+            application = ProjectApplication.objects.create(project=project, applicant=user, **details)
+            _add_applications(project.pk, 1)
+    except IntegrityError:
+        # The unique constraint fired: come back after withdrawing, or report the duplicate
+        with transaction.atomic():
+            application = ProjectApplication.objects.select_for_update().get(project=project, applicant=user)
+            if application.status != 'withdrawn':
+                raise AlreadyApplied("You have already applied to this project.")
+            for name, value in details.items():
+                setattr(application, name, value)
+            application.status = 'pending'
+            application.reviewed_by = None
+            application.reviewed_at = None
+            application.review_notes = None
+            application.applied_at = timezone.now()
+            application.save()
+            _add_applications(project.pk, 1)
+
+    if not project.requires_approval:
+        if review(project, [application.pk], 'accept')['accepted']:
+            application.refresh_from_db()
+    return application
+
+
+def withdraw(application):
+    """Withdraw a pending application; False if it was already decided"""
+    with transaction.atomic():
+        updated = ProjectApplication.objects.filter(
+            pk=application.pk, status__in=REVIEWABLE_STATUSES,
+        ).update(status='withdrawn')
+        if updated:
+            Project.objects.filter(pk=application.project_id, application_count__gt=0).update(
+                application_count=F('application_count') - 1
+            )
+    return bool(updated)
+
+
+def review(project, application_ids, decision, reviewer=None, notes=None, role='contributor'):
+    """
+    Accept or reject ('accept'/'reject') a batch of project's applications.
+    Returns the application ids per outcome: 'accepted' or 'rejected',
+    'skipped' (not found or already decided) and, for accepts, 'team_full'
+    (left pending, the team is at max_team_size), plus the project's
+    member_count.
+    """
+    if decision not in DECISIONS:
+        raise ApplicationError(f"Unknown decision {decision!r}; use 'accept' or 'reject'.")
+    now = timezone.now()
+    requested = list(dict.fromkeys(int(pk) for pk in application_ids))
+    result = {DECISIONS[decision]: [], 'skipped': []}
+
+    with transaction.atomic():
+        if decision == 'accept':
+            # Serializes accepts per project; the rest of the batch reads a stable member_count
+            project = Project.objects.select_for_update().only('pk', 'max_team_size', 'member_count').get(pk=project.pk)
+        applications = list(
+            ProjectApplication.objects.select_for_update()
+            .filter(project=project, pk__in=requested, status__in=REVIEWABLE_STATUSES)
+            .order_by('applied_at', 'pk')
+        )
+        found = {application.pk for application in applications}
+        result['skipped'] = [pk for pk in requested if pk not in found]
+
+        joining = []
+        if decision == 'reject':
+            result['rejected'] = [application.pk for application in applications]
+        else:
+            members = dict(
+                ProjectMember.objects.select_for_update()
+                .filter(project=project, user_id__in=[application.applicant_id for application in applications])
+                .values_list('user_id', 'status')
+            )
+            result['team_full'] = []
+            room = None if project.max_team_size is None else max(project.max_team_size - project.member_count, 0)
+            for application in applications:
+                if members.get(application.applicant_id) == 'active':
+                    # Already on the team: accepting takes no place
+                    result['accepted'].append(application.pk)
+                elif room is not None and room <= 0:
+                    result['team_full'].append(application.pk)
+                else:
+                    result['accepted'].append(application.pk)
+                    joining.append(application)
+                    if room is not None:
+                        room -= 1
+
+            new = [application for application in joining if application.applicant_id not in members]
+            ProjectMember.objects.bulk_create([
+                ProjectMember(
+                    project_id=project.pk, user_id=application.applicant_id, role=role, status='active',
+                    application_message=application.message, time_commitment=application.time_commitment,
+                    weekly_hours=application.weekly_hours, joined_at=now,
+                )
+                for application in new
+            ])
+            returning = [application.applicant_id for application in joining if application.applicant_id in members]
+            if returning:
+                ProjectMember.objects.filter(project_id=project.pk, user_id__in=returning).update(
+                    status='active', role=role, joined_at=now, left_at=None,
+                )
+            if joining:
+                Project.objects.filter(pk=project.pk).update(member_count=F('member_count') + len(joining))
+
+        decided = result[DECISIONS[decision]]
+        if decided:
+            ProjectApplication.objects.filter(pk__in=decided).update(
+                status=DECISIONS[decision], reviewed_by=reviewer, reviewed_at=now, review_notes=notes,
+            )
+        if joining:
+            # bulk_create/update() send no post_save, which would have done this
+            invalidate_dashboard(*(application.applicant_id for application in joining))
+
+    result['member_count'] = Project.objects.values_list('member_count', flat=True).get(pk=project.pk)
+    return result
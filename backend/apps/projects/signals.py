@@ -0,0 +1,31 @@
+"""
+Keep milestone schedules consistent: refuse dependencies that would close a
+cycle, and drop a project's cached schedule when its milestones or their
+dependencies change.
+"""
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ProjectMilestone
+from .scheduling import check_dependencies, invalidate_schedule
+
+MilestoneDependency = ProjectMilestone.depends_on.through
+
+
+@receiver(m2m_changed, sender=MilestoneDependency)
+def guard_milestone_dependencies(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == 'pre_add' and pk_set:
+        # Forward: instance depends on pk_set; reverse (instance.dependents.add): pk_set depends on instance
+        if reverse:
+            new_edges = [(pk, instance.pk) for pk in pk_set]
+        else:
+            new_edges = [(instance.pk, pk) for pk in pk_set]
+        check_dependencies(instance.project_id, new_edges)
+    elif action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_schedule(instance.project_id)
+
+
+@receiver(post_save, sender=ProjectMilestone)
+@receiver(post_delete, sender=ProjectMilestone)
+def invalidate_project_schedule(sender, instance, **kwargs):
+    invalidate_schedule(instance.project_id)
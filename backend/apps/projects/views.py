@@ -1,6 +1,22 @@
-from rest_framework import viewsets, permissions
+from django.db import transaction
+from django.db.models import F
+from rest_framework import viewsets, permissions, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
 from apps.users.permissions import IsAuthenticatedOrReadOnly, IsMentorOrAdmin, IsMemberOrAbove
 from .models import Project, ProjectCategory, ProjectMember, ProjectMilestone, ProjectUpdate, ProjectApplication
+from .serializers import (
+    ApplicationReviewSerializer, ProjectApplicationSerializer, ProjectMilestoneSerializer, ProjectSerializer,
+)
+from . import services
+from .scheduling import ScheduleCycleError, project_schedule
+
+APPLICATION_FIELDS = ('message', 'relevant_experience', 'time_commitment', 'weekly_hours', 'start_date')
+
+
+def is_project_lead(user, project):
+    return user.is_staff or user.pk in (project.created_by_id, project.project_lead_id)
 
 
 class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
@@ -10,9 +26,27 @@ class ProjectCategoryViewSet(viewsets.ReadOnlyModelViewSet):
 
 class ProjectViewSet(viewsets.ModelViewSet):
     queryset = Project.objects.all()
+    serializer_class = ProjectSerializer
     # Only mentors/moderators/admin can create/update; everyone can read
     permission_classes = [IsMentorOrAdmin]
 
+    @action(detail=True, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def schedule(self, request, pk=None):
+        """
+        Critical-path schedule of the project's milestones (hours of remaining
+        work from now): topological order, earliest/latest start and finish,
+        slack and the critical path. For the project's creator, lead and staff.
+        """
+        project = self.get_object()
+        if not is_project_lead(request.user, project):
+            raise PermissionDenied('Only project leads can see the schedule.')
+        try:
+            return Response(project_schedule(project.pk))
+        except ScheduleCycleError as e:
+            return Response(
+                {'detail': str(e), 'milestones': e.milestone_ids}, status=status.HTTP_409_CONFLICT,
+            )
+
 
 class ProjectMemberViewSet(viewsets.ModelViewSet):
     queryset = ProjectMember.objects.all()
@@ -21,6 +55,7 @@ class ProjectMemberViewSet(viewsets.ModelViewSet):
 
 class ProjectMilestoneViewSet(viewsets.ModelViewSet):
     queryset = ProjectMilestone.objects.all()
+    serializer_class = ProjectMilestoneSerializer
     permission_classes = [IsMentorOrAdmin]
 
 
@@ -31,4 +66,64 @@ class ProjectUpdateViewSet(viewsets.ModelViewSet):
 
 class ProjectApplicationViewSet(viewsets.ModelViewSet):
     queryset = ProjectApplication.objects.all()
+    serializer_class = ProjectApplicationSerializer
     permission_classes = [IsMemberOrAbove]
+
+    def perform_create(self, serializer):
+        # Applications go through the service, for the current user
+        data = serializer.validated_data
+        try:
+            serializer.instance = services.apply(
+                data['project'], self.request.user,
+                **{field: data[field] for field in APPLICATION_FIELDS if field in data}
+            )
+        except services.ApplicationError as e:
+            raise ValidationError({'detail': str(e)})
+
+    def perform_update(self, serializer):
+        application = serializer.instance
+        if application.applicant_id != self.request.user.pk and not self.request.user.is_staff:
+            raise PermissionDenied('Only the applicant can edit an application.')
+        if 'project' in serializer.validated_data and serializer.validated_data['project'] != application.project:
+            raise ValidationError({'project': 'An application cannot move to another project.'})
+        serializer.save()
+
+    def perform_destroy(self, instance):
+        if instance.applicant_id != self.request.user.pk and not self.request.user.is_staff:
+            raise PermissionDenied('Only the applicant can delete an application.')
+        with transaction.atomic():
+            instance.delete()
+            if instance.status != 'withdrawn':
+                Project.objects.filter(pk=instance.project_id, application_count__gt=0).update(
+                    application_count=F('application_count') - 1
+                )
+
+    @action(detail=True, methods=['post'])
+    def withdraw(self, request, pk=None):
+        """Withdraw the current user's pending application"""
+        application = self.get_object()
+        if application.applicant_id != request.user.pk:
+            raise PermissionDenied('Only the applicant can withdraw an application.')
+        if not services.withdraw(application):
+            return Response({'detail': 'This application has already been decided.'}, status=status.HTTP_409_CONFLICT)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=False, methods=['post'])
+    def review(self, request):
+        """
+        Accept or reject applications in bulk:
+        {"project": 1, "applications": [3, 4], "decision": "accept", "review_notes": "...", "role": "developer"}.
+        For the project's creator, lead and staff. Accepted applicants join
+        the team oldest first up to max_team_size; the rest stay pending and
+        are listed under "team_full".
+        """
+        serializer = ApplicationReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        if not is_project_lead(request.user, data['project']):
+            raise PermissionDenied('Only project leads can review applications.')
+        result = services.review(
+            data['project'], data['applications'], data['decision'],
+            reviewer=request.user, notes=data.get('review_notes'), role=data['role'],
+        )
+        return Response(result)
@@ -0,0 +1,298 @@
+"""
+Search backends.
+
+``InMemoryBackend`` is a small pure-Python inverted index (per process),
+used in development and tests so search works with no external service.
+``ElasticsearchBackend`` talks to Elasticsearch through the official client.
+Both accept and return the same plain-dict documents and result shape:
+
+    {'total': int, 'hits': [doc, ...], 'facets': {name: {value: count}}}
+"""
+import bisect
+import logging
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ('type', 'category', 'skill')
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has in is it of on or that the to was were will with'.split()
+)
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or '').lower()) if token not in STOP_WORDS]
+
+
+class BaseSearchBackend:
+    # Embedded backends live in the web process and are fed from a local queue
+    embedded = False
+
+    def index(self, documents):
+        raise NotImplementedError
+
+    def remove(self, doc_ids):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def search(self, query, types=None, filters=None, limit=20, offset=0):
+        raise NotImplementedError
+
+
+class InMemoryBackend(BaseSearchBackend):
+    """Inverted index with tf-idf scoring, prefix matching on the last term and facets"""
+
+    embedded = True
+    TITLE_WEIGHT = 3
+
+    def __init__(self):
+        self._documents = {}
+        self._postings = defaultdict(dict)
+        self._doc_terms = {}
+        self._vocabulary = []
+        self._vocabulary_dirty = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def index(self, documents):
+        with self._lock:
+            for document in documents:
+                self._remove_one(document['id'])
+                term_weights = Counter()
+                for token in tokenize(document['title']):
+                    term_weights[token] += self.TITLE_WEIGHT
+                for token in tokenize(document['text']):
+                    term_weights[token] += 1
+                for term, weight in term_weights.items():
+                    if term not in self._postings:
+                        self._vocabulary_dirty = True
+                    self._postings[term][document['id']] = weight
+                self._doc_terms[document['id']] = set(term_weights)
+                self._documents[document['id']] = document
+
+    def remove(self, doc_ids):
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove_one(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self._documents.clear()
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._vocabulary = []
+            self._vocabulary_dirty = False
+
+    def search(self, query, types=None, filters=None, limit=20, offset=0):
+        with self._lock:
+            terms = tokenize(query)
+            if terms:
+                scores = self._score(terms)
+            else:
+                scores = {doc_id: 0.0 for doc_id in self._documents}
+
+            matched = [
+                doc_id for doc_id in scores
+                if self._matches_filters(self._documents[doc_id], types, filters)
+            ]
+            matched.sort(key=lambda doc_id: (-scores[doc_id], doc_id))
+
+            facets = {name: Counter() for name in FACET_FIELDS}
+            for doc_id in matched:
+                document = self._documents[doc_id]
+                facets['type'][document['type']] += 1
+                for name in ('category', 'skill'):
+                    for value in document['facets'].get(name, []):
+                        facets[name][value] += 1
+
+            hits = []
+            for doc_id in matched[offset:offset + limit]:
+                hit = {key: value for key, value in self._documents[doc_id].items() if key != 'text'}
+                hit['score'] = round(scores[doc_id], 4)
+                hits.append(hit)
+
+            return {
+                'total': len(matched),
+                'hits': hits,
+                'facets': {name: dict(counts.most_common(20)) for name, counts in facets.items()},
+            }
+
+    def _score(self, terms):
+        """AND across terms; the last term also matches as a prefix (typeahead)"""
+        total_docs = max(len(self._documents), 1)
+        scores = None
+        for position, term in enumerate(terms):
+            if position == len(terms) - 1:
+                candidates = self._prefix_terms(term)
+            else:
+                candidates = [term] if term in self._postings else []
+
+            term_scores = defaultdict(float)
+            for candidate in candidates:
+                postings = self._postings[candidate]
+                idf = math.log(1 + total_docs / len(postings))
+                for doc_id, weight in postings.items():
+                    term_scores[doc_id] = max(term_scores[doc_id], (1 + math.log(weight)) * idf)
+
+            if scores is None:
+                scores = dict(term_scores)
+            else:
+                scores = {
+                    doc_id: score + term_scores[doc_id]
+                    for doc_id, score in scores.items()
+                    if doc_id in term_scores
+                }
+            if not scores:
+                return {}
+        return scores
+
+    def _prefix_terms(self, prefix, max_expansions=50):
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(self._postings)
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        expansions = []
+        for term in self._vocabulary[start:start + max_expansions]:
+            if not term.startswith(prefix):
+                break
+            if self._postings.get(term):
+                expansions.append(term)
+        return expansions
+
+    def _matches_filters(self, document, types, filters):
+        if types and document['type'] not in types:
+            return False
+        for name, values in (filters or {}).items():
+            if values and not set(values) & set(document['facets'].get(name, [])):
+                return False
+        return True
+
+    def _remove_one(self, doc_id):
+        for term in self._doc_terms.pop(doc_id, ()):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+                    self._vocabulary_dirty = True
+        self._documents.pop(doc_id, None)
+
+
+class ElasticsearchBackend(BaseSearchBackend):
+    """Elasticsearch 8 backend using the official client"""
+
+    MAPPING = {
+        'properties': {
+            'type': {'type': 'keyword'},
+            'pk': {'type': 'keyword'},
+            'title': {'type': 'text', 'fields': {'prefix': {'type': 'search_as_you_type'}}},
+            'text': {'type': 'text'},
+            'summary': {'type': 'text', 'index': False},
+            'url': {'type': 'keyword', 'index': False},
+            'facets': {
+                'properties': {
+                    'category': {'type': 'keyword'},
+                    'skill': {'type': 'keyword'},
+                    'status': {'type': 'keyword'},
+                }
+            },
+        }
+    }
+
+    def __init__(self, url, index_name='dnc'):
+        from elasticsearch import Elasticsearch
+
+        self.client = Elasticsearch(url)
+        self.index_name = index_name
+        self._index_ready = False
+
+    def _ensure_index(self):
+        if self._index_ready:
+            return
+        if not self.client.indices.exists(index=self.index_name):
+            self.client.indices.create(index=self.index_name, mappings=self.MAPPING)
+        self._index_ready = True
+
+    def index(self, documents):
+        from elasticsearch.helpers import bulk
+
+        self._ensure_index()
+        actions = [
+            {'_op_type': 'index', '_index': self.index_name, '_id': document['id'], '_source': document}
+            for document in documents
+        ]
+        if actions:
+            bulk(self.client, actions, refresh=False)
+
+    def remove(self, doc_ids):
+        from elasticsearch.helpers import bulk
+
+        self._ensure_index()
+        actions = [
+            {'_op_type': 'delete', '_index': self.index_name, '_id': doc_id}
+            for doc_id in doc_ids
+        ]
+        if actions:
+            # Deleting something that was never indexed is not an error here
+            bulk(self.client, actions, raise_on_error=False, refresh=False)
+
+    def clear(self):
+        self.client.indices.delete(index=self.index_name, ignore_unavailable=True)
+        self._index_ready = False
+        self._ensure_index()
+
+    def search(self, query, types=None, filters=None, limit=20, offset=0):
+        self._ensure_index()
+        filter_clauses = []
+        if types:
+            filter_clauses.append({'terms': {'type': list(types)}})
+        for name, values in (filters or {}).items():
+            if values:
+                filter_clauses.append({'terms': {f'facets.{name}': list(values)}})
+
+        if query.strip():
+            must = [{
+                'multi_match': {
+                    'query': query,
+                    'type': 'bool_prefix',
+                    'fields': ['title^3', 'title.prefix', 'title.prefix._2gram', 'text'],
+                    'operator': 'and',
+                }
+            }]
+        else:
+            must = [{'match_all': {}}]
+
+        response = self.client.search(
+            index=self.index_name,
+            query={'bool': {'must': must, 'filter': filter_clauses}},
+            aggs={
+                'type': {'terms': {'field': 'type', 'size': 20}},
+                'category': {'terms': {'field': 'facets.category', 'size': 20}},
+                'skill': {'terms': {'field': 'facets.skill', 'size': 20}},
+            },
+            source_excludes=['text'],
+            from_=offset,
+            size=limit,
+        )
+        hits = []
+        for hit in response['hits']['hits']:
+            document = dict(hit['_source'])
+            document['score'] = hit['_score']
+            hits.append(document)
+        return {
+            'total': response['hits']['total']['value'],
+            'hits': hits,
+            'facets': {
+                name: {bucket['key']: bucket['doc_count'] for bucket in agg['buckets']}
+                for name, agg in response['aggregations'].items()
+            },
+        }
@@ -0,0 +1,223 @@
+"""
+Search document definitions.
+
+Each indexed model has a Document describing how to load rows efficiently,
+whether a row should be visible in search, and how to flatten it into the
+stored document the backends index. Stored documents carry everything a
+result page needs (title, summary, url), so searching never touches the
+database.
+"""
+from django.apps import apps
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+
+class Document:
+    """Base document definition"""
+
+    label = None
+    doc_type = None
+
+    @property
+    def model(self):
+        return apps.get_model(self.label)
+
+    def get_queryset(self):
+        return self.model.objects.all()
+
+    def should_index(self, obj):
+        return True
+
+    def doc_id(self, pk):
+        return f'{self.doc_type}:{pk}'
+
+    def build(self, obj):
+        return {
+            'id': self.doc_id(obj.pk),
+            'type': self.doc_type,
+            'pk': obj.pk,
+            'title': self.get_title(obj),
+            'text': strip_tags(self.get_text(obj) or ''),
+            'summary': Truncator(strip_tags(self.get_summary(obj) or '')).chars(200),
+            'url': self.get_url(obj),
+            'facets': self.get_facets(obj),
+        }
+
+    def get_title(self, obj):
+        return str(obj)
+
+    def get_text(self, obj):
+        return ''
+
+    def get_summary(self, obj):
+        return self.get_text(obj)
+
+    def get_url(self, obj):
+        return ''
+
+    def get_facets(self, obj):
+        return {}
+
+
+class ProjectDocument(Document):
+    label = 'projects.Project'
+    doc_type = 'project'
+
+    def get_queryset(self):
+        return self.model.objects.select_related('category').prefetch_related('required_skills')
+
+    def should_index(self, obj):
+        return obj.visibility == 'public'
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_text(self, obj):
+        return f'{obj.short_description}\n{obj.description}'
+
+    def get_summary(self, obj):
+        return obj.short_description
+
+    def get_url(self, obj):
+        return f'/projects/{obj.pk}/'
+
+    def get_facets(self, obj):
+        return {
+            'category': [obj.category.name] if obj.category else [],
+            'skill': [skill.name for skill in obj.required_skills.all()],
+            'status': [obj.status],
+        }
+
+
+class EventDocument(Document):
+    label = 'events.Event'
+    doc_type = 'event'
+
+    def should_index(self, obj):
+        return obj.is_public
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_text(self, obj):
+        return f'{obj.short_description}\n{obj.description}\n{obj.location or ""}'
+
+    def get_summary(self, obj):
+        return obj.short_description
+
+    def get_url(self, obj):
+        return f'/events/{obj.pk}/'
+
+    def get_facets(self, obj):
+        return {'category': [obj.get_event_type_display()]}
+
+
+class ForumTopicDocument(Document):
+    label = 'forum.ForumTopic'
+    doc_type = 'topic'
+
+    def get_queryset(self):
+        return self.model.objects.select_related('category')
+
+    def get_title(self, obj):
+        return obj.title
+
+    def get_text(self, obj):
+        return obj.content
+
+    def get_url(self, obj):
+        return f'/forum/topic/{obj.pk}/'
+
+    def get_facets(self, obj):
+        return {'category': [obj.category.name]}
+
+
+class ForumPostDocument(Document):
+    label = 'forum.ForumPost'
+    doc_type = 'post'
+
+    def get_queryset(self):
+        return self.model.objects.select_related('topic__category')
+
+    def get_title(self, obj):
+        return f'Re: {obj.topic.title}'
+
+    def get_text(self, obj):
+        return obj.content
+
+    def get_url(self, obj):
+        return f'/forum/topic/{obj.topic_id}/#post-{obj.pk}'
+
+    def get_facets(self, obj):
+        return {'category': [obj.topic.category.name]}
+
+
+class UserDocument(Document):
+    label = 'users.User'
+    doc_type = 'user'
+
+    def get_queryset(self):
+        return self.model.objects.prefetch_related('user_skills__skill')
+
+    def should_index(self, obj):
+        return obj.is_active
+
+    def get_title(self, obj):
+        return obj.full_name or obj.username
+
+    def get_text(self, obj):
+        parts = [obj.username, obj.job_title or '', obj.company or '', obj.location or '', obj.bio or '']
+        return '\n'.join(parts)
+
+    def get_summary(self, obj):
+        return obj.bio or obj.job_title or ''
+
+    def get_url(self, obj):
+        return f'/community/member/{obj.pk}/'
+
+    def get_facets(self, obj):
+        return {
+            'category': [obj.get_role_display()],
+            'skill': [user_skill.skill.name for user_skill in obj.user_skills.all()],
+        }
+
+
+class CommunityGroupDocument(Document):
+    label = 'community.CommunityGroup'
+    doc_type = 'group'
+
+    def get_queryset(self):
+        return self.model.objects.prefetch_related('focus_skills')
+
+    def should_index(self, obj):
+        return obj.is_public
+
+    def get_title(self, obj):
+        return obj.name
+
+    def get_text(self, obj):
+        return f'{obj.description}\n{" ".join(str(area) for area in obj.focus_areas or [])}'
+
+    def get_url(self, obj):
+        return f'/api/community/groups/{obj.pk}/'
+
+    def get_facets(self, obj):
+        return {
+            'category': [str(area) for area in obj.focus_areas or []],
+            'skill': [skill.name for skill in obj.focus_skills.all()],
+        }
+
+
+DOCUMENTS = {
+    document.label: document
+    for document in (
+        ProjectDocument(),
+        EventDocument(),
+        ForumTopicDocument(),
+        ForumPostDocument(),
+        UserDocument(),
+        CommunityGroupDocument(),
+    )
+}
+
+DOCUMENTS_BY_TYPE = {document.doc_type: document for document in DOCUMENTS.values()}
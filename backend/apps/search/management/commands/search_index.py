@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.service import search_service
+
+
+class Command(BaseCommand):
+    help = 'Maintain the search index (rebuild it or apply queued changes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Drop the index and re-index every document from the database'
+        )
+        parser.add_argument(
+            '--process-queue',
+            action='store_true',
+            help='Apply queued incremental updates'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Documents per indexing batch'
+        )
+
+    def handle(self, *args, **options):
+        if search_service.backend.embedded:
+            self.stdout.write(
+                self.style.WARNING(
+                    'The in-memory backend lives inside each web process; '
+                    'this only affects the index of this command.'
+                )
+            )
+
+        if options['rebuild']:
+            self.stdout.write('Rebuilding search index...')
+            count = search_service.rebuild(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Indexed {count} documents'))
+
+        if options['process_queue'] or not options['rebuild']:
+            self.stdout.write(f'{len(search_service.queue)} queued changes')
+            processed = search_service.process_queue(batch_size=options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Processed {processed} queued changes'))
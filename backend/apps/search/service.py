@@ -0,0 +1,251 @@
+"""
+Unified search service.
+
+Model changes enqueue ``"<app_label.Model>:<pk>"`` markers; ``process_queue``
+drains them in batches, loads each model's rows with one ``in_bulk`` query,
+and indexes or removes the documents. A marker only says "this row changed",
+so repeated saves collapse and deletes need no special handling.
+
+With an embedded backend the queue is local to the process and drained just
+before each search. The embedded index is per process too: each worker builds
+its own on its first search and sees only its own writes, so other workers'
+changes show up only when it is rebuilt, ``SEARCH_MEMORY_MAX_AGE`` seconds
+later. That is fine for development and a single worker; production
+defaults to Elasticsearch.
+
+With Elasticsearch the queue lives in Redis (when the cache is django-redis)
+and is drained by ``manage.py search_index --process-queue`` from cron or
+celery beat. Without Redis no other process can see the queue, so each
+change is indexed by the process that made it, once its transaction commits.
+"""
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+from .backends import ElasticsearchBackend, InMemoryBackend
+from .documents import DOCUMENTS
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = 'search:index-queue'
+
+
+def _get_redis():
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if 'django_redis' not in backend:
+        return None
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception as e:
+        logger.warning(f"Redis unavailable for the search queue: {e}")
+        return None
+
+
+def get_backend():
+    name = getattr(settings, 'SEARCH_BACKEND', 'memory')
+    if name == 'elasticsearch':
+        return ElasticsearchBackend(
+            settings.ELASTICSEARCH_URL,
+            index_name=getattr(settings, 'ELASTICSEARCH_INDEX', 'dnc'),
+        )
+    return InMemoryBackend()
+
+
+def check_backend(timeout=3):
+    """
+    Refuse to start with SEARCH_BACKEND = 'elasticsearch' and no reachable
+    ELASTICSEARCH_URL, rather than failing every indexed save and search.
+    """
+    if getattr(settings, 'SEARCH_BACKEND', 'memory') != 'elasticsearch':
+        return
+    url = getattr(settings, 'ELASTICSEARCH_URL', '')
+    if not url:
+        raise ImproperlyConfigured("SEARCH_BACKEND is 'elasticsearch' but ELASTICSEARCH_URL is not set")
+    try:
+        reachable = get_backend().client.options(request_timeout=timeout).ping()
+    except Exception as e:
+        raise ImproperlyConfigured(f"SEARCH_BACKEND is 'elasticsearch' but {url} is unusable: {e}")
+    if not reachable:
+        raise ImproperlyConfigured(
+            f"SEARCH_BACKEND is 'elasticsearch' but {url} is not reachable; "
+            "start it, fix ELASTICSEARCH_URL or set SEARCH_BACKEND = 'memory'"
+        )
+
+
+class IndexQueue:
+    """FIFO of changed-row markers, in Redis when shared, otherwise in memory"""
+
+    def __init__(self, redis=None):
+        self.redis = redis
+        self._local = deque()
+        self._lock = threading.Lock()
+
+    def push(self, label, pk):
+        """Queue a marker; returns True if it went to the shared (Redis) queue"""
+        marker = f'{label}:{pk}'
+        if self.redis is not None:
+            try:
+                self.redis.rpush(QUEUE_KEY, marker)
+                return True
+            except Exception as e:
+                logger.warning(f"Search queue push failed, queueing locally: {e}")
+        with self._lock:
+            self._local.append(marker)
+        return False
+
+    def pop_batch(self, size):
+        markers = []
+        with self._lock:
+            while self._local and len(markers) < size:
+                markers.append(self._local.popleft())
+        if self.redis is not None and len(markers) < size:
+            pipe = self.redis.pipeline()
+            pipe.lrange(QUEUE_KEY, 0, size - len(markers) - 1)
+            pipe.ltrim(QUEUE_KEY, size - len(markers), -1)
+            raw, _ = pipe.execute()
+            markers.extend(item.decode() if isinstance(item, bytes) else item for item in raw)
+        return markers
+
+    def __len__(self):
+        size = len(self._local)
+        if self.redis is not None:
+            try:
+                size += self.redis.llen(QUEUE_KEY)
+            except Exception:
+                pass
+        return size
+
+
+class SearchService:
+    """Entry point for searching and keeping the index current"""
+
+    def __init__(self):
+        self._backend = None
+        self._queue = None
+        self._built = False
+        self._built_at = None
+        self._build_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = get_backend()
+        return self._backend
+
+    @property
+    def queue(self):
+        if self._queue is None:
+            redis = None if self.backend.embedded else _get_redis()
+            self._queue = IndexQueue(redis)
+        return self._queue
+
+    def enqueue(self, instance):
+        label = instance._meta.label
+        if label not in DOCUMENTS:
+            return
+        if self.backend.embedded and not self._built:
+            # The first search builds the whole index from the database anyway
+            return
+        shared = self.queue.push(label, instance.pk)
+        if not shared and not self.backend.embedded:
+            # Only this process can see its local queue: index after commit
+            transaction.on_commit(self._drain_local)
+
+    def search(self, query, types=None, filters=None, limit=20, offset=0):
+        if self.backend.embedded:
+            self._ensure_built()
+            self.process_queue()
+        return self.backend.search(query, types=types, filters=filters, limit=limit, offset=offset)
+
+    def process_queue(self, batch_size=500):
+        """Apply queued changes; returns the number of markers processed"""
+        processed = 0
+        while True:
+            markers = self.queue.pop_batch(batch_size)
+            if not markers:
+                return processed
+            self._apply(markers)
+            processed += len(markers)
+
+    def rebuild(self, batch_size=500):
+        """Re-index everything from the database; returns the number of documents"""
+        self.backend.clear()
+        total = self._index_all(self.backend, batch_size)
+        self._built = True
+        self._built_at = time.monotonic()
+        return total
+
+    def _index_all(self, backend, batch_size=500):
+        total = 0
+        for document in DOCUMENTS.values():
+            batch = []
+            queryset = document.get_queryset().order_by('pk')
+            # prefetch_related needs chunk_size with iterator()
+            for obj in queryset.iterator(chunk_size=batch_size):
+                if document.should_index(obj):
+                    batch.append(document.build(obj))
+                if len(batch) >= batch_size:
+                    backend.index(batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                backend.index(batch)
+                total += len(batch)
+        return total
+
+    def _is_stale(self):
+        if not self._built:
+            return True
+        max_age = getattr(settings, 'SEARCH_MEMORY_MAX_AGE', 300)
+        return bool(max_age) and time.monotonic() - self._built_at > max_age
+
+    def _ensure_built(self):
+        if not self._is_stale():
+            return
+        with self._build_lock:
+            if self._is_stale():
+                # Build a fresh index and swap it in, so searches never see a half-built one
+                backend = get_backend()
+                count = self._index_all(backend)
+                self._backend = backend
+                self._built = True
+                self._built_at = time.monotonic()
+                logger.info(f"Built in-memory search index with {count} documents")
+
+    def _drain_local(self):
+        try:
+            self.process_queue()
+        except Exception as e:
+            # The markers are lost; manage.py search_index --rebuild catches up
+            logger.warning(f"Search indexing failed: {e}")
+
+    def _apply(self, markers):
+        pks_by_label = defaultdict(set)
+        for marker in markers:
+            label, _, pk = marker.rpartition(':')
+            if label in DOCUMENTS:
+                pks_by_label[label].add(int(pk))
+
+        for label, pks in pks_by_label.items():
+            document = DOCUMENTS[label]
+            objects = document.get_queryset().in_bulk(list(pks))
+            to_index, to_remove = [], []
+            for pk in pks:
+                obj = objects.get(pk)
+                if obj is not None and document.should_index(obj):
+                    to_index.append(document.build(obj))
+                else:
+                    to_remove.append(document.doc_id(pk))
+            if to_index:
+                self.backend.index(to_index)
+            if to_remove:
+                self.backend.remove(to_remove)
+
+
+search_service = SearchService()
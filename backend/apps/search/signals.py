@@ -0,0 +1,42 @@
+from functools import partial
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from .documents import DOCUMENTS
+from .service import search_service
+
+
+def _enqueue_on_commit(instance):
+    transaction.on_commit(partial(search_service.enqueue, instance))
+
+
+def document_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _enqueue_on_commit(instance)
+
+
+def related_changed(sender, instance, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _enqueue_on_commit(instance)
+
+
+def user_skill_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _enqueue_on_commit(instance.user)
+
+
+for label in DOCUMENTS:
+    model = apps.get_model(label)
+    post_save.connect(document_changed, sender=model, dispatch_uid=f'search-save-{label}')
+    post_delete.connect(document_changed, sender=model, dispatch_uid=f'search-delete-{label}')
+
+Project = apps.get_model('projects.Project')
+CommunityGroup = apps.get_model('community.CommunityGroup')
+UserSkill = apps.get_model('users.UserSkill')
+
+m2m_changed.connect(related_changed, sender=Project.required_skills.through)
+m2m_changed.connect(related_changed, sender=CommunityGroup.focus_skills.through)
+post_save.connect(user_skill_changed, sender=UserSkill)
+post_delete.connect(user_skill_changed, sender=UserSkill)
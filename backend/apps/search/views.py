@@ -0,0 +1,39 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .documents import DOCUMENTS_BY_TYPE
+from .service import search_service
+
+
+class SearchView(APIView):
+    """
+    Cross-entity search over projects, events, forum topics/posts, members
+    and community groups. Results and facet counts come from the search
+    index only; no database queries are made per request.
+    """
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        query = request.query_params.get('q', '').strip()
+        types = [t for t in request.query_params.getlist('type') if t in DOCUMENTS_BY_TYPE]
+        filters = {
+            'category': request.query_params.getlist('category'),
+            'skill': request.query_params.getlist('skill'),
+        }
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), 100)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+        except ValueError:
+            return Response(
+                {'detail': 'limit and offset must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if not query and not any(filters.values()):
+            return Response({'total': 0, 'hits': [], 'facets': {}})
+
+        results = search_service.search(
+            query, types=types, filters=filters, limit=limit, offset=offset
+        )
+        return Response(results)
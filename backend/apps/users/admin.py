@@ -1,11 +1,14 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
+from import_export.admin import ImportExportMixin
 from .models import User, Skill, UserSkill, Certification, UserPreference
+from .resources import SkillResource, UserResource, UserSkillResource
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(ImportExportMixin, BaseUserAdmin):
+    resource_classes = [UserResource]
     list_display = ('username', 'email', 'full_name', 'role', 'status', 'reputation_score', 'last_active', 'is_staff')
     list_filter = ('role', 'status', 'is_staff', 'is_superuser', 'is_active', 'created_at')
     search_fields = ('username', 'email', 'first_name', 'last_name', 'company')
@@ -34,7 +37,8 @@ class UserAdmin(BaseUserAdmin):
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
+class SkillAdmin(ImportExportMixin, admin.ModelAdmin):
+    resource_classes = [SkillResource]
     list_display = ('name', 'category', 'is_active', 'created_at')
     list_filter = ('category', 'is_active', 'created_at')
     search_fields = ('name', 'category', 'description')
@@ -49,7 +53,8 @@ class UserSkillInline(admin.TabularInline):
 
 
 @admin.register(UserSkill)
-class UserSkillAdmin(admin.ModelAdmin):
+class UserSkillAdmin(ImportExportMixin, admin.ModelAdmin):
+    resource_classes = [UserSkillResource]
     list_display = ('user', 'skill', 'proficiency_level', 'years_experience', 'is_verified', 'created_at')
     list_filter = ('proficiency_level', 'is_verified', 'skill__category', 'created_at')
     search_fields = ('user__username', 'skill__name')
@@ -0,0 +1,72 @@
+# Generated by Django 4.2.7 on 2026-10-18 09:00
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# PostgreSQL only: a trigger keeps search_vector current (it fires only when
+# the indexed columns are written, so counter updates don't rebuild it), a GIN
+# index serves full-text queries and pg_trgm indexes serve ILIKE typeahead
+# lookups. Other databases keep the unused column and fall back to icontains.
+FORWARD_SQL = """
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE OR REPLACE FUNCTION users_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.username, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.first_name, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.last_name, '')), 'A') ||
+        setweight(to_tsvector('pg_catalog.simple', coalesce(NEW.email, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS users_search_vector_trigger ON users;
+CREATE TRIGGER users_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF username, first_name, last_name, email ON users
+    FOR EACH ROW EXECUTE FUNCTION users_search_vector_update();
+
+-- Backfill existing rows through the trigger
+UPDATE users SET username = username;
+
+CREATE INDEX IF NOT EXISTS users_search_vector_gin ON users USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS users_username_trgm ON users USING gin (username gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS users_first_name_trgm ON users USING gin (first_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS users_last_name_trgm ON users USING gin (last_name gin_trgm_ops);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS users_search_vector_gin;
+DROP INDEX IF EXISTS users_username_trgm;
+DROP INDEX IF EXISTS users_first_name_trgm;
+DROP INDEX IF EXISTS users_last_name_trgm;
+DROP TRIGGER IF EXISTS users_search_vector_trigger ON users;
+DROP FUNCTION IF EXISTS users_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FORWARD_SQL)
+
+
+def remove_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunPython(install_search, remove_search),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+# PostgreSQL only: email__istartswith compiles to UPPER(email::text) LIKE
+# UPPER('fragment%'); a text_pattern_ops index on that expression serves it
+# for member and admin searches by partial email.
+FORWARD_SQL = """
+CREATE INDEX IF NOT EXISTS users_email_upper_prefix
+    ON users (UPPER(email::text) text_pattern_ops);
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS users_email_upper_prefix;
+"""
+
+
+def install_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(FORWARD_SQL)
+
+
+def remove_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0002_user_search_vector"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_index, remove_index),
+    ]
@@ -0,0 +1,46 @@
+from import_export import fields
+
+from apps.core.resources import BulkModelResource, CachedForeignKeyWidget
+
+from .models import Skill, User, UserSkill
+
+
+class UserResource(BulkModelResource):
+    """Users by username; passwords are never exported and imported users get an unusable one"""
+
+    class Meta(BulkModelResource.Meta):
+        model = User
+        import_id_fields = ('username',)
+        fields = (
+            'username', 'email', 'first_name', 'last_name', 'role', 'status', 'is_active',
+            'bio', 'phone', 'location', 'timezone', 'company', 'job_title', 'years_experience',
+            'linkedin_url', 'github_url', 'portfolio_url', 'reputation_score', 'total_contributions',
+            'email_notifications', 'sms_notifications', 'newsletter_subscription', 'date_joined',
+        )
+        export_order = fields
+
+    def before_save_instance(self, instance, using_transactions, dry_run):
+        if not instance.password:
+            instance.set_unusable_password()
+
+
+class SkillResource(BulkModelResource):
+    class Meta(BulkModelResource.Meta):
+        model = Skill
+        import_id_fields = ('name',)
+        fields = ('name', 'category', 'description', 'is_active')
+        export_order = fields
+
+
+class UserSkillResource(BulkModelResource):
+    user = fields.Field(attribute='user', column_name='user', widget=CachedForeignKeyWidget(User, 'username'))
+    skill = fields.Field(attribute='skill', column_name='skill', widget=CachedForeignKeyWidget(Skill, 'name'))
+
+    class Meta(BulkModelResource.Meta):
+        model = UserSkill
+        import_id_fields = ('user', 'skill')
+        fields = ('user', 'skill', 'proficiency_level', 'years_experience', 'is_verified', 'verified_at')
+        export_order = fields
+
+    def get_queryset(self):
+        return UserSkill.objects.select_related('user', 'skill')
@@ -0,0 +1,140 @@
+"""
+Process-wide index of skill names.
+
+Skills change rarely but are read on most listing pages, so every worker
+keeps a sorted array of (lowercased name, name, id) and answers prefix
+searches with bisect. Changes bump a version number in the shared cache;
+workers check it at most every ``check_interval`` seconds and reload when it
+moves, so a new skill shows up everywhere within a few seconds.
+"""
+import bisect
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from .models import Skill
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'skills:registry:version'
+
+
+class SkillRegistry:
+    """Sorted in-memory index of skill names for autocomplete and name lookups"""
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        # (sorted lowercased names, sorted entries, lowercased name -> id)
+        self._index = ([], [], {})
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def names(self, active_only=True):
+        """All skill names in alphabetical order"""
+        self._ensure_fresh()
+        entries = self._index[1]
+        return [name for _, name, _, active in entries if active or not active_only]
+
+    def search(self, prefix, limit=10, active_only=True):
+        """Return up to limit {'id', 'name'} dicts whose name starts with prefix"""
+        self._ensure_fresh()
+        prefix = prefix.strip().lower()
+        if not prefix:
+            return []
+
+        keys, entries, _ = self._index
+        results = []
+        index = bisect.bisect_left(keys, prefix)
+        while index < len(keys) and keys[index].startswith(prefix) and len(results) < limit:
+            _, name, skill_id, active = entries[index]
+            if active or not active_only:
+                results.append({'id': skill_id, 'name': name})
+            index += 1
+        return results
+
+    def resolve(self, names, create=True, category='General'):
+        """
+        Map skill names to ids, creating missing skills.
+
+        Known names are answered from memory; the rest cost one lookup query
+        and, if any are genuinely new, one bulk insert.
+        """
+        self._ensure_fresh()
+        wanted = {}
+        for name in names:
+            cleaned = (name or '').strip()
+            if cleaned:
+                wanted.setdefault(cleaned.lower(), cleaned)
+
+        by_name = self._index[2]
+        resolved = {}
+        missing = {}
+        for key, name in wanted.items():
+            if key in by_name:
+                resolved[name] = by_name[key]
+            else:
+                missing[key] = name
+        if not missing:
+            return resolved
+
+        # The index may be a few seconds stale, so check the database first
+        found = Skill.objects.filter(name__in=list(missing.values())).values_list('name', 'id')
+        for name, skill_id in found:
+            resolved[name] = skill_id
+            missing.pop(name.lower(), None)
+
+        if missing and create:
+            resolved.update(self._bulk_create(list(missing.values()), category))
+            self.invalidate()
+        return resolved
+
+    def invalidate(self):
+        """Tell every worker (including this one) to reload on next access"""
+        try:
+            cache.incr(VERSION_KEY)
+        except ValueError:
+            cache.set(VERSION_KEY, 1, None)
+        self._checked_at = 0
+
+    def _bulk_create(self, names, category):
+        skills = [Skill(name=name, category=category) for name in names]
+        try:
+            with transaction.atomic():
+                created = Skill.objects.bulk_create(skills)
+            if all(skill.pk for skill in created):
+                return {skill.name: skill.pk for skill in created}
+        except IntegrityError:
+            # Lost a race with a concurrent insert of the same name
+            Skill.objects.bulk_create(skills, ignore_conflicts=True)
+        return dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if self._version is not None and now - self._checked_at < self.check_interval:
+                return
+            version = cache.get(VERSION_KEY, 0)
+            if version != self._version:
+                self._load()
+                self._version = version
+            self._checked_at = now
+
+    def _load(self):
+        rows = Skill.objects.order_by().values_list('name', 'id', 'is_active')
+        entries = sorted((name.lower(), name, skill_id, active) for name, skill_id, active in rows)
+        # Swap in one tuple so readers never see a half-built index
+        self._index = (
+            [entry[0] for entry in entries],
+            entries,
+            {entry[0]: entry[2] for entry in entries},
+        )
+        logger.info(f"Loaded {len(entries)} skills into the skill registry")
+
+
+skill_registry = SkillRegistry()
@@ -8,6 +8,7 @@ from django.core.exceptions import ValidationError
 from django.db.models import Q
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User, Skill, UserSkill, Certification, UserPreference
+from .skill_registry import skill_registry
 from .serializers import (
     UserSerializer,
     UserRegistrationSerializer,
@@ -206,6 +207,16 @@ class SkillViewSet(viewsets.ModelViewSet):
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at']
     ordering = ['category', 'name']
+    
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """Prefix search over skill names, served from the in-memory registry"""
+        query = request.query_params.get('q', '')
+        try:
+            limit = min(int(request.query_params.get('limit', 10)), 50)
+        except ValueError:
+            limit = 10
+        return Response({'results': skill_registry.search(query, limit=limit)})
 
 
 class UserSkillViewSet(viewsets.ModelViewSet):
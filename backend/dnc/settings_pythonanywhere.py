@@ -61,6 +61,7 @@ LOCAL_APPS = [
     'apps.forum',
     'apps.integrations',
     'apps.outvier',
+    'apps.search',
 ]
 
 # Remove Celery apps for PythonAnywhere
@@ -77,6 +78,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.analytics.middleware.ActivityMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -297,16 +299,42 @@ SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
 X_FRAME_OPTIONS = 'DENY'
 
-# Cache Configuration - PythonAnywhere optimized (no Redis)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
+# Cache Configuration - PythonAnywhere optimized
+# Redis if one is configured, otherwise a file cache. Unlike locmem, the file
+# cache is shared by every web worker on the host.
+REDIS_URL = env('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'dnc',
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'SOCKET_CONNECT_TIMEOUT': 2,
+                'SOCKET_TIMEOUT': 2,
+                'IGNORE_EXCEPTIONS': True,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': env('CACHE_DIR', default=str(BASE_DIR / 'cache')),
+            'TIMEOUT': 300,
+            'OPTIONS': {
+                'MAX_ENTRIES': 5000,
+            },
+        }
     }
-}
 
 # Session Configuration
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Both cache backends above are shared between workers, so sessions can be
+# served from the cache with the database as the durable copy.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 
 # API Integration Settings
 GOOGLE_ANALYTICS_VIEW_ID = env('GOOGLE_ANALYTICS_VIEW_ID', default='')
@@ -341,6 +369,43 @@ DISCOURSE_API_KEY = env('DISCOURSE_API_KEY', default='')
 DISCOURSE_API_USERNAME = env('DISCOURSE_API_USERNAME', default='')
 DISCOURSE_BASE_URL = env('DISCOURSE_BASE_URL', default='')
 
+# Search Configuration
+# 'memory' is an embedded per-process index: every worker builds its own and
+# sees other workers' writes only after SEARCH_MEMORY_MAX_AGE seconds, so it is
+# for development and single-worker setups. PythonAnywhere has no Elasticsearch
+# (or Redis), so it is the default here; 'elasticsearch' needs a reachable
+# ELASTICSEARCH_URL or startup fails
+SEARCH_BACKEND = env('SEARCH_BACKEND', default='memory')
+SEARCH_MEMORY_MAX_AGE = env.int('SEARCH_MEMORY_MAX_AGE', default=300)
+ELASTICSEARCH_URL = env('ELASTICSEARCH_URL', default='')
+ELASTICSEARCH_INDEX = env('ELASTICSEARCH_INDEX', default='dnc')
+
+# Analytics retention (see apps.analytics.timeseries)
+ANALYTICS_RAW_RETENTION_DAYS = env.int('ANALYTICS_RAW_RETENTION_DAYS', default=90)
+ANALYTICS_HOURLY_RETENTION_DAYS = env.int('ANALYTICS_HOURLY_RETENTION_DAYS', default=400)
+USER_ACTIVITY_RETENTION_DAYS = env.int('USER_ACTIVITY_RETENTION_DAYS', default=365)
+
+# User activity ingestion (see apps.analytics.ingest)
+USER_ACTIVITY_ENABLED = env.bool('USER_ACTIVITY_ENABLED', default=True)
+USER_ACTIVITY_BUFFER_SIZE = env.int('USER_ACTIVITY_BUFFER_SIZE', default=10000)
+USER_ACTIVITY_BATCH_SIZE = env.int('USER_ACTIVITY_BATCH_SIZE', default=1000)
+USER_ACTIVITY_FLUSH_INTERVAL = env.int('USER_ACTIVITY_FLUSH_INTERVAL', default=5)
+USER_ACTIVITY_FLUSH_THREAD = env.bool('USER_ACTIVITY_FLUSH_THREAD', default=False)
+USER_ACTIVITY_PAGE_VIEW_SAMPLE_RATE = env.float('USER_ACTIVITY_PAGE_VIEW_SAMPLE_RATE', default=1.0)
+USER_ACTIVITY_TRUST_X_FORWARDED_FOR = env.bool('USER_ACTIVITY_TRUST_X_FORWARDED_FOR', default=True)
+
+# Outbound integration HTTP (see apps.integrations.http)
+INTEGRATION_HTTP_MAX_CONNECTIONS_PER_HOST = env.int('INTEGRATION_HTTP_MAX_CONNECTIONS_PER_HOST', default=10)
+INTEGRATION_HTTP_KEEPALIVE_EXPIRY = env.int('INTEGRATION_HTTP_KEEPALIVE_EXPIRY', default=30)
+INTEGRATION_HTTP_TIMEOUT = env.int('INTEGRATION_HTTP_TIMEOUT', default=30)
+INTEGRATION_HTTP_MAX_RETRIES = env.int('INTEGRATION_HTTP_MAX_RETRIES', default=3)
+INTEGRATION_HTTP_BACKOFF = env.float('INTEGRATION_HTTP_BACKOFF', default=0.5)
+INTEGRATION_HTTP_BACKOFF_MAX = env.float('INTEGRATION_HTTP_BACKOFF_MAX', default=30)
+INTEGRATION_HTTP_RATE_LIMIT = env.float('INTEGRATION_HTTP_RATE_LIMIT', default=10)
+INTEGRATION_HTTP_RATE_BURST = env.int('INTEGRATION_HTTP_RATE_BURST', default=20)
+INTEGRATION_HTTP_CACHE_TIMEOUT = env.int('INTEGRATION_HTTP_CACHE_TIMEOUT', default=60 * 60 * 24 * 7)
+INTEGRATION_HTTP_CACHE_MAX_BYTES = env.int('INTEGRATION_HTTP_CACHE_MAX_BYTES', default=1048576)
+
 # WordPress Integration
 WORDPRESS_URL = env('WORDPRESS_URL', default='')
 WORDPRESS_USERNAME = env('WORDPRESS_USERNAME', default='')
@@ -21,6 +21,8 @@ urlpatterns = [
     path('api/forum/', include('apps.forum.urls')),
     path('api/integrations/', include('apps.integrations.urls')),
     path('api/outvier/', include('apps.outvier.urls')),
+    path('api/search/', include('apps.search.urls')),
+    path('api/imports/', include('apps.core.api_urls')),
     
     # Authentication pages
     path('login/', views.login_view, name='login'),
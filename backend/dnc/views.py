@@ -4,33 +4,59 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
 from django.contrib import messages
 from django.urls import reverse_lazy
-from django.db.models import Q, Count
+from django.db.models import Q
 from django.http import JsonResponse
 from django.core.paginator import Paginator
 from django.utils import timezone
 from django.contrib.auth import authenticate, login, logout
 from datetime import datetime, timedelta
 from django.contrib.auth import get_user_model
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 
 # Import models from your apps
 from apps.users.models import User, Skill, Certification, UserSkill
-from apps.projects.models import Project, ProjectApplication, ProjectCategory
+from apps.projects.models import Project, ProjectApplication, ProjectCategory, ProjectMember
+from apps.projects.services import AlreadyApplied, ApplicationError, apply as apply_to_project
 from apps.events.models import Event, EventRegistration
+from apps.events.services import SEAT_STATUSES, AlreadyRegistered, RegistrationError, register
 from apps.forum.models import ForumCategory as Category, ForumTopic as Topic, ForumPost as Post
 from apps.community.models import ActivityFeed
 from apps.analytics.models import UserActivity
+from apps.analytics.rollups import last_refreshed, latest_status_counts, monthly_counts
+from apps.core.cache import page_cache, HOME_CONTEXT_KEY, PROJECT_FILTERS_KEY, UPCOMING_EVENTS_KEY
+from apps.core.counters import view_counter
+from apps.core.dashboard import UserDashboard
+from apps.core.search import full_text_search, typeahead_search
+from apps.users.skill_registry import skill_registry
 
-def home(request):
-    """Home page with overview and statistics"""
-    context = {
+
+class CountViewMixin:
+    """Record a page view for the displayed object (buffered, see apps.core.counters)"""
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        view_counter.increment(self.object)
+        return response
+
+
+def _build_home_context():
+    now = timezone.now()
+    active_projects = Project.objects.filter(status='active')
+    upcoming_events = Event.objects.filter(start_date__gte=now)
+    return {
         'total_users': User.objects.count(),
-        'total_projects': Project.objects.filter(status='active').count(),
-        'total_events': Event.objects.filter(start_date__gte=timezone.now()).count(),
-        'recent_projects': Project.objects.filter(status='active').order_by('-created_at')[:6],
-        'upcoming_events': Event.objects.filter(start_date__gte=timezone.now()).order_by('start_date')[:4],
-        'latest_topics': Topic.objects.all().order_by('-created_at')[:5],
+        'total_projects': active_projects.count(),
+        'total_events': upcoming_events.count(),
+        'recent_projects': list(active_projects.select_related('category', 'created_by').order_by('-created_at')[:6]),
+        'upcoming_events': list(upcoming_events.order_by('start_date')[:4]),
+        'latest_topics': list(Topic.objects.select_related('author', 'category').order_by('-created_at')[:5]),
     }
+
+
+def home(request):
+    """Home page with overview and statistics"""
+    # Served from the two-level page cache; model signals evict it on change
+    context = page_cache.get_or_set(HOME_CONTEXT_KEY, _build_home_context, timeout=120)
     return render(request, 'index.html', context)
 
 
@@ -115,36 +141,14 @@ def dashboard(request):
     """User dashboard with personalized content"""
     user = request.user
     
-    # Get user's projects
-    user_projects = Project.objects.filter(
-        Q(created_by=user) | Q(members__user=user)
-    ).distinct().order_by('-created_at')[:5]
-    
-    # Get user's event registrations
-    user_events = EventRegistration.objects.filter(
-        user=user
-    ).select_related('event').order_by('-registered_at')[:5]
+    # Projects, events and recommendations are cached per user (apps.core.dashboard)
+    context = dict(UserDashboard(user).get())
     
     # Get user's recent activities
-    recent_activities = UserActivity.objects.filter(
+    context['recent_activities'] = UserActivity.objects.filter(
         user=user
     ).order_by('-created_at')[:10]
     
-    # Get recommendations
-    recommended_projects = Project.objects.filter(
-        status='active'
-    ).exclude(
-        Q(created_by=user) | Q(members__user=user)
-    ).distinct()[:3]
-    
-    context = {
-        'user_projects': user_projects,
-        'user_events': user_events,
-        'recent_activities': recent_activities,
-        'recommended_projects': recommended_projects,
-        'total_projects': user_projects.count(),
-        'total_events': user_events.count(),
-    }
     return render(request, 'users/dashboard.html', context)
 
 # Project Views
@@ -160,11 +164,15 @@ class ProjectListView(ListView):
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query) |
-                Q(required_skills__name__icontains=search_query)
-            ).distinct()
+            # Skills go through a subquery so no join/distinct is needed
+            queryset = full_text_search(
+                queryset,
+                search_query,
+                extra_q=Q(pk__in=Project.required_skills.through.objects.filter(
+                    skill__name__icontains=search_query
+                ).values('project_id')),
+                rank=False,
+            )
         
         # Filter by category
         category = self.request.GET.get('category')
@@ -180,18 +188,26 @@ class ProjectListView(ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = list(ProjectCategory.objects.filter(is_active=True).values_list('id', 'name'))
-        context['skills'] = Skill.objects.values_list('name', flat=True).distinct()
+        filters = page_cache.get_or_set(PROJECT_FILTERS_KEY, self._build_filters, timeout=600)
+        context['categories'] = filters['categories']
+        context['skills'] = skill_registry.names(active_only=False)
         return context
 
-class ProjectDetailView(DetailView):
+    @staticmethod
+    def _build_filters():
+        return {
+            'categories': list(ProjectCategory.objects.filter(is_active=True).values_list('id', 'name')),
+        }
+
+class ProjectDetailView(CountViewMixin, DetailView):
     model = Project
     template_name = 'projects/detail.html'
     context_object_name = 'project'
+    queryset = Project.objects.select_related('category')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        project = self.get_object()
+        project = self.object
         
         # Check if user has already applied
         if self.request.user.is_authenticated:
@@ -230,10 +246,10 @@ def project_create(request):
             category=ProjectCategory.objects.filter(id=category).first() if category else None,
         )
         
-        # Add required skills
-        for skill_name in required_skills:
-            skill, _ = Skill.objects.get_or_create(name=skill_name, defaults={"category": "General"})
-            project.required_skills.add(skill)
+        # Add required skills (one lookup + one bulk insert for new names)
+        skill_ids = skill_registry.resolve(required_skills, category='General')
+        if skill_ids:
+            project.required_skills.add(*skill_ids.values())
         
         messages.success(request, 'Project created successfully!')
         return redirect('project_detail', pk=project.pk)
@@ -250,11 +266,6 @@ def project_apply(request, project_id):
     project = get_object_or_404(Project, id=project_id)
     
     if request.method == 'POST':
-        # Check if already applied
-        if ProjectApplication.objects.filter(project=project, applicant=request.user).exists():
-            messages.warning(request, 'You have already applied to this project.')
-            return redirect('project_detail', pk=project.pk)
-        
         # Validate required fields
         message = request.POST.get('message', '').strip()
         relevant_experience = request.POST.get('relevant_experience', '').strip()
@@ -286,18 +297,28 @@ def project_apply(request, project_id):
             messages.error(request, 'Please provide a valid number of weekly hours.')
             return render(request, 'projects/apply.html', {'project': project})
         
-        # Create application
-        ProjectApplication.objects.create(
-            project=project,
-            applicant=request.user,
-            message=message,
-            relevant_experience=relevant_experience,
-            time_commitment=time_commitment,
-            weekly_hours=weekly_hours_int,
-            start_date=request.POST.get('start_date') or None,
-        )
+        # Create application (the unique constraint catches duplicates)
+        try:
+            application = apply_to_project(
+                project,
+                request.user,
+                message=message,
+                relevant_experience=relevant_experience,
+                time_commitment=time_commitment,
+                weekly_hours=weekly_hours_int,
+                start_date=request.POST.get('start_date') or None,
+            )
+        except AlreadyApplied as e:
+            messages.warning(request, str(e))
+            return redirect('project_detail', pk=project.pk)
+        except ApplicationError as e:
+            messages.error(request, str(e))
+            return redirect('project_detail', pk=project.pk)
         
-        messages.success(request, 'Application submitted successfully!')
+        if application.status == 'accepted':
+            messages.success(request, 'Welcome to the team!')
+        else:
+            messages.success(request, 'Application submitted successfully!')
         return redirect('project_detail', pk=project.pk)
     
     return render(request, 'projects/apply.html', {'project': project})
@@ -322,40 +343,47 @@ class EventListView(ListView):
         # Search functionality
         search_query = self.request.GET.get('search')
         if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) |
-                Q(description__icontains=search_query)
-            )
+            queryset = full_text_search(queryset, search_query, rank=False)
         
         return queryset.order_by('start_date')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['upcoming_events'] = Event.objects.filter(
-            start_date__gte=timezone.now()
-        ).order_by('start_date')[:6]
+        context['upcoming_events'] = page_cache.get_or_set(
+            UPCOMING_EVENTS_KEY,
+            lambda: list(Event.objects.filter(start_date__gte=timezone.now()).order_by('start_date')[:6]),
+            timeout=120,
+        )
         return context
 
-class EventDetailView(DetailView):
+class EventDetailView(CountViewMixin, DetailView):
     model = Event
     template_name = 'events/detail.html'
     context_object_name = 'event'
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        event = self.get_object()
+        event = self.object
         
-        # Check if user is registered
+        # The user's registration status (registered, waitlisted, ...), if any
         if self.request.user.is_authenticated:
-            context['is_registered'] = EventRegistration.objects.filter(
+            context['registration_status'] = EventRegistration.objects.filter(
                 event=event,
                 user=self.request.user
-            ).exists()
+            ).exclude(status='cancelled').values_list('status', flat=True).first()
+            context['is_registered'] = context['registration_status'] in SEAT_STATUSES
+        context['is_full'] = (
+            event.max_attendees is not None and event.registration_count >= event.max_attendees
+        )
         
-        # Get attendees
-        context['attendees'] = EventRegistration.objects.filter(
-            event=event
-        ).select_related('user')[:10]
+        # Get attendees; every row shares this event, so attach it instead of
+        # letting each registration load it again
+        attendees = list(EventRegistration.objects.filter(
+            event=event, status__in=SEAT_STATUSES
+        ).select_related('user')[:10])
+        for registration in attendees:
+            registration.event = event
+        context['attendees'] = attendees
         
         return context
 
@@ -365,18 +393,18 @@ def event_register(request, event_id):
     event = get_object_or_404(Event, id=event_id)
     
     if request.method == 'POST':
-        # Check if already registered
-        if EventRegistration.objects.filter(event=event, user=request.user).exists():
-            messages.warning(request, 'You are already registered for this event.')
-            return redirect('event_detail', pk=event.pk)
-        
-        # Create registration
-        EventRegistration.objects.create(
-            event=event,
-            user=request.user,
-        )
-        
-        messages.success(request, 'Successfully registered for the event!')
+        # Capacity, deadline and duplicates are enforced by the service
+        try:
+            registration = register(event, request.user)
+        except AlreadyRegistered as e:
+            messages.warning(request, str(e))
+        except RegistrationError as e:
+            messages.error(request, str(e))
+        else:
+            if registration.status == 'waitlisted':
+                messages.info(request, 'The event is full, so you have been added to the waitlist.')
+            else:
+                messages.success(request, 'Successfully registered for the event!')
         return redirect('event_detail', pk=event.pk)
     
     return render(request, 'events/register.html', {'event': event})
@@ -386,14 +414,7 @@ class CategoryListView(ListView):
     model = Category
     template_name = 'forum/categories.html'
     context_object_name = 'categories'
-    
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        # Add topic count for each category
-        for category in context['categories']:
-            category.topic_count = Topic.objects.filter(category=category).count()
-            category.post_count = Post.objects.filter(topic__category=category).count()
-        return context
+    # topic_count/post_count are denormalized and kept current by apps.forum.signals
 
 class TopicListView(ListView):
     model = Topic
@@ -413,14 +434,15 @@ class TopicListView(ListView):
             context['category'] = get_object_or_404(Category, id=self.kwargs['category_id'])
         return context
 
-class TopicDetailView(DetailView):
+class TopicDetailView(CountViewMixin, DetailView):
     model = Topic
     template_name = 'forum/topic_detail.html'
     context_object_name = 'topic'
+    queryset = Topic.objects.select_related('author', 'category')
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        topic = self.get_object()
+        topic = self.object
         
         # Get posts with pagination
         posts = Post.objects.filter(topic=topic).select_related('author').order_by('created_at')
@@ -439,12 +461,13 @@ def topic_create(request, category_id):
         title = request.POST.get('title')
         content = request.POST.get('content')
         
-        topic = Topic.objects.create(
-            title=title,
-            content=content,
-            author=request.user,
-            category=category,
-        )
+        with transaction.atomic():
+            topic = Topic.objects.create(
+                title=title,
+                content=content,
+                author=request.user,
+                category=category,
+            )
         
         messages.success(request, 'Topic created successfully!')
         return redirect('topic_detail', pk=topic.pk)
@@ -459,11 +482,12 @@ def post_create(request, topic_id):
     if request.method == 'POST':
         content = request.POST.get('content')
         
-        Post.objects.create(
-            content=content,
-            author=request.user,
-            topic=topic,
-        )
+        with transaction.atomic():
+            Post.objects.create(
+                content=content,
+                author=request.user,
+                topic=topic,
+            )
         
         messages.success(request, 'Post added successfully!')
         return redirect('topic_detail', pk=topic.pk)
@@ -478,12 +502,14 @@ def community_directory(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        members = members.filter(
-            Q(username__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query) |
-            Q(user_skills__skill__name__icontains=search_query)
-        ).distinct()
+        members = full_text_search(
+            members,
+            search_query,
+            extra_q=Q(pk__in=UserSkill.objects.filter(
+                skill__name__icontains=search_query
+            ).values('user_id')),
+            partial=True,
+        )
     
     # Filter by skills
     skills = request.GET.getlist('skills')
@@ -505,15 +531,17 @@ def member_profile(request, user_id):
     """View community member profile"""
     member = get_object_or_404(User, id=user_id)
     
+    # Memberships go through a subquery so no join/distinct is needed
+    member_project_ids = ProjectMember.objects.filter(user=member).values('project_id')
     context = {
         'member': member,
         'projects': Project.objects.filter(
-            Q(created_by=member) | Q(members__user=member)
-        ).distinct()[:5],
+            Q(created_by=member) | Q(pk__in=member_project_ids)
+        ).only('id', 'title', 'created_at')[:5],
         'events': EventRegistration.objects.filter(
             user=member
         ).select_related('event')[:5],
-        'topics': Topic.objects.filter(author=member)[:5],
+        'topics': Topic.objects.filter(author=member).select_related('category')[:5],
     }
     return render(request, 'community/member_profile.html', context)
 
@@ -595,12 +623,7 @@ def admin_users(request):
     # Search functionality
     search_query = request.GET.get('search')
     if search_query:
-        users = users.filter(
-            Q(username__icontains=search_query) |
-            Q(email__icontains=search_query) |
-            Q(first_name__icontains=search_query) |
-            Q(last_name__icontains=search_query)
-        )
+        users = full_text_search(users, search_query, rank=False, partial=True)
     
     # Pagination
     paginator = Paginator(users, 25)
@@ -617,19 +640,13 @@ def admin_analytics(request):
         messages.error(request, 'Access denied. Admin privileges required.')
         return redirect('home')
     
-    # System analytics
+    # Read from the daily rollups (manage.py refresh_rollups) instead of
+    # grouping the whole users/projects/events tables on every view
     context = {
-        'user_growth': User.objects.extra(
-            select={'month': "EXTRACT(month FROM date_joined)"}
-        ).values('month').annotate(count=Count('id')).order_by('month'),
-        
-        'project_stats': Project.objects.values('status').annotate(
-            count=Count('id')
-        ),
-        
-        'event_stats': Event.objects.extra(
-            select={'month': "EXTRACT(month FROM start_date)"}
-        ).values('month').annotate(count=Count('id')).order_by('month'),
+        'user_growth': monthly_counts('signups'),
+        'project_stats': latest_status_counts(),
+        'event_stats': monthly_counts('events'),
+        'last_refreshed': last_refreshed(),
     }
     
     return render(request, 'admin/analytics.html', context)
@@ -641,10 +658,7 @@ def search_projects(request):
     if len(query) < 2:
         return JsonResponse({'results': []})
     
-    projects = Project.objects.filter(
-        Q(title__icontains=query) |
-        Q(description__icontains=query)
-    ).values('id', 'title', 'description')[:10]
+    projects = typeahead_search(Project.objects.all(), query).values('id', 'title', 'description')
     
     return JsonResponse({'results': list(projects)})
 
@@ -654,10 +668,6 @@ def search_users(request):
     if len(query) < 2:
         return JsonResponse({'results': []})
     
-    users = User.objects.filter(
-        Q(username__icontains=query) |
-        Q(first_name__icontains=query) |
-        Q(last_name__icontains=query)
-    ).values('id', 'username', 'first_name', 'last_name')[:10]
+    users = typeahead_search(User.objects.all(), query).values('id', 'username', 'first_name', 'last_name')
     
     return JsonResponse({'results': list(users)})